@@ -11,9 +11,10 @@ from typing import List, Dict, Any, Optional
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException, Depends
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, RedirectResponse
 import uvicorn
 
 # 프로젝트 루트를 Python 경로에 추가
@@ -24,6 +25,7 @@ from src.scheduler import MarketingScheduler
 from src.airbnb_scraper import AirbnbScraper
 from src.content_generator import ContentGenerator
 from src.social_media_manager import SocialMediaManager
+from src.click_tracker import ClickTracker
 
 # 전역 변수
 db_manager = None
@@ -31,6 +33,7 @@ scheduler = None
 scraper = None
 content_generator = None
 social_manager = None
+click_tracker = None
 connected_clients = []
 
 class ConnectionManager:
@@ -67,15 +70,20 @@ manager = ConnectionManager()
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """애플리케이션 시작/종료 시 실행"""
-    global db_manager, scheduler, scraper, content_generator, social_manager
+    global db_manager, scheduler, scraper, content_generator, social_manager, click_tracker
     
     # 초기화
     print("🚀 API 서버 초기화 중...")
+    # 스키마 초기화는 여기서 한 번만 수행하고, 모든 라우터가 같은 인스턴스를 공유
     db_manager = DatabaseManager()
-    scraper = AirbnbScraper()
+    app.state.db_manager = db_manager
+    click_tracker = ClickTracker(db_manager)
+    click_tracker.warm()
+    app.state.click_tracker = click_tracker
+    scraper = AirbnbScraper(db_manager=db_manager)
     content_generator = ContentGenerator()
-    social_manager = SocialMediaManager()
-    scheduler = MarketingScheduler()
+    social_manager = SocialMediaManager(click_tracker=click_tracker)
+    scheduler = MarketingScheduler(db_manager=db_manager)
     
     # 스케줄러 시작
     scheduler.start()
@@ -86,6 +94,8 @@ async def lifespan(app: FastAPI):
     # 정리
     print("🛑 서비스 종료 중...")
     scheduler.stop()
+    click_tracker.close()
+    db_manager.close()
     print("✅ 서비스 종료 완료")
 
 # FastAPI 앱 생성
@@ -124,6 +134,20 @@ async def root():
     index_path = os.path.join(os.path.dirname(__file__), "..", "frontend", "dist", "index.html")
     return HTMLResponse(open(index_path).read())
 
+@app.get("/r/{code}")
+async def redirect_short_link(code: str):
+    """단축 링크 리다이렉트 (클릭은 큐에 넣고 백그라운드에서 로그 기록/집계)"""
+    # 메모리에 없는 코드만 DB 조회가 필요하므로 스레드풀에서 실행
+    link = click_tracker.lookup(code)
+    if link is None:
+        link = await run_in_threadpool(click_tracker.resolve, code)
+    if link is None:
+        raise HTTPException(status_code=404, detail="링크를 찾을 수 없습니다.")
+    
+    property_id, platform, tracking_url = link
+    click_tracker.record_click(code, property_id, platform)
+    return RedirectResponse(tracking_url, status_code=302)
+
 @app.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket):
     """WebSocket 연결"""
@@ -167,27 +191,28 @@ async def get_dashboard_stats() -> Dict[str, Any]:
     """대시보드 통계 조회"""
     try:
         # 기본 통계
-        properties = db_manager.get_all_properties()
-        active_properties = [p for p in properties if p.get('is_active', True)]
+        total_properties = db_manager.count_properties(status='all')
+        active_properties = db_manager.count_properties(status='active')
         
-        # 게시 이력 조회
-        posting_history = db_manager.get_posting_analytics(days=30)
-        successful_posts = len([p for p in posting_history if p['status'] == 'success'])
-        failed_posts = len([p for p in posting_history if p['status'] == 'failed'])
+        # 게시 이력 집계
+        summary = (db_manager.aggregate_postings(days=30) or [{'posts': 0, 'success': 0, 'failed': 0}])[0]
+        total_posts = summary['posts']
+        successful_posts = summary['success']
+        failed_posts = summary['failed']
         
         # 전환 통계
-        conversions = db_manager.get_conversion_stats()
-        total_clicks = sum(c['click_count'] for c in conversions)
-        total_conversions = sum(c['conversion_count'] for c in conversions)
+        conversion_totals = db_manager.get_conversion_totals()
+        total_clicks = conversion_totals['clicks']
+        total_conversions = conversion_totals['conversions']
         
         # 시스템 상태
         is_running = scheduler.is_running if scheduler else False
         last_execution = datetime.now() - timedelta(hours=1)  # 임시
         
         return {
-            "totalProperties": len(properties),
-            "activeProperties": len(active_properties),
-            "totalPosts": len(posting_history),
+            "totalProperties": total_properties,
+            "activeProperties": active_properties,
+            "totalPosts": total_posts,
             "successfulPosts": successful_posts,
             "failedPosts": failed_posts,
             "totalClicks": total_clicks,
@@ -197,7 +222,7 @@ async def get_dashboard_stats() -> Dict[str, Any]:
             "lastExecution": last_execution.isoformat(),
             "nextExecution": (last_execution + timedelta(hours=6)).isoformat(),
             "errorCount": failed_posts,
-            "successRate": (successful_posts / len(posting_history) * 100) if posting_history else 0
+            "successRate": (successful_posts / total_posts * 100) if total_posts else 0
         }
     except Exception as e:
         print(f"대시보드 통계 조회 오류: {e}")
@@ -1 +1,12 @@
 # API Routes Package
+from fastapi import Request
+
+
+def get_db_manager(request: Request):
+    """데이터베이스 매니저 의존성 (lifespan에서 생성된 공유 인스턴스)"""
+    return request.app.state.db_manager
+
+
+def get_click_tracker(request: Request):
+    """클릭 추적기 의존성 (lifespan에서 생성된 공유 인스턴스, 없으면 None)"""
+    return getattr(request.app.state, 'click_tracker', None)
@@ -3,6 +3,8 @@
 """
 
 from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from fastapi.concurrency import run_in_threadpool
 from typing import List, Dict, Any, Optional
 from datetime import datetime, timedelta
 import sys
@@ -11,14 +13,12 @@ import os
 # 프로젝트 루트를 Python 경로에 추가
 sys.path.append(os.path.join(os.path.dirname(__file__), '../..'))
 
-from src.database import DatabaseManager
+from src.database import DatabaseManager, POSTING_EXPORT_COLUMNS
+from src.exporter import iter_export, export_table, EXPORT_MEDIA_TYPES
+from backend.routes import get_db_manager
 
 router = APIRouter()
 
-def get_db_manager():
-    """데이터베이스 매니저 의존성"""
-    return DatabaseManager()
-
 @router.get("/overview")
 async def get_analytics_overview(
     days: int = Query(30, ge=1, le=365),
@@ -26,45 +26,31 @@ async def get_analytics_overview(
 ) -> Dict[str, Any]:
     """분석 개요 조회"""
     try:
-        # 게시 이력 조회
-        posting_history = db.get_posting_analytics(days=days)
+        # 게시 이력 집계
+        summary = (db.aggregate_postings(days=days) or [{'posts': 0, 'success': 0}])[0]
         
         # 전환 통계
-        conversions = db.get_conversion_stats()
+        conversion_totals = db.get_conversion_totals(days=days)
         
         # 기본 통계
-        total_posts = len(posting_history)
-        successful_posts = len([p for p in posting_history if p['status'] == 'success'])
+        total_posts = summary['posts']
+        successful_posts = summary['success']
         failed_posts = total_posts - successful_posts
         
-        total_clicks = sum(c['click_count'] for c in conversions)
-        total_conversions = sum(c['conversion_count'] for c in conversions)
+        total_clicks = conversion_totals['clicks']
+        total_conversions = conversion_totals['conversions']
         
         # 일별 통계
-        daily_stats = {}
-        for post in posting_history:
-            date = post['posted_at'][:10]
-            if date not in daily_stats:
-                daily_stats[date] = {'posts': 0, 'success': 0, 'error': 0}
-            
-            daily_stats[date]['posts'] += 1
-            if post['status'] == 'success':
-                daily_stats[date]['success'] += 1
-            else:
-                daily_stats[date]['error'] += 1
+        daily_stats = {
+            row['day']: {'posts': row['posts'], 'success': row['success'], 'error': row['posts'] - row['success']}
+            for row in db.aggregate_postings(group_by=['day'], days=days)
+        }
         
         # 플랫폼별 통계
-        platform_stats = {}
-        for post in posting_history:
-            platform = post['platform']
-            if platform not in platform_stats:
-                platform_stats[platform] = {'posts': 0, 'success': 0, 'error': 0}
-            
-            platform_stats[platform]['posts'] += 1
-            if post['status'] == 'success':
-                platform_stats[platform]['success'] += 1
-            else:
-                platform_stats[platform]['error'] += 1
+        platform_stats = {
+            row['platform']: {'posts': row['posts'], 'success': row['success'], 'error': row['posts'] - row['success']}
+            for row in db.aggregate_postings(group_by=['platform'], days=days)
+        }
         
         return {
             "period": f"{days}일",
@@ -88,13 +74,10 @@ async def get_performance_analytics(
 ) -> Dict[str, Any]:
     """성과 분석 조회"""
     try:
-        # 게시 이력 조회
-        posting_history = db.get_posting_analytics(days=days)
-        
-        # 숙소별 성과
+        # 숙소/플랫폼별 게시 이력 집계
         property_performance = {}
-        for post in posting_history:
-            prop_id = post['property_id']
+        for row in db.aggregate_postings(group_by=['property', 'platform'], days=days):
+            prop_id = row['property_id']
             if prop_id not in property_performance:
                 property_performance[prop_id] = {
                     'property_id': prop_id,
@@ -104,13 +87,10 @@ async def get_performance_analytics(
                     'platforms': set()
                 }
             
-            property_performance[prop_id]['posts'] += 1
-            property_performance[prop_id]['platforms'].add(post['platform'])
-            
-            if post['status'] == 'success':
-                property_performance[prop_id]['success'] += 1
-            else:
-                property_performance[prop_id]['error'] += 1
+            property_performance[prop_id]['posts'] += row['posts']
+            property_performance[prop_id]['success'] += row['success']
+            property_performance[prop_id]['error'] += row['posts'] - row['success']
+            property_performance[prop_id]['platforms'].add(row['platform'])
         
         # 플랫폼을 리스트로 변환
         for prop_id in property_performance:
@@ -141,25 +121,11 @@ async def get_trend_analytics(
 ) -> Dict[str, Any]:
     """트렌드 분석 조회"""
     try:
-        # 게시 이력 조회
-        posting_history = db.get_posting_analytics(days=days)
-        
-        # 주간 통계
-        weekly_stats = {}
-        for post in posting_history:
-            # ISO 주차 계산
-            date = datetime.fromisoformat(post['posted_at'].replace('Z', '+00:00'))
-            year, week, _ = date.isocalendar()
-            week_key = f"{year}-W{week:02d}"
-            
-            if week_key not in weekly_stats:
-                weekly_stats[week_key] = {'posts': 0, 'success': 0, 'error': 0}
-            
-            weekly_stats[week_key]['posts'] += 1
-            if post['status'] == 'success':
-                weekly_stats[week_key]['success'] += 1
-            else:
-                weekly_stats[week_key]['error'] += 1
+        # 주간 통계 (ISO 주차)
+        weekly_stats = {
+            row['week']: {'posts': row['posts'], 'success': row['success'], 'error': row['posts'] - row['success']}
+            for row in db.aggregate_postings(group_by=['week'], days=days)
+        }
         
         # 성장률 계산
         weeks = sorted(weekly_stats.keys())
@@ -187,31 +153,52 @@ async def get_trend_analytics(
 
 @router.get("/export")
 async def export_analytics(
-    format: str = Query("json", regex="^(json|csv)$"),
+    format: str = Query("json", regex="^(json|csv|ndjson)$"),
     days: int = Query(30, ge=1, le=365),
+    platform: Optional[str] = None,
+    compress: bool = Query(False, description="gzip 압축 여부"),
     db: DatabaseManager = Depends(get_db_manager)
-) -> Dict[str, Any]:
-    """분석 데이터 내보내기"""
+) -> StreamingResponse:
+    """게시 이력 내보내기 (DB 커서에서 바로 스트리밍, json은 기존 data/exported_at/format 객체, csv/ndjson은 파일)"""
     try:
-        # 게시 이력 조회
-        posting_history = db.get_posting_analytics(days=days)
+        rows = db.iter_posting_history(days=days, platform=platform)
+        columns = [column.split('.')[-1] for column in POSTING_EXPORT_COLUMNS]
         
-        if format == "json":
-            return {
-                "data": posting_history,
-                "exported_at": datetime.now().isoformat(),
-                "format": "json"
-            }
-        elif format == "csv":
-            # CSV 형식으로 변환
-            csv_data = "id,property_id,platform,status,posted_at,error_message\n"
-            for post in posting_history:
-                csv_data += f"{post['id']},{post['property_id']},{post['platform']},{post['status']},{post['posted_at']},{post.get('error_message', '')}\n"
-            
-            return {
-                "data": csv_data,
-                "exported_at": datetime.now().isoformat(),
-                "format": "csv"
-            }
+        filename = f"posting_history_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{format}"
+        media_type = EXPORT_MEDIA_TYPES[format]
+        if compress:
+            filename += '.gz'
+            media_type = 'application/gzip'
+        
+        return StreamingResponse(
+            iter_export(rows, columns, format=format, compress=compress),
+            media_type=media_type,
+            headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"데이터 내보내기 중 오류 발생: {str(e)}")
+
+@router.post("/export/columnar")
+async def export_columnar(
+    table: str = Query("posting_history", regex="^(posting_history|properties)$"),
+    format: str = Query("parquet", regex="^(parquet|arrow)$"),
+    partition_by: List[str] = Query([]),
+    incremental: bool = False,
+    db: DatabaseManager = Depends(get_db_manager)
+) -> Dict[str, Any]:
+    """테이블을 Parquet/Arrow IPC 파일로 서버의 EXPORT_DIR에 내보내기 (스레드에서 실행)"""
+    try:
+        output_dir = os.path.join(os.getenv('EXPORT_DIR', 'data/exports'), table)
+        result = await run_in_threadpool(
+            export_table, db, table, output_dir,
+            format=format, partition_by=partition_by, incremental=incremental
+        )
+        return {
+            "message": "데이터 내보내기가 완료되었습니다.",
+            "exported_at": datetime.now().isoformat(),
+            **result
+        }
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"데이터 내보내기 중 오류 발생: {str(e)}")
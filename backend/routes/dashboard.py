@@ -11,48 +11,47 @@ import os
 sys.path.append(os.path.join(os.path.dirname(__file__), '../..'))
 
 from src.database import DatabaseManager
+from backend.routes import get_db_manager, get_click_tracker
 
 router = APIRouter()
 
-def get_db_manager():
-    """데이터베이스 매니저 의존성"""
-    return DatabaseManager()
-
 @router.get("/stats")
 async def get_dashboard_stats(db: DatabaseManager = Depends(get_db_manager)) -> Dict[str, Any]:
     """대시보드 통계 조회"""
     try:
         # 기본 통계
-        properties = db.get_all_properties()
-        active_properties = [p for p in properties if p.get('is_active', True)]
+        total_properties = db.count_properties(status='all')
+        active_properties = db.count_properties(status='active')
         
-        # 게시 이력 조회
-        posting_history = db.get_posting_analytics(days=30)
-        successful_posts = len([p for p in posting_history if p['status'] == 'success'])
-        failed_posts = len([p for p in posting_history if p['status'] == 'failed'])
+        # 게시 이력 집계
+        summary = (db.aggregate_postings(days=30) or [{'posts': 0, 'success': 0, 'failed': 0}])[0]
+        total_posts = summary['posts']
+        successful_posts = summary['success']
+        failed_posts = summary['failed']
         
         # 전환 통계
-        conversions = db.get_conversion_stats()
-        total_clicks = sum(c['click_count'] for c in conversions)
-        total_conversions = sum(c['conversion_count'] for c in conversions)
+        conversion_totals = db.get_conversion_totals()
+        total_clicks = conversion_totals['clicks']
+        total_conversions = conversion_totals['conversions']
         
         return {
-            "totalProperties": len(properties),
-            "activeProperties": len(active_properties),
-            "totalPosts": len(posting_history),
+            "totalProperties": total_properties,
+            "activeProperties": active_properties,
+            "totalPosts": total_posts,
             "successfulPosts": successful_posts,
             "failedPosts": failed_posts,
             "totalClicks": total_clicks,
             "totalConversions": total_conversions,
             "conversionRate": (total_conversions / total_clicks * 100) if total_clicks > 0 else 0,
             "errorCount": failed_posts,
-            "successRate": (successful_posts / len(posting_history) * 100) if posting_history else 0
+            "successRate": (successful_posts / total_posts * 100) if total_posts else 0
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"통계 조회 중 오류 발생: {str(e)}")
 
 @router.get("/system-status")
-async def get_system_status() -> Dict[str, Any]:
+async def get_system_status(db: DatabaseManager = Depends(get_db_manager),
+                            click_tracker=Depends(get_click_tracker)) -> Dict[str, Any]:
     """시스템 상태 조회"""
     try:
         # 실제로는 스케줄러 상태를 확인해야 함
@@ -62,7 +61,9 @@ async def get_system_status() -> Dict[str, Any]:
             "nextExecution": "2024-01-15T17:30:00",
             "activeWorkflows": ["data_collection", "content_generation", "social_posting"],
             "errorCount": 0,
-            "uptime": "2 days, 5 hours, 30 minutes"
+            "uptime": "2 days, 5 hours, 30 minutes",
+            "conversionBuffer": db.conversion_buffer.get_stats(),
+            "clickTracker": click_tracker.get_stats() if click_tracker is not None else None
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"시스템 상태 조회 중 오류 발생: {str(e)}")
@@ -90,7 +91,7 @@ async def get_recent_activities(db: DatabaseManager = Depends(get_db_manager)) -
     """최근 활동 조회"""
     try:
         # 최근 게시 이력
-        recent_posts = db.get_posting_analytics(days=7)
+        recent_posts = db.get_posting_analytics(days=7, limit=10)
         
         # 최근 숙소 추가
         recent_properties = db.get_all_properties(limit=5)
@@ -13,13 +13,10 @@ from datetime import datetime, timedelta
 sys.path.append(os.path.join(os.path.dirname(__file__), '../..'))
 
 from src.database import DatabaseManager
+from backend.routes import get_db_manager
 
 router = APIRouter()
 
-def get_db_manager():
-    """데이터베이스 매니저 의존성"""
-    return DatabaseManager()
-
 @router.get("/")
 async def get_notifications(
     limit: int = 50,
@@ -27,8 +24,9 @@ async def get_notifications(
 ) -> Dict[str, Any]:
     """알림 목록 조회"""
     try:
-        # 최근 게시 이력에서 알림 생성
-        recent_posts = db.get_posting_analytics(days=7)
+        # 최근 게시 이력에서 알림 생성 (요청한 개수만 조회)
+        recent_posts = db.get_posting_analytics(days=7, limit=limit)
+        summary = (db.aggregate_postings(days=7) or [{'posts': 0}])[0]
         
         notifications = []
         
@@ -60,8 +58,9 @@ async def get_notifications(
         
         return {
             "notifications": notifications[:limit],
-            "total": len(notifications),
-            "unread": len([n for n in notifications if not n.get('read', False)])
+            "total": summary['posts'],
+            # 읽음 상태는 아직 저장되지 않으므로 전체가 읽지 않은 알림
+            "unread": summary['posts']
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"알림 조회 중 오류 발생: {str(e)}")
@@ -101,28 +100,22 @@ async def get_notification_stats(
     """알림 통계 조회"""
     try:
         # 최근 24시간 통계
-        recent_posts = db.get_posting_analytics(days=1)
+        summary = (db.aggregate_postings(days=1) or [{'posts': 0, 'success': 0, 'failed': 0}])[0]
         
-        success_count = len([p for p in recent_posts if p['status'] == 'success'])
-        error_count = len([p for p in recent_posts if p['status'] == 'failed'])
+        success_count = summary['success']
+        error_count = summary['failed']
         
         # 플랫폼별 통계
-        platform_stats = {}
-        for post in recent_posts:
-            platform = post['platform']
-            if platform not in platform_stats:
-                platform_stats[platform] = {'success': 0, 'error': 0}
-            
-            if post['status'] == 'success':
-                platform_stats[platform]['success'] += 1
-            else:
-                platform_stats[platform]['error'] += 1
+        platform_stats = {
+            row['platform']: {'success': row['success'], 'error': row['posts'] - row['success']}
+            for row in db.aggregate_postings(group_by=['platform'], days=1)
+        }
         
         return {
-            "total": len(recent_posts),
+            "total": summary['posts'],
             "success": success_count,
             "error": error_count,
-            "successRate": (success_count / len(recent_posts) * 100) if recent_posts else 0,
+            "successRate": (success_count / summary['posts'] * 100) if summary['posts'] else 0,
             "platformStats": platform_stats
         }
     except Exception as e:
@@ -161,39 +154,26 @@ async def websocket_notifications(websocket: WebSocket):
 async def get_analytics(db: DatabaseManager = Depends(get_db_manager)) -> Dict[str, Any]:
     """분석 데이터 조회"""
     try:
-        # 최근 30일 게시 이력
-        recent_posts = db.get_posting_analytics(days=30)
+        # 최근 30일 게시 이력 집계
+        summary = (db.aggregate_postings(days=30) or [{'posts': 0, 'success': 0}])[0]
         
         # 일별 통계
-        daily_stats = {}
-        for post in recent_posts:
-            date = post['posted_at'][:10]  # YYYY-MM-DD
-            if date not in daily_stats:
-                daily_stats[date] = {'success': 0, 'error': 0}
-            
-            if post['status'] == 'success':
-                daily_stats[date]['success'] += 1
-            else:
-                daily_stats[date]['error'] += 1
+        daily_stats = {
+            row['day']: {'success': row['success'], 'error': row['posts'] - row['success']}
+            for row in db.aggregate_postings(group_by=['day'], days=30)
+        }
         
         # 플랫폼별 통계
-        platform_stats = {}
-        for post in recent_posts:
-            platform = post['platform']
-            if platform not in platform_stats:
-                platform_stats[platform] = {'success': 0, 'error': 0, 'total': 0}
-            
-            platform_stats[platform]['total'] += 1
-            if post['status'] == 'success':
-                platform_stats[platform]['success'] += 1
-            else:
-                platform_stats[platform]['error'] += 1
+        platform_stats = {
+            row['platform']: {'success': row['success'], 'error': row['posts'] - row['success'], 'total': row['posts']}
+            for row in db.aggregate_postings(group_by=['platform'], days=30)
+        }
         
         return {
             "dailyStats": daily_stats,
             "platformStats": platform_stats,
-            "totalPosts": len(recent_posts),
-            "successRate": (len([p for p in recent_posts if p['status'] == 'success']) / len(recent_posts) * 100) if recent_posts else 0
+            "totalPosts": summary['posts'],
+            "successRate": (summary['success'] / summary['posts'] * 100) if summary['posts'] else 0
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"분석 데이터 조회 중 오류 발생: {str(e)}")
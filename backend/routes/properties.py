@@ -4,6 +4,7 @@
 
 from fastapi import APIRouter, Depends, HTTPException, Query
 from typing import List, Dict, Any, Optional
+from datetime import date
 import sys
 import os
 
@@ -11,66 +12,158 @@ import os
 sys.path.append(os.path.join(os.path.dirname(__file__), '../..'))
 
 from src.database import DatabaseManager
+from backend.routes import get_db_manager
 
 router = APIRouter()
 
-def get_db_manager():
-    """데이터베이스 매니저 의존성"""
-    return DatabaseManager()
-
 @router.get("/")
 async def get_properties(
     page: int = Query(1, ge=1),
     limit: int = Query(20, ge=1, le=100),
     city: Optional[str] = Query(None),
-    status: Optional[str] = Query(None),
+    status: Optional[str] = Query(None, regex="^(active|inactive|all)$"),
     search: Optional[str] = Query(None),
+    cursor: Optional[str] = Query(None),
+    direction: str = Query("next", regex="^(next|prev)$"),
+    amenities: Optional[str] = Query(None, description="쉼표로 구분한 필수 편의시설 (모두 포함)"),
+    include_total: bool = Query(False, description="커서 조회에서도 전체 개수(total) 포함 (COUNT 쿼리 추가 실행)"),
     db: DatabaseManager = Depends(get_db_manager)
 ) -> Dict[str, Any]:
     """숙소 목록 조회"""
     try:
-        # 모든 숙소 조회
-        all_properties = db.get_all_properties(limit=1000)  # 충분히 큰 수
-        
-        # 필터링
-        filtered_properties = all_properties
-        
-        if city:
-            filtered_properties = [p for p in filtered_properties if p.get('city', '').lower() == city.lower()]
+        amenity_list = [name.strip() for name in amenities.split(',') if name.strip()] if amenities else None
         
-        if status:
-            if status == 'active':
-                filtered_properties = [p for p in filtered_properties if p.get('is_active', True)]
-            elif status == 'inactive':
-                filtered_properties = [p for p in filtered_properties if not p.get('is_active', True)]
-        
-        if search:
-            search_lower = search.lower()
-            filtered_properties = [
-                p for p in filtered_properties 
-                if search_lower in p.get('title', '').lower() or 
-                   search_lower in p.get('city', '').lower() or
-                   search_lower in p.get('description', '').lower()
-            ]
+        # 커서가 있으면 키셋 페이지네이션, 없으면 페이지 번호 기반 조회
+        if cursor:
+            result = db.get_properties_page(
+                limit=limit, cursor=cursor, direction=direction,
+                city=city, status=status, search=search, amenities=amenity_list
+            )
+            pagination = {
+                "limit": limit,
+                "next_cursor": result['next_cursor'],
+                "prev_cursor": result['prev_cursor']
+            }
+            # 전체 개수는 페이지마다 전체 COUNT가 필요하므로 요청한 경우에만 계산
+            if include_total:
+                pagination["total"] = db.count_properties(city=city, status=status, search=search, amenities=amenity_list)
+            return {
+                "properties": [property_data.to_dict() for property_data in result['properties']],
+                "pagination": pagination
+            }
         
-        # 페이지네이션
-        total = len(filtered_properties)
-        start = (page - 1) * limit
-        end = start + limit
-        properties = filtered_properties[start:end]
+        result = db.query_properties(
+            city=city, status=status, search=search,
+            limit=limit, offset=(page - 1) * limit, amenities=amenity_list
+        )
+        total = result['total']
         
         return {
-            "properties": properties,
+            "properties": [property_data.to_dict() for property_data in result['properties']],
             "pagination": {
                 "page": page,
                 "limit": limit,
                 "total": total,
-                "pages": (total + limit - 1) // limit
+                "pages": (total + limit - 1) // limit,
+                "next_cursor": result['next_cursor'],
+                "prev_cursor": result['prev_cursor']
             }
         }
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"숙소 목록 조회 중 오류 발생: {str(e)}")
 
+# /{property_id}보다 먼저 선언해야 경로가 가려지지 않음
+@router.get("/available")
+async def get_available_properties(
+    check_in: date = Query(..., description="체크인 날짜 (YYYY-MM-DD)"),
+    nights: int = Query(1, ge=1, le=365),
+    city: Optional[str] = Query(None),
+    amenities: Optional[str] = Query(None, description="쉼표로 구분한 필수 편의시설 (모두 포함)"),
+    limit: int = Query(100, ge=1, le=1000),
+    db: DatabaseManager = Depends(get_db_manager)
+) -> Dict[str, Any]:
+    """체크인 날짜부터 nights박 연속 예약 가능한 숙소 조회"""
+    try:
+        amenity_list = [name.strip() for name in amenities.split(',') if name.strip()] if amenities else None
+        property_ids = db.find_available_properties(
+            check_in, nights, city=city, amenities=amenity_list, limit=limit
+        )
+        return {
+            "check_in": check_in.isoformat(),
+            "nights": nights,
+            "property_ids": property_ids,
+            "total": len(property_ids)
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"예약 가능 숙소 조회 중 오류 발생: {str(e)}")
+
+@router.get("/nearby")
+async def get_nearby_properties(
+    lat: Optional[float] = Query(None, ge=-90, le=90),
+    lng: Optional[float] = Query(None, ge=-180, le=180),
+    property_id: Optional[str] = Query(None, description="기준 숙소 (lat/lng 대신 사용, 결과에서 제외)"),
+    radius_km: float = Query(5.0, gt=0, le=100),
+    limit: int = Query(20, ge=1, le=100),
+    city: Optional[str] = Query(None),
+    amenities: Optional[str] = Query(None, description="쉼표로 구분한 필수 편의시설 (모두 포함)"),
+    db: DatabaseManager = Depends(get_db_manager)
+) -> Dict[str, Any]:
+    """좌표 또는 기준 숙소 주변 radius_km 안의 숙소를 가까운 순으로 조회"""
+    try:
+        if property_id:
+            property_data = db.get_property_data(property_id)
+            if not property_data:
+                raise HTTPException(status_code=404, detail="숙소를 찾을 수 없습니다.")
+            lat, lng = property_data.get('latitude'), property_data.get('longitude')
+            if lat is None or lng is None or (lat == 0 and lng == 0):
+                raise HTTPException(status_code=400, detail="기준 숙소의 위치 정보가 없습니다.")
+        elif lat is None or lng is None:
+            raise HTTPException(status_code=400, detail="lat/lng 또는 property_id가 필요합니다.")
+        
+        amenity_list = [name.strip() for name in amenities.split(',') if name.strip()] if amenities else None
+        properties = db.find_nearby(
+            lat, lng, radius_km=radius_km, limit=limit, exclude_id=property_id,
+            city=city, amenities=amenity_list
+        )
+        return {
+            "center": {"lat": lat, "lng": lng},
+            "radius_km": radius_km,
+            "properties": [property_data.to_dict() for property_data in properties],
+            "total": len(properties)
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"근처 숙소 조회 중 오류 발생: {str(e)}")
+
+@router.get("/clusters")
+async def get_property_clusters(
+    bbox: Optional[str] = Query(None, description="지도 영역 (min_lng,min_lat,max_lng,max_lat), 없으면 전체"),
+    zoom: int = Query(..., ge=0, le=22),
+    db: DatabaseManager = Depends(get_db_manager)
+) -> Dict[str, Any]:
+    """지도 영역의 줌별 숙소 마커 클러스터 조회"""
+    try:
+        if bbox:
+            try:
+                min_lng, min_lat, max_lng, max_lat = [float(value) for value in bbox.split(',')]
+            except ValueError:
+                raise HTTPException(status_code=400, detail="bbox는 min_lng,min_lat,max_lng,max_lat 형식이어야 합니다.")
+            if min_lng > max_lng or min_lat > max_lat:
+                raise HTTPException(status_code=400, detail="bbox의 최소값이 최대값보다 큽니다.")
+        else:
+            min_lng, min_lat, max_lng, max_lat = -180.0, -90.0, 180.0, 90.0
+        
+        return db.get_property_clusters(
+            max(-90.0, min_lat), max(-180.0, min_lng), min(90.0, max_lat), min(180.0, max_lng), zoom
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"숙소 클러스터 조회 중 오류 발생: {str(e)}")
+
 @router.get("/{property_id}")
 async def get_property(
     property_id: str,
@@ -82,12 +175,30 @@ async def get_property(
         if not property_data:
             raise HTTPException(status_code=404, detail="숙소를 찾을 수 없습니다.")
         
-        return property_data
+        # 응답 직렬화를 위해 JSON 필드까지 디코딩한 dict로 반환
+        return property_data.to_dict()
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"숙소 조회 중 오류 발생: {str(e)}")
 
+@router.get("/{property_id}/availability")
+async def get_property_availability(
+    property_id: str,
+    db: DatabaseManager = Depends(get_db_manager)
+) -> Dict[str, Any]:
+    """숙소 예약 가능일 조회 (오늘부터 365일 중 예약 가능 기간 목록)"""
+    try:
+        availability = db.get_availability(property_id)
+        if availability is None:
+            raise HTTPException(status_code=404, detail="예약 가능일 정보가 없습니다.")
+        
+        return availability
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"예약 가능일 조회 중 오류 발생: {str(e)}")
+
 @router.post("/{property_id}/toggle")
 async def toggle_property(
     property_id: str,
@@ -146,6 +257,14 @@ async def get_cities_list(db: DatabaseManager = Depends(get_db_manager)) -> List
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"도시 목록 조회 중 오류 발생: {str(e)}")
 
+@router.get("/amenities/list")
+async def get_amenities_list(db: DatabaseManager = Depends(get_db_manager)) -> List[Dict[str, Any]]:
+    """편의시설 사전 조회 (amenities 필터에 사용할 수 있는 이름 목록)"""
+    try:
+        return db.get_amenities()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"편의시설 목록 조회 중 오류 발생: {str(e)}")
+
 @router.get("/stats/summary")
 async def get_properties_summary(db: DatabaseManager = Depends(get_db_manager)) -> Dict[str, Any]:
     """숙소 요약 통계"""
@@ -2,8 +2,10 @@
 설정 API 라우터
 """
 
-from fastapi import APIRouter, Depends, HTTPException
-from typing import Dict, Any
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
+from typing import Dict, Any, Optional
+from datetime import datetime
 import sys
 import os
 
@@ -11,13 +13,11 @@ import os
 sys.path.append(os.path.join(os.path.dirname(__file__), '../..'))
 
 from src.database import DatabaseManager
+from src.backup_manager import BackupManager
+from backend.routes import get_db_manager
 
 router = APIRouter()
 
-def get_db_manager():
-    """데이터베이스 매니저 의존성"""
-    return DatabaseManager()
-
 @router.get("/")
 async def get_settings() -> Dict[str, Any]:
     """설정 조회"""
@@ -156,28 +156,96 @@ async def get_system_info() -> Dict[str, Any]:
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"시스템 정보 조회 중 오류 발생: {str(e)}")
 
+@router.get("/backups")
+async def list_backups(db: DatabaseManager = Depends(get_db_manager)) -> Dict[str, Any]:
+    """백업 목록 조회"""
+    try:
+        backups = BackupManager(db).list_backups()
+        return {"backups": backups, "total": len(backups)}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"백업 목록 조회 중 오류 발생: {str(e)}")
+
 @router.post("/backup")
-async def create_backup() -> Dict[str, Any]:
-    """데이터베이스 백업 생성"""
+async def create_backup(db: DatabaseManager = Depends(get_db_manager)) -> Dict[str, Any]:
+    """데이터베이스 백업 생성 (온라인 백업, 이벤트 루프를 막지 않도록 스레드에서 실행)"""
     try:
-        # 실제로는 데이터베이스 백업 생성
+        result = await run_in_threadpool(BackupManager(db).create_backup)
         return {
             "message": "백업이 생성되었습니다.",
-            "backup_file": f"backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}.db",
-            "created_at": datetime.now().isoformat()
+            **result
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"백업 생성 중 오류 발생: {str(e)}")
 
 @router.post("/restore")
-async def restore_backup(backup_file: str) -> Dict[str, Any]:
-    """데이터베이스 복원"""
+async def restore_backup(backup_file: str, db: DatabaseManager = Depends(get_db_manager)) -> Dict[str, Any]:
+    """데이터베이스 복원 (체크섬/무결성 검증 후 교체)"""
     try:
-        # 실제로는 백업 파일에서 데이터베이스 복원
+        result = await run_in_threadpool(BackupManager(db).restore_backup, backup_file)
         return {
             "message": "데이터베이스가 복원되었습니다.",
-            "restored_from": backup_file,
-            "restored_at": datetime.now().isoformat()
+            **result
         }
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except TimeoutError as e:
+        # 진행 중인 요청이 읽기 커넥션을 반납하지 않아 교체하지 못함 (재시도 가능)
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"데이터베이스 복원 중 오류 발생: {str(e)}")
+
+@router.post("/maintenance/compact-content")
+async def compact_duplicate_content(
+    batch_size: int = 500,
+    db: DatabaseManager = Depends(get_db_manager)
+) -> Dict[str, Any]:
+    """중복 콘텐츠 정리 (기존 행에 콘텐츠 해시를 채우며 배치 단위로 삭제)"""
+    try:
+        # 배치 재작성이 오래 걸릴 수 있으므로 이벤트 루프를 막지 않도록 스레드풀에서 실행
+        result = await run_in_threadpool(db.compact_duplicate_content, batch_size=batch_size)
+        return {
+            "message": "중복 콘텐츠 정리가 완료되었습니다.",
+            **result
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"중복 콘텐츠 정리 중 오류 발생: {str(e)}")
+
+@router.get("/db-profile")
+async def get_query_stats(
+    top_statements: int = Query(20, ge=1, le=200),
+    db: DatabaseManager = Depends(get_db_manager)
+) -> Dict[str, Any]:
+    """쿼리 프로파일링 결과 조회 (메서드별 지연 히스토그램, 문장별 집계, 느린 쿼리 로그)"""
+    try:
+        return db.get_query_stats(top_statements=top_statements)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"쿼리 프로파일 조회 중 오류 발생: {str(e)}")
+
+@router.post("/db-profile")
+async def set_query_profiling(
+    enabled: bool = True,
+    slow_query_ms: Optional[float] = Query(None, gt=0),
+    db: DatabaseManager = Depends(get_db_manager)
+) -> Dict[str, Any]:
+    """쿼리 프로파일링 켜기/끄기 (끄면 집계가 초기화됨)"""
+    try:
+        if enabled:
+            profiler = db.enable_profiling(slow_query_ms=slow_query_ms)
+            return {"message": "쿼리 프로파일링이 시작되었습니다.", "enabled": True,
+                    "slow_query_ms": profiler.slow_query_ms}
+        
+        db.disable_profiling()
+        return {"message": "쿼리 프로파일링이 종료되었습니다.", "enabled": False}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"쿼리 프로파일링 설정 중 오류 발생: {str(e)}")
+
+@router.post("/db-profile/reset")
+async def reset_query_stats(db: DatabaseManager = Depends(get_db_manager)) -> Dict[str, Any]:
+    """쿼리 프로파일링 집계 초기화"""
+    try:
+        db.reset_query_stats()
+        return {"message": "쿼리 프로파일링 집계가 초기화되었습니다."}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"쿼리 프로파일 초기화 중 오류 발생: {str(e)}")
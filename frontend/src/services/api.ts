@@ -32,6 +32,7 @@ export const propertiesApi = {
     city?: string
     status?: string
     search?: string
+    amenities?: string
   }) => 
     api.get('/properties', { params }).then(res => res.data),
   
@@ -47,6 +48,35 @@ export const propertiesApi = {
   getCitiesList: (): Promise<string[]> => 
     api.get('/properties/cities/list').then(res => res.data),
   
+  getAmenities: () => 
+    api.get('/properties/amenities/list').then(res => res.data),
+  
+  getAvailableProperties: (params: {
+    check_in: string
+    nights?: number
+    city?: string
+    amenities?: string
+    limit?: number
+  }) => 
+    api.get('/properties/available', { params }).then(res => res.data),
+  
+  getNearbyProperties: (params: {
+    lat?: number
+    lng?: number
+    property_id?: string
+    radius_km?: number
+    limit?: number
+    city?: string
+    amenities?: string
+  }) => 
+    api.get('/properties/nearby', { params }).then(res => res.data),
+  
+  getPropertyClusters: (params: { bbox?: string; zoom: number }) => 
+    api.get('/properties/clusters', { params }).then(res => res.data),
+  
+  getAvailability: (id: string) => 
+    api.get(`/properties/${id}/availability`).then(res => res.data),
+  
   getPropertiesSummary: () => 
     api.get('/properties/stats/summary').then(res => res.data),
 }
@@ -62,8 +92,12 @@ export const analyticsApi = {
   getTrends: (days: number = 30) => 
     api.get('/analytics/trends', { params: { days } }).then(res => res.data),
   
-  exportData: (format: 'json' | 'csv', days: number = 30) => 
-    api.get('/analytics/export', { params: { format, days } }).then(res => res.data),
+  // json은 { data, exported_at, format } 객체, csv/ndjson/gzip은 파일(blob)로 받음
+  exportData: (format: 'json' | 'csv' | 'ndjson', days: number = 30, compress: boolean = false) => 
+    api.get('/analytics/export', {
+      params: { format, days, compress },
+      responseType: format === 'json' && !compress ? 'json' : 'blob'
+    }).then(res => res.data),
 }
 
 // 알림 API
@@ -41,7 +41,7 @@ class AirbnbMarketingBot:
         self.airbnb_scraper = AirbnbScraper()
         self.content_generator = ContentGenerator()
         self.social_manager = SocialMediaManager()
-        self.scheduler = MarketingScheduler()
+        self.scheduler = MarketingScheduler(db_manager=self.db_manager)
         
     def run_daily_marketing(self):
         """일일 마케팅 작업 실행"""
@@ -78,12 +78,17 @@ class AirbnbMarketingBot:
         try:
             logger.info("스케줄된 포스팅 시작")
             
-            # 데이터베이스에서 미게시된 콘텐츠 조회
-            pending_content = self.db_manager.get_pending_content()
+            # 데이터베이스에서 미게시된 콘텐츠 임대 (스케줄러 스레드와 중복 게시 방지)
+            worker_id = f"bot-{os.getpid()}"
+            pending_content = self.db_manager.claim_pending_content(worker_id, limit=50)
             
             for content in pending_content:
-                self.social_manager.post_to_all_platforms(content, content['property_data'])
-                self.db_manager.mark_content_as_posted(content['id'])
+                try:
+                    self.social_manager.post_to_all_platforms(content, content['property_data'])
+                    self.db_manager.mark_content_as_posted(content['id'], worker_id=worker_id)
+                except Exception as e:
+                    logger.error(f"포스팅 중 오류 ({content['property_id']}): {str(e)}")
+                    self.db_manager.release_content(worker_id, [content['id']])
                 
             logger.info("스케줄된 포스팅 완료")
             
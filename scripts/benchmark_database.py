@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+데이터베이스 성능 측정 스크립트
+변경 사항 설명에 적은 측정값을 재현 (예: python scripts/benchmark_database.py bulk-save --rows 100000)
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import logging
+import argparse
+import tempfile
+import statistics
+import tracemalloc
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.database import DatabaseManager
+
+CITIES = ['서울', '부산', '인천', '대구', '대전', '광주', '울산', '제주']
+AMENITIES = ['무료 WiFi', '주차장', '에어컨', '세탁기', '주방', 'TV', '헤어드라이어', '다리미', '전자레인지', '냉장고']
+
+# 이름 -> (측정 함수, 설명, 인자 설정 함수)
+BENCHMARKS: Dict[str, tuple] = {}
+
+def benchmark(name: str, description: str, configure: Callable[[argparse.ArgumentParser], None]):
+    """측정 함수 등록"""
+    def register(func):
+        BENCHMARKS[name] = (func, description, configure)
+        return func
+    return register
+
+def make_property(i: int, amenities: int = 5, images: int = 3, availability_days: int = 0) -> Dict:
+    """측정용 숙소 데이터 (i가 같으면 같은 값)"""
+    rng = random.Random(i)
+    return {
+        'id': f'bench_{i:07d}',
+        'title': f'{CITIES[i % len(CITIES)]} 숙소 {i}',
+        'description': '측정용 숙소 설명입니다. ' * 4,
+        'city': CITIES[i % len(CITIES)],
+        'latitude': 37.5 + rng.uniform(-0.5, 0.5),
+        'longitude': 127.0 + rng.uniform(-0.5, 0.5),
+        'price_per_night': rng.randint(50000, 200000),
+        'property_type': '아파트',
+        'max_guests': rng.randint(2, 8),
+        'bedrooms': rng.randint(1, 4),
+        'bathrooms': rng.randint(1, 3),
+        'amenities': rng.sample(AMENITIES, amenities),
+        'rating': round(rng.uniform(4.0, 5.0), 1),
+        'review_count': rng.randint(10, 200),
+        'host_name': f'호스트{i % 100}',
+        'host_rating': round(rng.uniform(4.5, 5.0), 1),
+        'images': [f'https://example.com/image_{i}_{n}.jpg' for n in range(images)],
+        'availability': {
+            'check_in': '15:00', 'check_out': '11:00',
+            'days': [(datetime(2026, 1, 1) + timedelta(days=day)).date().isoformat() for day in range(availability_days)]
+        },
+        'booking_url': f'https://airbnb.com/rooms/{i}',
+        'created_at': datetime.now().isoformat(),
+        'scraped_at': datetime.now().isoformat()
+    }
+
+def timed(func: Callable, *args, **kwargs) -> float:
+    """실행 시간(초)"""
+    started = time.perf_counter()
+    func(*args, **kwargs)
+    return time.perf_counter() - started
+
+def fresh_db(directory: str, name: str, **kwargs) -> DatabaseManager:
+    """측정마다 새 DB 파일 생성"""
+    return DatabaseManager(os.path.join(directory, f'{name}.db'), **kwargs)
+
+def _bulk_save_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument('--rows', type=int, default=100000)
+
+@benchmark('bulk-save', "숙소 저장: 행 단위 save_property_data vs save_properties_bulk", _bulk_save_arguments)
+def bench_bulk_save(directory: str, args) -> List[Dict]:
+    """빈 DB에 rows개 숙소를 행 단위/일괄로 저장하는 처리량"""
+    properties = [make_property(i) for i in range(args.rows)]
+    results = []
+    
+    db = fresh_db(directory, 'per_row')
+    try:
+        elapsed = timed(lambda: [db.save_property_data(property_data) for property_data in properties])
+    finally:
+        db.close()
+    results.append({'method': 'save_property_data', 'rows': args.rows, 'seconds': round(elapsed, 2),
+                    'rows_per_second': round(args.rows / elapsed)})
+    
+    db = fresh_db(directory, 'bulk')
+    try:
+        elapsed = timed(db.save_properties_bulk, properties)
+    finally:
+        db.close()
+    results.append({'method': 'save_properties_bulk', 'rows': args.rows, 'seconds': round(elapsed, 2),
+                    'rows_per_second': round(args.rows / elapsed)})
+    return results
+
+def _timestamp_range_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument('--rows', type=int, default=500000)
+    parser.add_argument('--span-days', type=int, default=365, help="게시 이력을 고르게 분포시킬 기간")
+    parser.add_argument('--repeat', type=int, default=20)
+
+@benchmark('timestamp-range', "게시 이력 기간 조회: ISO 문자열 vs epoch 밀리초 타임스탬프", _timestamp_range_arguments)
+def bench_timestamp_range(directory: str, args) -> List[Dict]:
+    """posted_at >= 기준 시각 조회(idx_posting_history_posted_at) 시간과 인덱스 크기"""
+    now = datetime.now()
+    step = timedelta(days=args.span_days) / args.rows
+    results = []
+    
+    for mode, epoch_timestamps in (('iso', False), ('epoch_ms', True)):
+        db = fresh_db(directory, mode, epoch_timestamps=epoch_timestamps)
+        try:
+            db.save_properties_bulk([make_property(0)])
+            # 오래된 순으로 넣어 실제 적재처럼 인덱스 페이지가 가득 차도록 함
+            with db.pool.writer() as conn:
+                conn.executemany('''
+                    INSERT INTO posting_history (property_id, platform, status, posted_at)
+                    VALUES (?, 'blog', 'success', ?)
+                ''', ((make_property(0)['id'], db._timestamp(now - step * i)) for i in range(args.rows, 0, -1)))
+            
+            with db.pool.reader() as conn:
+                index_bytes = conn.execute(
+                    "SELECT SUM(pgsize) FROM dbstat WHERE name = 'idx_posting_history_posted_at'"
+                ).fetchone()[0]
+                for days in (7, 30, 90):
+                    since = db._since(days)
+                    timings = []
+                    for _ in range(args.repeat):
+                        started = time.perf_counter()
+                        rows = conn.execute('SELECT posted_at FROM posting_history WHERE posted_at >= ?',
+                                            (since,)).fetchall()
+                        timings.append(time.perf_counter() - started)
+                    results.append({'mode': mode, 'days': days, 'rows': len(rows),
+                                    'median_ms': round(statistics.median(timings) * 1000, 2),
+                                    'index_mib': round(index_bytes / 1024 / 1024, 1)})
+        finally:
+            db.close()
+    return results
+
+def _property_records_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument('--rows', type=int, default=100000)
+
+def _eager_rows_to_properties(db: DatabaseManager) -> Callable:
+    """PropertyRecord 도입 전처럼 모든 JSON 컬럼을 바로 디코딩한 딕셔너리 목록 생성"""
+    def rows_to_properties(columns, rows):
+        properties = []
+        for row in rows:
+            property_data = dict(zip(columns, row))
+            property_data['amenities'] = json.loads(property_data['amenities'] or '[]')
+            property_data['images'] = json.loads(property_data['images'] or '[]')
+            property_data['availability'] = json.loads(property_data['availability'] or '{}')
+            properties.append(db._format_timestamps(property_data))
+        return properties
+    return rows_to_properties
+
+@benchmark('property-records', "숙소 목록 조회: 즉시 디코딩 dict vs 지연 디코딩 PropertyRecord", _property_records_arguments)
+def bench_property_records(directory: str, args) -> List[Dict]:
+    """get_all_properties(limit=rows)의 조회 시간과 결과가 유지하는/최대 메모리 (tracemalloc)"""
+    db = fresh_db(directory, 'records')
+    results = []
+    try:
+        db.save_properties_bulk(make_property(i, amenities=8, images=6, availability_days=7) for i in range(args.rows))
+        
+        for mode in ('dict', 'record'):
+            if mode == 'dict':
+                db._rows_to_properties = _eager_rows_to_properties(db)
+            else:
+                del db._rows_to_properties
+            
+            # 시간은 tracemalloc 없이, 메모리는 따로 한 번 더 조회해 측정
+            elapsed = timed(db.get_all_properties, limit=args.rows)
+            
+            tracemalloc.start()
+            baseline = tracemalloc.get_traced_memory()[0]
+            properties = db.get_all_properties(limit=args.rows)
+            retained, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            
+            results.append({'mode': mode, 'rows': len(properties), 'load_seconds': round(elapsed, 2),
+                            'retained_mib': round((retained - baseline) / 1024 / 1024),
+                            'peak_mib': round((peak - baseline) / 1024 / 1024)})
+            del properties
+    finally:
+        db.close()
+    return results
+
+def main():
+    """명령행 실행"""
+    parser = argparse.ArgumentParser(description="데이터베이스 성능 측정")
+    subparsers = parser.add_subparsers(dest='benchmark', required=True)
+    for name, (func, description, configure) in BENCHMARKS.items():
+        configure(subparsers.add_parser(name, help=description, description=description))
+    args = parser.parse_args()
+    
+    # 행 단위 저장의 INFO 로그가 측정에 섞이지 않도록 경고 이상만 출력
+    logging.basicConfig(level=logging.WARNING)
+    
+    func = BENCHMARKS[args.benchmark][0]
+    with tempfile.TemporaryDirectory() as directory:
+        for row in func(directory, args):
+            print(json.dumps(row, ensure_ascii=False))
+
+if __name__ == "__main__":
+    main()
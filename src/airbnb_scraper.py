@@ -7,7 +7,7 @@ import requests
 import json
 import logging
 from typing import List, Dict, Optional
-from datetime import datetime
+from datetime import datetime, date, timedelta
 import time
 import random
 
@@ -16,8 +16,9 @@ logger = logging.getLogger(__name__)
 class AirbnbScraper:
     """Airbnb 숙소 데이터 수집 클래스"""
     
-    def __init__(self):
+    def __init__(self, db_manager=None):
         """초기화"""
+        self.db_manager = db_manager
         self.base_url = "https://www.airbnb.com/api/v2"
         self.session = requests.Session()
         self.session.headers.update({
@@ -142,7 +143,7 @@ class AirbnbScraper:
             logger.info(f"숙소 상세 정보 조회: {property_id}")
             
             # 모의 데이터 반환
-            return {
+            details = {
                 'id': property_id,
                 'detailed_description': "상세한 숙소 설명이 여기에 들어갑니다.",
                 'house_rules': [
@@ -158,18 +159,57 @@ class AirbnbScraper:
                     "일산화탄소 경보기",
                     "응급처치키트",
                     "보안카메라"
-                ]
+                ],
+                'calendar': self._generate_mock_calendar()
             }
             
+            return details
+            
         except Exception as e:
             logger.error(f"숙소 상세 정보 조회 중 오류: {str(e)}")
             return None
     
+    def _generate_mock_calendar(self, days: int = 365) -> Dict:
+        """테스트용 모의 예약 달력 생성 (예약된 [체크인, 체크아웃) 기간 목록)"""
+        start = date.today()
+        unavailable = []
+        day = random.randint(0, 5)
+        while day < days:
+            nights = random.randint(1, 7)
+            check_in = start + timedelta(days=day)
+            unavailable.append([check_in.isoformat(), (check_in + timedelta(days=nights)).isoformat()])
+            day += nights + random.randint(1, 14)
+        
+        return {'start_date': start.isoformat(), 'unavailable': unavailable}
+    
+    def refresh_availability(self, property_ids: List[str]) -> Dict[str, int]:
+        """여러 숙소의 상세 정보에서 예약 달력을 읽어 예약 가능일 비트맵 일괄 갱신"""
+        if self.db_manager is None:
+            return {'updated': 0, 'failed': len(property_ids)}
+        
+        calendars = []
+        failed = 0
+        for property_id in property_ids:
+            details = self.get_property_details(property_id)
+            if not details or not details.get('calendar'):
+                failed += 1
+                continue
+            calendars.append((property_id, details['calendar']))
+        
+        # 예약 달력은 박 단위 행 없이 기간 목록 그대로 비트맵으로 저장
+        result = self.db_manager.update_availability_bulk(calendars)
+        result['failed'] += failed
+        return result
+    
     def search_properties_by_keywords(self, keywords: List[str], limit: int = 10) -> List[Dict]:
         """키워드로 숙소 검색"""
         try:
             logger.info(f"키워드 검색: {', '.join(keywords)}")
             
+            # 저장된 숙소가 있으면 전문 검색 인덱스에서 조회
+            if self.db_manager is not None:
+                return self.db_manager.search_properties(keywords, limit=limit)
+            
             # 모든 한국 도시에서 키워드 검색
             all_properties = self.get_korean_properties(limit * 2)
             
@@ -0,0 +1,97 @@
+"""
+편의시설 비트셋 인덱스 모듈
+숙소별 편의시설 비트마스크를 메모리에 올려 콘텐츠 파이프라인에서 대상 숙소를 일괄 선택
+"""
+
+import logging
+from typing import Dict, List, Optional
+
+from .database import AMENITY_MASK_BITS
+
+try:
+    import numpy as np
+except ImportError:  # NumPy가 없으면 파이썬 정수 연산으로 대체
+    np = None
+
+logger = logging.getLogger(__name__)
+
+class AmenityIndex:
+    """편의시설 비트셋 인덱스
+    
+    load() 시점의 활성 숙소 (id, amenity_mask)를 uint64 배열로 보관하고
+    (mask & required) == required 조건을 벡터 연산으로 평가
+    """
+    
+    def __init__(self, db_manager):
+        """초기화"""
+        self.db_manager = db_manager
+        self.property_ids: List[str] = []
+        self._masks = None
+        self._bits: Dict[str, Optional[int]] = {}
+    
+    def load(self, status: str = None) -> int:
+        """데이터베이스에서 편의시설 사전과 숙소 비트마스크 적재 (적재한 숙소 수 반환)"""
+        self._bits = {amenity['name']: amenity['bit'] for amenity in self.db_manager.get_amenities()}
+        property_ids, masks = self.db_manager.get_amenity_masks(status=status)
+        
+        self.property_ids = property_ids
+        if np is not None:
+            # SQLite는 부호 있는 64비트로 저장하므로 같은 비트 패턴의 uint64로 해석
+            self._masks = np.array(masks, dtype=np.int64).view(np.uint64)
+        else:
+            self._masks = [mask & ((1 << AMENITY_MASK_BITS) - 1) for mask in masks]
+        
+        logger.info(f"편의시설 비트셋 적재 완료: {len(property_ids)}개 숙소, {len(self._bits)}개 편의시설")
+        return len(property_ids)
+    
+    def _mask(self, names: List[str]) -> Optional[int]:
+        """편의시설 이름 목록의 비트마스크 (사전에 없는 이름이 있으면 None)"""
+        mask = 0
+        for name in names:
+            if name not in self._bits:
+                return None
+            mask |= 1 << self._bits[name]
+        return mask
+    
+    def select(self, required: List[str], excluded: List[str] = None) -> List[str]:
+        """required를 모두 갖추고 excluded는 하나도 없는 숙소 id 목록 (id순)
+        
+        비트 범위 밖 편의시설은 데이터베이스 조건 조회로 후보를 좁힘
+        """
+        if self._masks is None:
+            self.load()
+        
+        required = list(dict.fromkeys(required or []))
+        excluded = list(dict.fromkeys(excluded or []))
+        if any(name not in self._bits for name in required):
+            return []
+        
+        in_range = [name for name in required if self._bits[name] is not None]
+        overflow = [name for name in required if self._bits[name] is None]
+        required_mask = self._mask(in_range)
+        excluded_mask = self._mask([name for name in excluded if self._bits.get(name) is not None]) or 0
+        
+        if np is not None:
+            required_bits = np.uint64(required_mask)
+            selected = (self._masks & required_bits) == required_bits
+            if excluded_mask:
+                selected &= (self._masks & np.uint64(excluded_mask)) == 0
+            property_ids = [self.property_ids[i] for i in np.flatnonzero(selected)]
+        else:
+            property_ids = [
+                property_id for property_id, mask in zip(self.property_ids, self._masks)
+                if mask & required_mask == required_mask and not mask & excluded_mask
+            ]
+        
+        if overflow:
+            candidates = set(self.db_manager.get_property_ids_with_amenities(overflow))
+            property_ids = [property_id for property_id in property_ids if property_id in candidates]
+        for name in excluded:
+            if name in self._bits and self._bits[name] is None:
+                dropped = set(self.db_manager.get_property_ids_with_amenities([name]))
+                property_ids = [property_id for property_id in property_ids if property_id not in dropped]
+        return property_ids
+    
+    def count(self, required: List[str], excluded: List[str] = None) -> int:
+        """select() 결과 숙소 수"""
+        return len(self.select(required, excluded))
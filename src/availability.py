@@ -0,0 +1,128 @@
+"""
+예약 가능일 비트맵 모듈
+숙소별 365일 예약 가능 여부를 BLOB 비트맵으로 만들고, 여러 숙소의 기간 가능 여부를 한 번에 검사
+"""
+
+from datetime import date, datetime, timedelta
+from typing import Iterable, List, Sequence, Tuple, Union
+
+try:
+    import numpy as np
+except ImportError:  # NumPy가 없으면 파이썬 정수 비트 연산으로 대체
+    np = None
+
+# 비트맵 길이(일)와 바이트 수: 비트 i = start_date + i일 밤 (1이면 예약 가능, 바이트 내 LSB 우선)
+AVAILABILITY_DAYS = 365
+AVAILABILITY_BYTES = (AVAILABILITY_DAYS + 7) // 8
+
+DateLike = Union[date, datetime, str]
+
+def to_date(value: DateLike) -> date:
+    """date/datetime/ISO 문자열을 date로 변환"""
+    if isinstance(value, str):
+        return date.fromisoformat(value[:10])
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value)[:10])
+
+def _range_mask(start: int, end: int) -> int:
+    """[start, end) 비트 범위 마스크 (비트맵 범위로 잘라냄)"""
+    start = max(start, 0)
+    end = min(end, AVAILABILITY_DAYS)
+    if end <= start:
+        return 0
+    return ((1 << (end - start)) - 1) << start
+
+def build_bitmap(start_date: DateLike, unavailable: Iterable[Tuple[DateLike, DateLike]] = (),
+                 available: Iterable[Tuple[DateLike, DateLike]] = None) -> bytes:
+    """기간 목록으로 비트맵 생성 (각 기간은 [체크인, 체크아웃) 밤)
+    
+    available이 None이면 전체 기간을 예약 가능으로 두고 unavailable 기간만 막으며,
+    available을 주면 해당 기간만 열고 그 안에서 unavailable 기간을 막음
+    """
+    origin = to_date(start_date).toordinal()
+    if available is None:
+        value = _range_mask(0, AVAILABILITY_DAYS)
+    else:
+        value = 0
+        for check_in, check_out in available:
+            value |= _range_mask(to_date(check_in).toordinal() - origin, to_date(check_out).toordinal() - origin)
+    
+    # 막을 기간을 하나의 마스크로 모은 뒤 한 번에 제거
+    blocked = 0
+    for check_in, check_out in unavailable:
+        blocked |= _range_mask(to_date(check_in).toordinal() - origin, to_date(check_out).toordinal() - origin)
+    return (value & ~blocked).to_bytes(AVAILABILITY_BYTES, 'little')
+
+def set_nights(bitmap: bytes, start_date: DateLike, check_in: DateLike, nights: int, available: bool) -> bytes:
+    """check_in부터 nights박을 예약 가능/불가로 변경한 비트맵 반환"""
+    offset = (to_date(check_in) - to_date(start_date)).days
+    value = int.from_bytes(bitmap, 'little')
+    mask = _range_mask(offset, offset + nights)
+    value = value | mask if available else value & ~mask
+    return value.to_bytes(AVAILABILITY_BYTES, 'little')
+
+def rebase(bitmap: bytes, start_date: DateLike, new_start_date: DateLike) -> bytes:
+    """비트맵 시작일 이동 (지난 날은 버리고, 새로 들어온 날은 예약 불가(미확인)로 채움)"""
+    shift = (to_date(new_start_date) - to_date(start_date)).days
+    value = int.from_bytes(bitmap, 'little')
+    value = value >> shift if shift >= 0 else value << -shift
+    return (value & _range_mask(0, AVAILABILITY_DAYS)).to_bytes(AVAILABILITY_BYTES, 'little')
+
+def is_available(bitmap: bytes, start_date: DateLike, check_in: DateLike, nights: int) -> bool:
+    """check_in부터 nights박 연속 예약 가능 여부 (비트맵 범위를 벗어나면 False)"""
+    offset = (to_date(check_in) - to_date(start_date)).days
+    if nights <= 0 or offset < 0 or offset + nights > AVAILABILITY_DAYS:
+        return False
+    mask = (1 << nights) - 1
+    return (int.from_bytes(bitmap, 'little') >> offset) & mask == mask
+
+def to_ranges(bitmap: bytes, start_date: DateLike) -> List[Tuple[str, str]]:
+    """비트맵을 예약 가능 [체크인, 체크아웃) 날짜 기간 목록으로 변환"""
+    start = to_date(start_date)
+    value = int.from_bytes(bitmap, 'little')
+    ranges = []
+    day = 0
+    while day < AVAILABILITY_DAYS:
+        if not value >> day & 1:
+            day += 1
+            continue
+        end = day
+        while end < AVAILABILITY_DAYS and value >> end & 1:
+            end += 1
+        ranges.append(((start + timedelta(days=day)).isoformat(), (start + timedelta(days=end)).isoformat()))
+        day = end
+    return ranges
+
+def check_many(bitmaps: Sequence[bytes], offsets: Sequence[int], nights: int) -> List[bool]:
+    """여러 숙소의 비트맵에서 각자의 offset부터 nights박 연속 예약 가능 여부를 일괄 검사
+    
+    NumPy가 있으면 필요한 바이트 구간만 풀어 (숙소 수 x nights) 행렬에서 한 번에 판정
+    """
+    if not bitmaps:
+        return []
+    if np is None or nights <= 0:
+        mask = (1 << nights) - 1 if nights > 0 else 0
+        return [
+            nights > 0 and 0 <= offset and offset + nights <= AVAILABILITY_DAYS
+            and (int.from_bytes(bitmap, 'little') >> offset) & mask == mask
+            for bitmap, offset in zip(bitmaps, offsets)
+        ]
+    
+    matrix = np.frombuffer(b''.join(bitmaps), dtype=np.uint8).reshape(len(bitmaps), AVAILABILITY_BYTES)
+    offsets = np.asarray(offsets, dtype=np.int64)
+    valid = (offsets >= 0) & (offsets + nights <= AVAILABILITY_DAYS)
+    if not valid.any():
+        return [False] * len(bitmaps)
+    
+    # 모든 숙소가 참조하는 바이트 구간만 비트로 풀기
+    low = int(offsets[valid].min()) // 8
+    high = (int(offsets[valid].max()) + nights + 7) // 8
+    bits = np.unpackbits(matrix[:, low:high], axis=1, bitorder='little')
+    
+    columns = np.clip(offsets - low * 8, 0, None)[:, None] + np.arange(nights)
+    columns = np.minimum(columns, bits.shape[1] - 1)
+    result = bits[np.arange(len(bitmaps))[:, None], columns].all(axis=1) & valid
+    return result.tolist()
@@ -0,0 +1,219 @@
+"""
+데이터베이스 백업 모듈
+운영 중인 SQLite DB를 페이지 단위로 온라인 백업하고, 검증 후 복원
+"""
+
+import os
+import gzip
+import shutil
+import sqlite3
+import hashlib
+import logging
+import time
+from datetime import datetime
+from typing import Dict, List, Any
+
+logger = logging.getLogger(__name__)
+
+# backup() 한 단계당 복사할 페이지 수와 단계 사이 대기(초)
+BACKUP_PAGES_PER_STEP = 256
+BACKUP_STEP_PAUSE = 0.002
+
+BACKUP_SUFFIX = '.db.gz'
+CHECKSUM_SUFFIX = '.sha256'
+
+class BackupManager:
+    """데이터베이스 백업/복원 클래스
+    
+    백업은 별도 커넥션에서 sqlite3 backup API로 페이지를 나눠 복사하므로
+    커넥션 풀의 쓰기 락을 잡지 않고, 결과는 gzip 압축 + SHA-256 체크섬 파일로 보관
+    """
+    
+    def __init__(self, db_manager, backup_dir: str = None, keep: int = None):
+        """초기화"""
+        self.db_manager = db_manager
+        self.backup_dir = backup_dir or os.getenv('BACKUP_DIR', 'data/backups')
+        self.keep = keep if keep is not None else int(os.getenv('BACKUP_KEEP', '7'))
+    
+    def create_backup(self, pages_per_step: int = BACKUP_PAGES_PER_STEP) -> Dict[str, Any]:
+        """온라인 백업 생성 (압축 파일명, 크기, 체크섬 반환)"""
+        os.makedirs(self.backup_dir, exist_ok=True)
+        
+        name = f"backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        raw_path = os.path.join(self.backup_dir, name + '.db.tmp')
+        backup_path = os.path.join(self.backup_dir, name + BACKUP_SUFFIX)
+        
+        started = time.monotonic()
+        try:
+            self._copy_database(raw_path, pages_per_step)
+            self._check_integrity(raw_path)
+            checksum = self._compress(raw_path, backup_path)
+        finally:
+            if os.path.exists(raw_path):
+                os.remove(raw_path)
+        
+        with open(backup_path + CHECKSUM_SUFFIX, 'w', encoding='utf-8') as f:
+            f.write(f"{checksum}  {os.path.basename(backup_path)}\n")
+        
+        result = {
+            'backup_file': os.path.basename(backup_path),
+            'size': os.path.getsize(backup_path),
+            'checksum': checksum,
+            'created_at': datetime.now().isoformat(),
+            'elapsed_seconds': round(time.monotonic() - started, 3)
+        }
+        logger.info(f"데이터베이스 백업 완료: {result}")
+        
+        self._prune()
+        return result
+    
+    def _copy_database(self, raw_path: str, pages_per_step: int):
+        """backup API로 pages_per_step 페이지씩 복사 (단계 사이에 잠시 양보)"""
+        def progress(status, remaining, total):
+            time.sleep(BACKUP_STEP_PAUSE)
+        
+        target = sqlite3.connect(raw_path)
+        try:
+            if self.db_manager.pool.in_memory:
+                # 인메모리 DB는 공유 쓰기 커넥션에서만 접근 가능
+                with self.db_manager.pool.writer() as source:
+                    source.backup(target, pages=pages_per_step)
+            else:
+                source = sqlite3.connect(self.db_manager.db_path, isolation_level=None)
+                try:
+                    # 읽기 트랜잭션을 유지해 WAL 스냅샷을 고정 (다른 커넥션의 쓰기로 백업이 재시작되지 않음)
+                    source.execute('BEGIN')
+                    source.execute('SELECT COUNT(*) FROM sqlite_master').fetchone()
+                    source.backup(target, pages=pages_per_step, progress=progress)
+                    source.execute('COMMIT')
+                finally:
+                    source.close()
+            # 백업본은 단일 파일로 보관
+            target.execute('PRAGMA journal_mode = DELETE')
+        finally:
+            target.close()
+    
+    @staticmethod
+    def _check_integrity(path: str):
+        """SQLite 무결성 검사 (실패 시 ValueError)"""
+        conn = sqlite3.connect(path)
+        try:
+            result = conn.execute('PRAGMA integrity_check').fetchone()[0]
+            conn.execute('SELECT COUNT(*) FROM properties').fetchone()
+        except sqlite3.DatabaseError as e:
+            raise ValueError(f"유효한 데이터베이스가 아닙니다: {str(e)}")
+        finally:
+            conn.close()
+        
+        if result != 'ok':
+            raise ValueError(f"무결성 검사 실패: {result}")
+    
+    @staticmethod
+    def _compress(source_path: str, backup_path: str) -> str:
+        """gzip 압축 후 압축 파일의 SHA-256 반환"""
+        temp_path = backup_path + '.tmp'
+        with open(source_path, 'rb') as src, gzip.open(temp_path, 'wb') as dst:
+            shutil.copyfileobj(src, dst, 1024 * 1024)
+        
+        checksum = BackupManager._file_checksum(temp_path)
+        os.replace(temp_path, backup_path)
+        return checksum
+    
+    @staticmethod
+    def _file_checksum(path: str) -> str:
+        """파일 SHA-256"""
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(block)
+        return digest.hexdigest()
+    
+    def _resolve(self, backup_file: str) -> str:
+        """백업 파일명을 백업 디렉터리 안의 경로로 변환 (디렉터리 밖 경로 차단)"""
+        name = os.path.basename(backup_file)
+        if not name.endswith(BACKUP_SUFFIX):
+            raise ValueError(f"백업 파일이 아닙니다: {backup_file}")
+        
+        path = os.path.join(self.backup_dir, name)
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"백업 파일을 찾을 수 없습니다: {name}")
+        return path
+    
+    def verify_backup(self, backup_file: str) -> bool:
+        """체크섬 파일과 압축 파일의 SHA-256 비교"""
+        path = self._resolve(backup_file)
+        checksum_path = path + CHECKSUM_SUFFIX
+        if not os.path.exists(checksum_path):
+            raise ValueError(f"체크섬 파일이 없습니다: {os.path.basename(checksum_path)}")
+        
+        with open(checksum_path, encoding='utf-8') as f:
+            expected = f.read().split()[0]
+        return self._file_checksum(path) == expected
+    
+    def restore_backup(self, backup_file: str) -> Dict[str, Any]:
+        """백업 복원 (체크섬/무결성 검증 후 DB 파일을 원자적으로 교체)"""
+        if self.db_manager.pool.in_memory:
+            raise ValueError("인메모리 데이터베이스는 복원할 수 없습니다")
+        
+        path = self._resolve(backup_file)
+        if not self.verify_backup(backup_file):
+            raise ValueError(f"체크섬이 일치하지 않습니다: {os.path.basename(path)}")
+        
+        # DB와 같은 디렉터리에 풀어야 os.replace가 원자적으로 동작
+        db_path = self.db_manager.db_path
+        restore_path = db_path + '.restore'
+        try:
+            with gzip.open(path, 'rb') as src, open(restore_path, 'wb') as dst:
+                shutil.copyfileobj(src, dst, 1024 * 1024)
+            self._check_integrity(restore_path)
+            
+            # 모든 커넥션을 닫은 뒤 교체하고, 이전 DB의 WAL이 새 파일에 적용되지 않도록 제거
+            with self.db_manager.pool.exclusive():
+                os.replace(restore_path, db_path)
+                for suffix in ('-wal', '-shm'):
+                    if os.path.exists(db_path + suffix):
+                        os.remove(db_path + suffix)
+        finally:
+            if os.path.exists(restore_path):
+                os.remove(restore_path)
+        
+        # 이전 버전 스키마 백업이면 마이그레이션 적용
+        self.db_manager.init_database()
+        
+        result = {
+            'restored_from': os.path.basename(path),
+            'restored_at': datetime.now().isoformat(),
+            'schema_version': self.db_manager.get_schema_version()
+        }
+        logger.info(f"데이터베이스 복원 완료: {result}")
+        return result
+    
+    def list_backups(self) -> List[Dict[str, Any]]:
+        """백업 목록 (최신순)"""
+        if not os.path.isdir(self.backup_dir):
+            return []
+        
+        backups = []
+        for name in sorted(os.listdir(self.backup_dir), reverse=True):
+            if not name.endswith(BACKUP_SUFFIX):
+                continue
+            path = os.path.join(self.backup_dir, name)
+            backups.append({
+                'backup_file': name,
+                'size': os.path.getsize(path),
+                'created_at': datetime.fromtimestamp(os.path.getmtime(path)).isoformat(),
+                'has_checksum': os.path.exists(path + CHECKSUM_SUFFIX)
+            })
+        return backups
+    
+    def _prune(self):
+        """보관 개수(keep)를 넘는 오래된 백업 삭제"""
+        if self.keep <= 0:
+            return
+        
+        for backup in self.list_backups()[self.keep:]:
+            path = os.path.join(self.backup_dir, backup['backup_file'])
+            for target in (path, path + CHECKSUM_SUFFIX):
+                if os.path.exists(target):
+                    os.remove(target)
+            logger.info(f"오래된 백업 삭제: {backup['backup_file']}")
@@ -0,0 +1,258 @@
+"""
+클릭 추적 모듈
+전환 추적 링크를 짧은 base62 코드로 발급하고 리다이렉트 클릭을 기록
+"""
+
+import os
+import time
+import queue
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+BASE62_ALPHABET = '0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz'
+
+# SQLite INTEGER(64비트) 범위를 넘지 않는 최대 코드 길이
+MAX_CODE_LENGTH = 10
+
+# 존재하지 않는 코드 캐시 (반복 요청마다 DB를 조회하지 않도록 크기/유효시간 제한)
+NEGATIVE_CACHE_SIZE = 10000
+NEGATIVE_CACHE_TTL = 60.0
+
+# 클릭 로그 기록/집계 주기(초)와 집계가 끝난 로그를 비우는 크기
+CLICK_LOG_FLUSH_INTERVAL = 1.0
+CLICK_LOG_MAX_BYTES = 16 * 1024 * 1024
+
+# db_meta에 저장하는 클릭 로그 집계 위치
+CLICK_LOG_OFFSET_KEY = 'click_log_offset'
+
+class _FlushDeferred(Exception):
+    """전환 카운터 버퍼 flush가 반영되지 않아 트랜잭션을 되돌릴 때 사용"""
+
+def encode_base62(number: int) -> str:
+    """양의 정수를 base62 문자열로 변환"""
+    if number < 0:
+        raise ValueError("음수는 인코딩할 수 없습니다")
+    if number == 0:
+        return BASE62_ALPHABET[0]
+    
+    chars = []
+    while number:
+        number, remainder = divmod(number, 62)
+        chars.append(BASE62_ALPHABET[remainder])
+    return ''.join(reversed(chars))
+
+def decode_base62(code: str) -> int:
+    """base62 문자열을 정수로 변환"""
+    number = 0
+    for char in code:
+        index = BASE62_ALPHABET.find(char)
+        if index < 0:
+            raise ValueError(f"잘못된 단축 코드: {code}")
+        number = number * 62 + index
+    return number
+
+class ClickTracker:
+    """단축 링크 조회 및 클릭 기록 클래스
+    
+    코드 -> (property_id, platform, tracking_url) 매핑을 메모리에 유지하고,
+    클릭은 메모리 큐에 넣기만 한다. 백그라운드 스레드가 큐를 추가 전용 로그
+    파일에 기록하고, 로그에서 아직 집계하지 않은 부분을 읽어 전환 카운터에 반영
+    """
+    
+    def __init__(self, db_manager, log_path: Optional[str] = "data/clicks.log",
+                 flush_interval: float = CLICK_LOG_FLUSH_INTERVAL):
+        """초기화"""
+        self.db_manager = db_manager
+        self.log_path = log_path
+        self.flush_interval = flush_interval
+        self._links: Dict[str, Tuple[str, str, str]] = {}
+        self._misses: 'OrderedDict[str, float]' = OrderedDict()
+        self._miss_lock = threading.Lock()
+        self._clicks: 'queue.SimpleQueue[str]' = queue.SimpleQueue()
+        self._log_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+    
+    def warm(self) -> int:
+        """데이터베이스의 모든 추적 링크를 메모리에 적재 (이전 실행에서 남은 클릭 로그도 집계)"""
+        for conversion_id, property_id, platform, tracking_url in self.db_manager.get_tracking_links():
+            self._links[encode_base62(conversion_id)] = (property_id, platform, tracking_url)
+        
+        logger.info(f"단축 링크 적재 완료: {len(self._links)}개")
+        if self.log_path:
+            self.aggregate()
+        return len(self._links)
+    
+    def create_link(self, property_id: str, platform: str, tracking_url: str) -> Optional[str]:
+        """추적 링크 저장 후 단축 코드 발급"""
+        conversion_id = self.db_manager.save_tracking_link(property_id, platform, tracking_url)
+        if conversion_id is None:
+            return None
+        
+        code = encode_base62(conversion_id)
+        self._links[code] = (property_id, platform, tracking_url)
+        with self._miss_lock:
+            self._misses.pop(code, None)
+        return code
+    
+    def lookup(self, code: str) -> Optional[Tuple[str, str, str]]:
+        """메모리에 적재된 단축 코드만 조회 (DB 접근 없음)"""
+        return self._links.get(code)
+    
+    def _is_known_miss(self, code: str) -> bool:
+        """최근에 없다고 확인된 코드인지 확인"""
+        with self._miss_lock:
+            missed_at = self._misses.get(code)
+            if missed_at is None:
+                return False
+            if time.monotonic() - missed_at > NEGATIVE_CACHE_TTL:
+                del self._misses[code]
+                return False
+            return True
+    
+    def _remember_miss(self, code: str):
+        """없는 코드 기록 (가장 오래된 항목부터 제거)"""
+        with self._miss_lock:
+            self._misses[code] = time.monotonic()
+            self._misses.move_to_end(code)
+            while len(self._misses) > NEGATIVE_CACHE_SIZE:
+                self._misses.popitem(last=False)
+    
+    def resolve(self, code: str) -> Optional[Tuple[str, str, str]]:
+        """단축 코드 조회 (메모리에 없으면 데이터베이스에서 한 번 조회 후 캐시, 블로킹)"""
+        link = self._links.get(code)
+        if link is not None:
+            return link
+        
+        if len(code) > MAX_CODE_LENGTH or self._is_known_miss(code):
+            return None
+        
+        try:
+            conversion_id = decode_base62(code)
+        except ValueError:
+            return None
+        
+        link = self.db_manager.get_tracking_link(conversion_id)
+        if link is not None:
+            self._links[code] = link
+        else:
+            self._remember_miss(code)
+        return link
+    
+    def record_click(self, code: str, property_id: str, platform: str):
+        """클릭 기록 (메모리 큐에 추가만 하므로 블로킹 I/O 없음)"""
+        if not self.log_path:
+            self.db_manager.record_conversion(property_id, platform, click_count=1)
+            return
+        
+        self._clicks.put(f"{datetime.now().isoformat()}\t{code}\t{property_id}\t{platform}\n")
+        if self._thread is None:
+            with self._log_lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name='click-log', daemon=True)
+                    self._thread.start()
+    
+    def _write_pending(self) -> int:
+        """큐에 쌓인 클릭을 로그 파일에 추가 (기록한 줄 수 반환)"""
+        lines = []
+        while True:
+            try:
+                lines.append(self._clicks.get_nowait())
+            except queue.Empty:
+                break
+        
+        if lines:
+            os.makedirs(os.path.dirname(self.log_path) or '.', exist_ok=True)
+            with open(self.log_path, 'a', encoding='utf-8') as log_file:
+                log_file.writelines(lines)
+        return len(lines)
+    
+    def _read_new_clicks(self, offset: int) -> Tuple[Dict[Tuple[str, str], List[int]], int, int]:
+        """offset 이후 완성된 줄을 읽어 (증가분, 새 offset, 클릭 수) 반환"""
+        increments: Dict[Tuple[str, str], List[int]] = {}
+        clicks = 0
+        with open(self.log_path, 'rb') as log_file:
+            log_file.seek(offset)
+            for line in log_file:
+                if not line.endswith(b'\n'):
+                    break
+                offset += len(line)
+                fields = line.decode('utf-8').rstrip('\n').split('\t')
+                if len(fields) != 4:
+                    logger.warning(f"잘못된 클릭 로그 줄 건너뜀: {line!r}")
+                    continue
+                counts = increments.setdefault((fields[2], fields[3]), [0, 0])
+                counts[0] += 1
+                clicks += 1
+        return increments, offset, clicks
+    
+    def aggregate(self) -> int:
+        """클릭 로그에서 아직 집계하지 않은 부분을 전환 통계에 반영 (반영한 클릭 수 반환)
+        
+        증가분은 전환 카운터 버퍼에 넣고 flush해 로그 위치(db_meta)와 한 트랜잭션으로 저장하므로
+        중간에 종료되어도 같은 클릭을 두 번 집계하지 않는다. 모두 집계된 로그가 커지면 비운다.
+        """
+        with self._log_lock:
+            self._write_pending()
+            if not os.path.exists(self.log_path):
+                return 0
+            
+            size = os.path.getsize(self.log_path)
+            offset = self.db_manager.get_meta(CLICK_LOG_OFFSET_KEY, 0)
+            if offset > size:
+                # 로그 파일이 교체되었으면 처음부터 집계
+                offset = 0
+            
+            increments, offset, clicks = self._read_new_clicks(offset)
+            try:
+                with self.db_manager.pool.writer():
+                    for (property_id, platform), (click_count, conversion_count) in increments.items():
+                        self.db_manager.record_conversion(property_id, platform, click_count, conversion_count)
+                    if increments and not self.db_manager.conversion_buffer.flush():
+                        raise _FlushDeferred()
+                    self.db_manager.set_meta(CLICK_LOG_OFFSET_KEY, offset)
+            except _FlushDeferred:
+                # 반영하지 못한 증가분은 버퍼에 남아 다음 flush에서 재시도되므로 로그 위치만 저장
+                self.db_manager.set_meta(CLICK_LOG_OFFSET_KEY, offset)
+            
+            if offset == size and size >= CLICK_LOG_MAX_BYTES:
+                # 비운 뒤 위치를 되돌리기 전에 종료되어도 offset > size 검사로 처음부터 집계
+                open(self.log_path, 'w').close()
+                self.db_manager.set_meta(CLICK_LOG_OFFSET_KEY, 0)
+            return clicks
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """클릭 적체 지표 (로그에 아직 쓰지 않은 클릭 수, 아직 집계하지 않은 로그 바이트)"""
+        unaggregated = 0
+        if self.log_path and os.path.exists(self.log_path):
+            offset = self.db_manager.get_meta(CLICK_LOG_OFFSET_KEY, 0)
+            size = os.path.getsize(self.log_path)
+            unaggregated = size - offset if offset <= size else size
+        return {
+            'queued_clicks': self._clicks.qsize(),
+            'unaggregated_log_bytes': unaggregated,
+            'cached_links': len(self._links),
+            'cached_misses': len(self._misses)
+        }
+    
+    def _run(self):
+        """주기적 로그 기록/집계 루프"""
+        while not self._stop_event.wait(self.flush_interval):
+            try:
+                self.aggregate()
+            except Exception as e:
+                logger.error(f"클릭 로그 집계 중 오류: {str(e)}")
+    
+    def close(self):
+        """백그라운드 스레드 종료 후 남은 클릭 기록/집계"""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+        if self.log_path:
+            self.aggregate()
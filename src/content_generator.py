@@ -292,6 +292,7 @@ class ContentGenerator:
     
     def _generate_blog_content(self, property_data: Dict) -> str:
         """블로그 본문 생성"""
+        nearby_section = self._generate_nearby_section(property_data)
         return f"""
         <h2>{property_data.get('title', '')} - {property_data.get('city', '')} 여행의 완벽한 선택</h2>
         
@@ -332,7 +333,7 @@ class ContentGenerator:
         대중교통을 이용한 이동도 편리하며, 
         주변에 편의시설과 맛집들이 많아 여행하기에 최적의 환경을 제공합니다.</p>
         
-        <h3>🎯 총평</h3>
+        {nearby_section}<h3>🎯 총평</h3>
         <p><strong>{property_data.get('title', '')}</strong>는 {property_data.get('city', '')} 여행을 계획하고 계신다면 
         강력히 추천드리는 숙소입니다. 합리적인 가격, 우수한 편의시설, 
         그리고 편리한 위치까지 모든 조건을 만족하는 숙소라고 할 수 있습니다.</p>
@@ -344,6 +345,25 @@ class ContentGenerator:
         저희 블로그를 계속 방문해주세요! 😊</p>
         """
     
+    def _generate_nearby_section(self, property_data: Dict) -> str:
+        """근처 다른 숙소 섹션 (nearby_properties가 없으면 빈 문자열)"""
+        nearby = property_data.get('nearby_properties') or []
+        if not nearby:
+            return ''
+        
+        items = ''.join([
+            f'<li><a href="{other.get("booking_url", "")}" target="_blank">{other.get("title", "")}</a> '
+            f'({other.get("distance_km", 0):.1f}km)</li>'
+            for other in nearby
+        ])
+        return f"""<h3>🗺️ 근처의 다른 숙소</h3>
+        <p>{property_data.get('title', '')} 주변에서 함께 살펴볼 만한 숙소도 소개해드립니다:</p>
+        <ul>
+            {items}
+        </ul>
+        
+        """
+    
     def _create_blog_excerpt(self, property_data: Dict) -> str:
         """블로그 요약 생성"""
         return f"{property_data.get('city', '')} 여행의 완벽한 선택! {property_data.get('title', '')}의 상세 리뷰와 예약 정보를 확인해보세요."
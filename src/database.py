@@ -4,26 +4,1405 @@
 """
 
 import sqlite3
+import base64
+import bisect
+import functools
+import gzip
+import hashlib
+import inspect
 import json
 import logging
-from typing import Dict, List, Optional, Any
-from datetime import datetime
+import math
+import re
+import threading
+import time
+from collections import deque
+from collections.abc import MutableMapping
+from contextlib import contextmanager
+from itertools import islice
+from typing import Dict, List, Optional, Any, Iterable, Iterator, Tuple, Callable
+from datetime import date, datetime, timedelta, timezone
 import os
 
+from .availability import (
+    AVAILABILITY_DAYS, build_bitmap, check_many, is_available,
+    rebase, set_nights, to_date, to_ranges,
+)
+
 logger = logging.getLogger(__name__)
 
+# 커넥션 풀 기본 PRAGMA 설정
+DEFAULT_PRAGMAS = {
+    'auto_vacuum': 'INCREMENTAL',  # 새 DB에만 적용 (기존 DB는 enable_incremental_vacuum() 필요)
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'cache_size': -20000,  # KiB 단위 (약 20MB)
+    'mmap_size': 268435456,  # 256MB
+    'busy_timeout': 5000,  # 밀리초
+    'temp_store': 'MEMORY',
+}
+
+# 읽기 커넥션이 모두 대여 중일 때 추가로 열 수 있는 임시 커넥션 수와, 그마저 찼을 때 대기 시간(초)
+READER_OVERFLOW = 8
+READER_ACQUIRE_TIMEOUT = 10.0
+
+# 콘텐츠 생성에 쓰이는 숙소 컬럼 (값이 바뀌면 data_version 증가 -> 콘텐츠 재생성 대상)
+CONTENT_SOURCE_COLUMNS = (
+    'title', 'description', 'city', 'price_per_night', 'property_type', 'max_guests',
+    'bedrooms', 'bathrooms', 'amenities', 'rating', 'review_count', 'host_name',
+    'images', 'booking_url',
+)
+
+# 숙소 삽입/업데이트 (created_at은 최초 삽입 시에만 기록)
+PROPERTY_UPSERT_SQL = '''
+    INSERT INTO properties (
+        id, title, description, city, latitude, longitude,
+        price_per_night, property_type, max_guests, bedrooms,
+        bathrooms, amenities, rating, review_count, host_name,
+        host_rating, images, availability, booking_url,
+        created_at, scraped_at
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(id) DO UPDATE SET
+        title = excluded.title, description = excluded.description,
+        city = excluded.city, latitude = excluded.latitude, longitude = excluded.longitude,
+        price_per_night = excluded.price_per_night, property_type = excluded.property_type,
+        max_guests = excluded.max_guests, bedrooms = excluded.bedrooms,
+        bathrooms = excluded.bathrooms, amenities = excluded.amenities,
+        rating = excluded.rating, review_count = excluded.review_count,
+        host_name = excluded.host_name, host_rating = excluded.host_rating,
+        images = excluded.images, availability = excluded.availability,
+        booking_url = excluded.booking_url, scraped_at = excluded.scraped_at,
+        is_active = 1,
+        data_version = properties.data_version + ({})
+'''.format(' OR '.join(f'properties.{column} IS NOT excluded.{column}' for column in CONTENT_SOURCE_COLUMNS))
+
+# 같은 입력으로 생성된 (property_id, content_type, content_hash) 콘텐츠가 이미 있으면 삽입하지 않음
+CONTENT_INSERT_SQL = '''
+    INSERT OR IGNORE INTO content (property_id, content_type, content_data, created_at, content_hash)
+    VALUES (?, ?, ?, ?, ?)
+'''
+
+# 숙소 예약 가능일 비트맵 저장
+AVAILABILITY_UPSERT_SQL = '''
+    INSERT INTO property_availability (property_id, start_date, bitmap, updated_at)
+    VALUES (?, ?, ?, ?)
+    ON CONFLICT(property_id) DO UPDATE SET
+        start_date = excluded.start_date, bitmap = excluded.bitmap, updated_at = excluded.updated_at
+'''
+
+# 스키마 마이그레이션 목록: (버전, 설명, 단계 목록)
+# 단계는 SQL 문자열 또는 cursor를 받는 함수이며, 적용 버전은 PRAGMA user_version으로 관리
+MIGRATIONS = [
+    (1, '조회 경로 인덱스 및 전환 추적 UNIQUE 제약', [
+        'CREATE INDEX IF NOT EXISTS idx_posting_history_posted_at ON posting_history (posted_at)',
+        'CREATE INDEX IF NOT EXISTS idx_content_pending ON content (is_posted, created_at)',
+        'CREATE INDEX IF NOT EXISTS idx_properties_active_scraped ON properties (is_active, scraped_at)',
+        # 중복 전환 추적 행을 하나로 합친 뒤 UNIQUE 인덱스 생성
+        '''
+            UPDATE conversions SET
+                click_count = (SELECT SUM(c2.click_count) FROM conversions c2
+                               WHERE c2.property_id = conversions.property_id AND c2.platform = conversions.platform),
+                conversion_count = (SELECT SUM(c2.conversion_count) FROM conversions c2
+                                    WHERE c2.property_id = conversions.property_id AND c2.platform = conversions.platform)
+            WHERE id IN (SELECT MIN(id) FROM conversions GROUP BY property_id, platform HAVING COUNT(*) > 1)
+        ''',
+        '''
+            DELETE FROM conversions
+            WHERE id NOT IN (SELECT MIN(id) FROM conversions GROUP BY property_id, platform)
+        ''',
+        'CREATE UNIQUE INDEX IF NOT EXISTS uq_conversions_property_platform ON conversions (property_id, platform)',
+    ]),
+    (2, '숙소 키셋 페이지네이션 인덱스 (scraped_at, id)', [
+        'DROP INDEX IF EXISTS idx_properties_active_scraped',
+        'CREATE INDEX IF NOT EXISTS idx_properties_active_scraped_id ON properties (is_active, scraped_at, id)',
+    ]),
+    (3, '숙소 전문 검색 인덱스 (FTS5 trigram)', [
+        lambda cursor: _create_properties_fts(cursor),
+    ]),
+    (4, '게시/전환 일별 롤업 테이블', [
+        '''
+            CREATE TABLE IF NOT EXISTS posting_daily_rollup (
+                date TEXT NOT NULL,
+                platform TEXT NOT NULL,
+                property_id TEXT NOT NULL,
+                posts INTEGER NOT NULL DEFAULT 0,
+                success INTEGER NOT NULL DEFAULT 0,
+                failed INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (date, platform, property_id)
+            ) WITHOUT ROWID
+        ''',
+        '''
+            CREATE TABLE IF NOT EXISTS conversion_daily_rollup (
+                date TEXT NOT NULL,
+                platform TEXT NOT NULL,
+                property_id TEXT NOT NULL,
+                clicks INTEGER NOT NULL DEFAULT 0,
+                conversions INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (date, platform, property_id)
+            ) WITHOUT ROWID
+        ''',
+        lambda cursor: _backfill_rollups(cursor),
+    ]),
+    (5, '콘텐츠 게시 작업 임대(lease) 컬럼', [
+        'ALTER TABLE content ADD COLUMN claimed_by TEXT',
+        'ALTER TABLE content ADD COLUMN lease_expires_at TIMESTAMP',
+        'CREATE INDEX IF NOT EXISTS idx_content_claimed_by ON content (claimed_by) WHERE claimed_by IS NOT NULL',
+    ]),
+    # 기존 행의 content_hash는 NULL로 남겨 두고 compact_duplicate_content()로 배치 정리
+    (6, '콘텐츠 해시 컬럼 및 중복 방지 UNIQUE 인덱스', [
+        'ALTER TABLE content ADD COLUMN content_hash TEXT',
+        'CREATE UNIQUE INDEX IF NOT EXISTS uq_content_property_type_hash ON content (property_id, content_type, content_hash)',
+        'CREATE INDEX IF NOT EXISTS idx_content_hash_missing ON content (id) WHERE content_hash IS NULL',
+    ]),
+    # content_version < data_version 이면 콘텐츠 재생성 필요 (기존 콘텐츠가 있는 숙소는 최신으로 간주)
+    (7, '숙소 콘텐츠 재생성 대기열 (data_version/content_version)', [
+        'ALTER TABLE properties ADD COLUMN data_version INTEGER NOT NULL DEFAULT 1',
+        'ALTER TABLE properties ADD COLUMN content_version INTEGER NOT NULL DEFAULT 0',
+        'UPDATE properties SET content_version = data_version WHERE id IN (SELECT property_id FROM content)',
+        'CREATE INDEX IF NOT EXISTS idx_properties_stale_content ON properties (is_active, id) WHERE content_version < data_version',
+    ]),
+    (8, '데이터베이스 설정 메타 테이블', [
+        '''
+            CREATE TABLE IF NOT EXISTS db_meta (
+                key TEXT PRIMARY KEY,
+                value TEXT
+            ) WITHOUT ROWID
+        ''',
+    ]),
+    # amenity_mask는 트리거가 amenities(JSON) 변경 시 함께 갱신
+    (9, '편의시설 사전 테이블 및 비트마스크 컬럼', [
+        '''
+            CREATE TABLE IF NOT EXISTS amenities (
+                id INTEGER PRIMARY KEY,
+                name TEXT NOT NULL UNIQUE
+            )
+        ''',
+        'ALTER TABLE properties ADD COLUMN amenity_mask INTEGER NOT NULL DEFAULT 0',
+        lambda cursor: _create_amenity_index(cursor),
+    ]),
+    # 비트 i = start_date + i일 밤의 예약 가능 여부 (src/availability.py 참고)
+    (10, '숙소 예약 가능일 비트맵 테이블', [
+        '''
+            CREATE TABLE IF NOT EXISTS property_availability (
+                property_id TEXT PRIMARY KEY,
+                start_date TEXT NOT NULL,
+                bitmap BLOB NOT NULL,
+                updated_at TIMESTAMP
+            ) WITHOUT ROWID
+        ''',
+    ]),
+    (11, '숙소 위치 R*Tree 인덱스', [
+        lambda cursor: _create_properties_geo(cursor),
+    ]),
+    (12, '지도 마커 줌별 클러스터 테이블', [
+        lambda cursor: _create_property_clusters(cursor),
+    ]),
+    (13, '숙소 FTS 갱신 트리거에 값 변경 조건 추가', [
+        lambda cursor: _guard_properties_fts_update(cursor),
+    ]),
+]
+
+# 타임스탬프 저장 형식 (db_meta 'timestamp_format'): ISO 문자열(기본) 또는 UTC epoch 밀리초 정수
+TIMESTAMP_FORMAT_ISO = 'iso'
+TIMESTAMP_FORMAT_EPOCH_MS = 'epoch_ms'
+
+# epoch 밀리초 형식 전환 대상 (테이블, 컬럼)
+EPOCH_TIMESTAMP_COLUMNS = (
+    ('properties', 'created_at'),
+    ('properties', 'scraped_at'),
+    ('content', 'created_at'),
+    ('content', 'posted_at'),
+    ('posting_history', 'posted_at'),
+    ('conversions', 'created_at'),
+    ('conversions', 'last_updated'),
+    ('property_availability', 'updated_at'),
+)
+
+# 전문 검색 최소 검색어 길이 (trigram 토크나이저 특성상 3자 미만은 LIKE로 처리)
+FTS_MIN_TERM_LENGTH = 3
+
+# 콘텐츠 입력 해시에서 숫자로 비교할 컬럼 (INTEGER/REAL 저장 형태 차이를 무시)
+CONTENT_NUMERIC_COLUMNS = {'price_per_night', 'max_guests', 'bedrooms', 'bathrooms', 'rating', 'review_count'}
+CONTENT_JSON_COLUMNS = {'amenities', 'images'}
+
+def content_hash(content: Any) -> str:
+    """콘텐츠의 안정적인 해시 (키 정렬 JSON의 SHA-256)"""
+    canonical = json.dumps(content, sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+def content_source_hash(property_data: Any, content_type: str) -> str:
+    """콘텐츠 생성 입력(숙소의 CONTENT_SOURCE_COLUMNS 값 + 콘텐츠 유형)의 해시
+    
+    생성 결과는 템플릿/해시태그 무작위 선택과 AI 응답 때문에 매번 달라지므로 입력을 기준으로 중복 판단
+    """
+    source = {'content_type': content_type}
+    for column in CONTENT_SOURCE_COLUMNS:
+        value = property_data.get(column)
+        if column in CONTENT_NUMERIC_COLUMNS:
+            try:
+                value = float(value or 0)
+            except (TypeError, ValueError):
+                pass
+        elif column in CONTENT_JSON_COLUMNS:
+            value = json.loads(value) if isinstance(value, str) else (value or [])
+        elif value is None:
+            value = ''
+        source[column] = value
+    return content_hash(source)
+
+def _day_expression(column: str, epoch_ms: bool = False) -> str:
+    """타임스탬프 컬럼의 날짜(YYYY-MM-DD) SQL 식 (epoch 밀리초는 UTC 기준 날짜)"""
+    if epoch_ms:
+        return f"date({column} / 1000, 'unixepoch')"
+    return f"substr({column}, 1, 10)"
+
+def _backfill_rollups(cursor, epoch_ms: bool = False):
+    """원본 게시 이력/전환 테이블에서 일별 롤업 재계산"""
+    cursor.execute('DELETE FROM posting_daily_rollup')
+    cursor.execute(f'''
+        INSERT INTO posting_daily_rollup (date, platform, property_id, posts, success, failed)
+        SELECT {_day_expression('posted_at', epoch_ms)}, COALESCE(platform, ''), COALESCE(property_id, ''),
+               COUNT(*), SUM(status = 'success'), SUM(status = 'failed')
+        FROM posting_history
+        WHERE posted_at IS NOT NULL
+        GROUP BY 1, 2, 3
+    ''')
+    
+    # 전환 테이블은 누적값만 있으므로 마지막 갱신일에 귀속
+    cursor.execute('DELETE FROM conversion_daily_rollup')
+    cursor.execute(f'''
+        INSERT INTO conversion_daily_rollup (date, platform, property_id, clicks, conversions)
+        SELECT {_day_expression('COALESCE(last_updated, created_at)', epoch_ms)}, COALESCE(platform, ''), COALESCE(property_id, ''),
+               SUM(click_count), SUM(conversion_count)
+        FROM conversions
+        WHERE COALESCE(last_updated, created_at) IS NOT NULL
+          AND (click_count > 0 OR conversion_count > 0)
+        GROUP BY 1, 2, 3
+    ''')
+
+def _create_properties_fts(cursor):
+    """properties 외부 콘텐츠 FTS5 테이블과 동기화 트리거 생성"""
+    try:
+        cursor.execute('''
+            CREATE VIRTUAL TABLE IF NOT EXISTS properties_fts USING fts5(
+                title, description, city,
+                content='properties', content_rowid='rowid', tokenize='trigram'
+            )
+        ''')
+    except sqlite3.OperationalError as e:
+        logger.warning(f"FTS5 trigram을 사용할 수 없어 LIKE 검색으로 대체합니다: {str(e)}")
+        return
+    
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS properties_fts_ai AFTER INSERT ON properties BEGIN
+            INSERT INTO properties_fts (rowid, title, description, city)
+            VALUES (new.rowid, new.title, new.description, new.city);
+        END
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS properties_fts_ad AFTER DELETE ON properties BEGIN
+            INSERT INTO properties_fts (properties_fts, rowid, title, description, city)
+            VALUES ('delete', old.rowid, old.title, old.description, old.city);
+        END
+    ''')
+    _create_properties_fts_update_trigger(cursor)
+    
+    # 기존 데이터로 인덱스 채우기
+    cursor.execute("INSERT INTO properties_fts (properties_fts) VALUES ('rebuild')")
+
+def _create_properties_fts_update_trigger(cursor):
+    """검색 대상 컬럼 값이 실제로 바뀐 경우에만 FTS 행을 다시 쓰는 갱신 트리거 생성
+    
+    UPSERT는 충돌 시 title/description/city를 항상 SET하므로 WHEN 없이는 재수집마다 FTS 행을 재색인
+    """
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS properties_fts_au AFTER UPDATE OF title, description, city ON properties
+        WHEN old.title IS NOT new.title OR old.description IS NOT new.description OR old.city IS NOT new.city BEGIN
+            INSERT INTO properties_fts (properties_fts, rowid, title, description, city)
+            VALUES ('delete', old.rowid, old.title, old.description, old.city);
+            INSERT INTO properties_fts (rowid, title, description, city)
+            VALUES (new.rowid, new.title, new.description, new.city);
+        END
+    ''')
+
+def _guard_properties_fts_update(cursor):
+    """기존 DB의 조건 없는 FTS 갱신 트리거를 WHEN 조건이 있는 트리거로 교체 (FTS가 없으면 건너뜀)"""
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'properties_fts'")
+    if cursor.fetchone() is None:
+        return
+    cursor.execute('DROP TRIGGER IF EXISTS properties_fts_au')
+    _create_properties_fts_update_trigger(cursor)
+
+# 편의시설 비트마스크: amenities 사전 id 1~64가 비트 0~63 (그 이후 편의시설은 JSON에서 직접 검사)
+AMENITY_MASK_BITS = 64
+
+def _amenity_json(column: str) -> str:
+    """json_each에 넘길 편의시설 JSON 식 (잘못된 JSON은 빈 배열로 취급)"""
+    return f"CASE WHEN json_valid({column}) THEN {column} ELSE '[]' END"
+
+def _amenity_mask_expression(column: str) -> str:
+    """편의시설 JSON 컬럼의 비트마스크 SQL 식"""
+    return f'''(
+        SELECT COALESCE(SUM(1 << (a.id - 1)), 0) FROM amenities a
+        WHERE a.id <= {AMENITY_MASK_BITS} AND a.name IN (SELECT value FROM json_each({_amenity_json(column)}))
+    )'''
+
+def _to_signed64(mask: int) -> int:
+    """64비트 마스크를 SQLite INTEGER(부호 있는 64비트) 값으로 변환"""
+    return mask - (1 << 64) if mask >= 1 << 63 else mask
+
+def _create_amenity_index(cursor):
+    """편의시설 사전 테이블/비트마스크 유지 트리거 생성 후 기존 숙소 채우기"""
+    for event, condition in (
+        ('INSERT', "new.amenities IS NOT NULL AND new.amenities != '[]'"),
+        ('UPDATE OF amenities', 'old.amenities IS NOT new.amenities'),
+    ):
+        name = 'properties_amenity_ai' if event == 'INSERT' else 'properties_amenity_au'
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS {name} AFTER {event} ON properties
+            WHEN {condition} BEGIN
+                -- UPSERT가 트리거 안의 OR IGNORE를 덮어쓰므로 없는 이름만 골라 삽입
+                INSERT INTO amenities (name)
+                SELECT DISTINCT value FROM json_each({_amenity_json('new.amenities')})
+                WHERE type = 'text' AND value NOT IN (SELECT name FROM amenities);
+                UPDATE properties SET amenity_mask = {_amenity_mask_expression('new.amenities')}
+                WHERE rowid = new.rowid;
+            END
+        ''')
+    
+    # 자주 쓰이는 편의시설부터 낮은 id(비트)를 배정
+    cursor.execute(f'''
+        INSERT OR IGNORE INTO amenities (name)
+        SELECT j.value FROM properties p, json_each({_amenity_json('p.amenities')}) j
+        WHERE j.type = 'text'
+        GROUP BY j.value
+        ORDER BY COUNT(*) DESC, j.value
+    ''')
+    cursor.execute(f'''
+        UPDATE properties SET amenity_mask = {_amenity_mask_expression('properties.amenities')}
+        WHERE amenities IS NOT NULL AND amenities != '[]'
+    ''')
+
+# 위치 검색: 지구 평균 반지름과 위도 1도당 거리(km)
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = 111.195
+
+# 위치 미입력 숙소는 (0, 0)으로 저장되므로 인덱스에서 제외
+GEO_POINT_CONDITION = "{p}latitude IS NOT NULL AND {p}longitude IS NOT NULL AND NOT ({p}latitude = 0 AND {p}longitude = 0)"
+
+def haversine_km(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    """두 좌표 사이 대원 거리(km)"""
+    lat1, lng1, lat2, lng2 = map(math.radians, (lat1, lng1, lat2, lng2))
+    a = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lng2 - lng1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+def bounding_box(latitude: float, longitude: float, radius_km: float) -> Tuple[float, float, float, float]:
+    """중심 좌표에서 radius_km 원을 감싸는 (min_lat, min_lng, max_lat, max_lng) (경도 ±180 경계는 자름)"""
+    delta_lat = radius_km / KM_PER_DEGREE
+    cos_lat = math.cos(math.radians(latitude))
+    delta_lng = 180.0 if cos_lat < 1e-6 else min(180.0, radius_km / (KM_PER_DEGREE * cos_lat))
+    return (max(-90.0, latitude - delta_lat), max(-180.0, longitude - delta_lng),
+            min(90.0, latitude + delta_lat), min(180.0, longitude + delta_lng))
+
+def _create_properties_geo(cursor):
+    """properties 위치 R*Tree 인덱스와 동기화 트리거 생성 (R*Tree가 없으면 위도/경도 B-tree 인덱스)"""
+    try:
+        cursor.execute('''
+            CREATE VIRTUAL TABLE IF NOT EXISTS properties_geo USING rtree(
+                id, min_lat, max_lat, min_lng, max_lng
+            )
+        ''')
+    except sqlite3.OperationalError as e:
+        logger.warning(f"R*Tree를 사용할 수 없어 위도/경도 인덱스로 대체합니다: {str(e)}")
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_properties_lat_lng ON properties (latitude, longitude)')
+        return
+    
+    new_point = GEO_POINT_CONDITION.format(p='new.')
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS properties_geo_ai AFTER INSERT ON properties
+        WHEN {new_point} BEGIN
+            INSERT INTO properties_geo (id, min_lat, max_lat, min_lng, max_lng)
+            VALUES (new.rowid, new.latitude, new.latitude, new.longitude, new.longitude);
+        END
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS properties_geo_ad AFTER DELETE ON properties BEGIN
+            DELETE FROM properties_geo WHERE id = old.rowid;
+        END
+    ''')
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS properties_geo_au AFTER UPDATE OF latitude, longitude ON properties
+        WHEN old.latitude IS NOT new.latitude OR old.longitude IS NOT new.longitude BEGIN
+            DELETE FROM properties_geo WHERE id = old.rowid;
+            INSERT INTO properties_geo (id, min_lat, max_lat, min_lng, max_lng)
+            SELECT new.rowid, new.latitude, new.latitude, new.longitude, new.longitude
+            WHERE {new_point};
+        END
+    ''')
+    
+    # 기존 데이터로 인덱스 채우기
+    cursor.execute(f'''
+        INSERT OR REPLACE INTO properties_geo (id, min_lat, max_lat, min_lng, max_lng)
+        SELECT rowid, latitude, latitude, longitude, longitude FROM properties
+        WHERE {GEO_POINT_CONDITION.format(p='')}
+    ''')
+
+# 지도 마커 클러스터: 줌 z에서 경도 360도를 2^z * CLUSTER_CELLS_PER_TILE 칸으로 나눈 정사각(위경도) 격자
+CLUSTER_MAX_ZOOM = 15
+CLUSTER_CELLS_PER_TILE = 8
+# 최대 줌보다 확대하면 개별 숙소 좌표를 반환 (응답 최대 개수)
+CLUSTER_POINT_LIMIT = 500
+
+def cluster_scale(zoom: int) -> float:
+    """줌 레벨의 경위도 1도당 격자 칸 수"""
+    return (1 << zoom) * CLUSTER_CELLS_PER_TILE / 360.0
+
+def _cluster_cells(p: str) -> str:
+    """property_cluster_zooms(z)와 조인해 좌표가 속한 줌별 격자 칸을 고르는 SELECT 식"""
+    return (f"z.zoom, CAST(({p}longitude + 180) * z.scale AS INTEGER), "
+            f"CAST(({p}latitude + 90) * z.scale AS INTEGER)")
+
+def _cluster_sql(p: str, sign: str) -> List[str]:
+    """숙소 하나를 줌별 클러스터에 더하거나(+) 빼는(-) 트리거 본문 문장
+    
+    위치가 있는 활성 숙소만 집계하고, 빼서 비게 된 칸은 삭제
+    """
+    condition = f"{GEO_POINT_CONDITION.format(p=p)} AND {p}is_active = 1"
+    if sign == '+':
+        return [f'''
+            INSERT INTO property_clusters (zoom, cell_x, cell_y, count, sum_lat, sum_lng, sum_price)
+            SELECT {_cluster_cells(p)}, 1, {p}latitude, {p}longitude, COALESCE({p}price_per_night, 0)
+            FROM property_cluster_zooms z WHERE {condition}
+            ON CONFLICT (zoom, cell_x, cell_y) DO UPDATE SET
+                count = count + 1,
+                sum_lat = sum_lat + excluded.sum_lat,
+                sum_lng = sum_lng + excluded.sum_lng,
+                sum_price = sum_price + excluded.sum_price
+        ''']
+    
+    cells = f"(zoom, cell_x, cell_y) IN (SELECT {_cluster_cells(p)} FROM property_cluster_zooms z WHERE {condition})"
+    return [f'''
+            UPDATE property_clusters SET
+                count = count - 1,
+                sum_lat = sum_lat - {p}latitude,
+                sum_lng = sum_lng - {p}longitude,
+                sum_price = sum_price - COALESCE({p}price_per_night, 0)
+            WHERE {cells}
+        ''', f'''
+            DELETE FROM property_clusters WHERE count <= 0 AND {cells}
+        ''']
+
+def _create_property_clusters(cursor):
+    """줌별 클러스터 테이블과 properties 동기화 트리거 생성"""
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS property_cluster_zooms (
+            zoom INTEGER PRIMARY KEY,
+            scale REAL NOT NULL
+        )
+    ''')
+    cursor.executemany(
+        'INSERT OR REPLACE INTO property_cluster_zooms (zoom, scale) VALUES (?, ?)',
+        [(zoom, cluster_scale(zoom)) for zoom in range(CLUSTER_MAX_ZOOM + 1)]
+    )
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS property_clusters (
+            zoom INTEGER NOT NULL,
+            cell_x INTEGER NOT NULL,
+            cell_y INTEGER NOT NULL,
+            count INTEGER NOT NULL,
+            sum_lat REAL NOT NULL,
+            sum_lng REAL NOT NULL,
+            sum_price REAL NOT NULL,
+            PRIMARY KEY (zoom, cell_x, cell_y)
+        ) WITHOUT ROWID
+    ''')
+    
+    triggers = [
+        ('properties_cluster_ai', 'INSERT', None, _cluster_sql('new.', '+')),
+        ('properties_cluster_ad', 'DELETE', None, _cluster_sql('old.', '-')),
+        ('properties_cluster_au', 'UPDATE OF latitude, longitude, is_active, price_per_night',
+         'old.latitude IS NOT new.latitude OR old.longitude IS NOT new.longitude '
+         'OR old.is_active IS NOT new.is_active OR old.price_per_night IS NOT new.price_per_night',
+         _cluster_sql('old.', '-') + _cluster_sql('new.', '+')),
+    ]
+    for name, event, when, statements in triggers:
+        body = ';'.join(statements)
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS {name} AFTER {event} ON properties
+            {f'WHEN {when}' if when else ''} BEGIN {body}; END
+        ''')
+    
+    _backfill_property_clusters(cursor)
+
+def _backfill_property_clusters(cursor):
+    """줌별 클러스터 테이블을 properties로 다시 채우기"""
+    cursor.execute('DELETE FROM property_clusters')
+    cursor.execute(f'''
+        INSERT INTO property_clusters (zoom, cell_x, cell_y, count, sum_lat, sum_lng, sum_price)
+        SELECT {_cluster_cells('p.')}, COUNT(*), SUM(p.latitude), SUM(p.longitude),
+               SUM(COALESCE(p.price_per_night, 0))
+        FROM properties p, property_cluster_zooms z
+        WHERE {GEO_POINT_CONDITION.format(p='p.')} AND p.is_active = 1
+        GROUP BY 1, 2, 3
+    ''')
+
+# aggregate_postings 그룹 기준 -> (결과 키, SQL 식), {day}는 타임스탬프 형식에 맞는 posted_at 날짜 식
+POSTING_GROUP_COLUMNS = {
+    'day': ('day', "{day}"),
+    # ISO 주차: 해당 주의 목요일이 속한 연도와 연중 주차
+    'week': ('week', "strftime('%Y', date({day}, '-3 days', 'weekday 4')) || '-W' || "
+                     "printf('%02d', (CAST(strftime('%j', date({day}, '-3 days', 'weekday 4')) AS INTEGER) - 1) / 7 + 1)"),
+    'platform': ('platform', 'ph.platform'),
+    'property': ('property_id', 'ph.property_id'),
+    'status': ('status', 'ph.status'),
+}
+
+# 롤업 테이블 기준 그룹 식 (status 그룹/필터는 원본 테이블에서만 가능)
+POSTING_ROLLUP_GROUP_COLUMNS = {
+    'day': ('day', 'r.date'),
+    'week': ('week', "strftime('%Y', date(r.date, '-3 days', 'weekday 4')) || '-W' || "
+                     "printf('%02d', (CAST(strftime('%j', date(r.date, '-3 days', 'weekday 4')) AS INTEGER) - 1) / 7 + 1)"),
+    'platform': ('platform', 'r.platform'),
+    'property': ('property_id', 'r.property_id'),
+}
+
+# platform/property_id가 없는 이력은 백필과 같이 빈 문자열로 집계 (롤업 키 컬럼은 NOT NULL)
+POSTING_ROLLUP_UPSERT_SQL = '''
+    INSERT INTO posting_daily_rollup (date, platform, property_id, posts, success, failed)
+    VALUES (?, COALESCE(?, ''), COALESCE(?, ''), 1, ?, ?)
+    ON CONFLICT(date, platform, property_id) DO UPDATE SET
+        posts = posts + 1,
+        success = success + excluded.success,
+        failed = failed + excluded.failed
+'''
+
+CONVERSION_ROLLUP_UPSERT_SQL = '''
+    INSERT INTO conversion_daily_rollup (date, platform, property_id, clicks, conversions)
+    VALUES (?, COALESCE(?, ''), COALESCE(?, ''), ?, ?)
+    ON CONFLICT(date, platform, property_id) DO UPDATE SET
+        clicks = clicks + excluded.clicks,
+        conversions = conversions + excluded.conversions
+'''
+
+# 쿼리 플랜 검사 시 전체 스캔을 허용하는 최대 테이블 행 수
+FULL_SCAN_ROW_THRESHOLD = 1000
+
+# 게시 이력 내보내기 컬럼과 커서에서 한 번에 읽을 행 수
+POSTING_EXPORT_COLUMNS = (
+    'ph.id', 'ph.property_id', 'p.title', 'p.city', 'ph.platform', 'ph.status',
+    'ph.post_id', 'ph.post_url', 'ph.posted_at', 'ph.error_message',
+)
+EXPORT_BATCH_SIZE = 1000
+
+# 테이블 단위(Parquet/Arrow) 내보내기 대상 -> 증분 내보내기 워터마크(정렬 키) 컬럼
+EXPORT_TABLE_KEYS = {
+    'posting_history': ('id',),
+    'properties': ('scraped_at', 'id'),
+}
+
+# 데이터 정리 기본값: 트랜잭션당 행 수, 청크 사이 대기(초), incremental_vacuum 1회당 페이지 수
+CLEANUP_CHUNK_SIZE = 1000
+CLEANUP_CHUNK_PAUSE = 0.01
+VACUUM_PAGES_PER_PASS = 500
+
+# properties의 JSON 컬럼과 값이 비어 있을 때의 기본값
+PROPERTY_JSON_FIELDS = {
+    'amenities': '[]',
+    'images': '[]',
+    'availability': '{}',
+}
+
+_MISSING = object()
+
+class PropertyRecord(MutableMapping):
+    """properties 행 레코드 (__slots__, JSON 컬럼은 처음 접근할 때 디코딩)
+    
+    dict처럼 p['city'], p.get('amenities'), dict(p)로 사용하며,
+    컬럼 이름 -> 위치 매핑은 같은 조회 결과의 레코드끼리 공유
+    """
+    
+    __slots__ = ('_index', '_values', '_pending', '_extra')
+    
+    def __init__(self, index: Dict[str, int], values: tuple, pending: int = 0):
+        """초기화 (pending: 아직 디코딩하지 않은 JSON 컬럼 위치의 비트마스크)"""
+        self._index = index
+        self._values = values
+        self._pending = pending
+        self._extra = None
+    
+    @staticmethod
+    def build_index(columns: List[str]) -> Tuple[Dict[str, int], int]:
+        """컬럼 목록에서 (이름 -> 위치 매핑, JSON 컬럼 비트마스크) 생성"""
+        index = {name: position for position, name in enumerate(columns)}
+        pending = 0
+        for name in PROPERTY_JSON_FIELDS:
+            if name in index:
+                pending |= 1 << index[name]
+        return index, pending
+    
+    def _writable(self) -> list:
+        """값 목록을 수정 가능한 리스트로 전환 (처음 수정할 때만 복사)"""
+        values = self._values
+        if type(values) is not list:
+            values = self._values = list(values)
+        return values
+    
+    def __getitem__(self, key):
+        position = self._index.get(key)
+        if position is None:
+            if self._extra is not None and key in self._extra:
+                return self._extra[key]
+            raise KeyError(key)
+        
+        value = self._values[position]
+        if value is _MISSING:
+            raise KeyError(key)
+        if self._pending >> position & 1:
+            value = json.loads(value or PROPERTY_JSON_FIELDS[key])
+            self._writable()[position] = value
+            self._pending &= ~(1 << position)
+        return value
+    
+    def get(self, key, default=None):
+        # 디코딩이 필요 없는 일반 컬럼은 바로 반환
+        position = self._index.get(key)
+        if position is not None and not self._pending >> position & 1:
+            value = self._values[position]
+            return default if value is _MISSING else value
+        try:
+            return self[key]
+        except KeyError:
+            return default
+    
+    def __setitem__(self, key, value):
+        position = self._index.get(key)
+        if position is None:
+            if self._extra is None:
+                self._extra = {}
+            self._extra[key] = value
+            return
+        self._writable()[position] = value
+        self._pending &= ~(1 << position)
+    
+    def __delitem__(self, key):
+        position = self._index.get(key)
+        if position is None or self._values[position] is _MISSING:
+            if self._extra is None or key not in self._extra:
+                raise KeyError(key)
+            del self._extra[key]
+            return
+        self._writable()[position] = _MISSING
+        self._pending &= ~(1 << position)
+    
+    def __contains__(self, key):
+        position = self._index.get(key)
+        if position is not None:
+            return self._values[position] is not _MISSING
+        return self._extra is not None and key in self._extra
+    
+    def __iter__(self):
+        values = self._values
+        for name, position in self._index.items():
+            if values[position] is not _MISSING:
+                yield name
+        if self._extra is not None:
+            yield from list(self._extra)
+    
+    def __len__(self):
+        count = len(self._index) - sum(1 for value in self._values if value is _MISSING)
+        return count + (len(self._extra) if self._extra is not None else 0)
+    
+    def __repr__(self):
+        return f"PropertyRecord({self.to_dict()!r})"
+    
+    def __reduce__(self):
+        return (dict, (self.to_dict(),))
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """모든 JSON 컬럼을 디코딩한 일반 dict (JSON 직렬화/응답 반환용)"""
+        return {name: self[name] for name in self}
+    
+    copy = to_dict
+
+# 쿼리 프로파일러 기본값: 지연 히스토그램 구간(ms), 느린 쿼리 임계값(ms), 느린 쿼리 로그 보관 개수
+LATENCY_BUCKETS_MS = (0.1, 0.5, 1, 5, 10, 50, 100, 500, 1000, 5000)
+SLOW_QUERY_MS = 100
+SLOW_QUERY_LOG_SIZE = 100
+
+# 프로파일링 시 메서드 단위로 감싸지 않는 공개 메서드
+PROFILE_EXCLUDED_METHODS = frozenset({
+    'close', 'capture_statements', 'enable_profiling', 'disable_profiling',
+    'get_query_stats', 'reset_query_stats',
+})
+
+class QueryProfiler:
+    """SQL 문 실행 시간/행 수와 DatabaseManager 메서드별 지연 히스토그램 집계
+    
+    문장은 실행한 스레드에서 가장 안쪽에 호출 중인 메서드에 귀속되며,
+    slow_query_ms 이상 걸린 문장은 EXPLAIN QUERY PLAN과 함께 로그에 남김
+    """
+    
+    def __init__(self, slow_query_ms: float = SLOW_QUERY_MS, log_size: int = SLOW_QUERY_LOG_SIZE):
+        """초기화"""
+        self.slow_query_ms = slow_query_ms
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._methods = {}
+        self._statements = {}
+        self._slow_queries = deque(maxlen=log_size)
+        self.started_at = datetime.now().isoformat()
+    
+    @staticmethod
+    def _new_entry() -> Dict[str, Any]:
+        """집계 항목 생성"""
+        return {'calls': 0, 'errors': 0, 'total_ms': 0.0, 'max_ms': 0.0, 'rows': 0,
+                'statements': 0, 'buckets': [0] * (len(LATENCY_BUCKETS_MS) + 1)}
+    
+    @staticmethod
+    def _observe(entry: Dict[str, Any], elapsed_ms: float):
+        """지연 시간을 집계 항목과 히스토그램에 반영 (lock 보유 상태에서 호출)"""
+        entry['calls'] += 1
+        entry['total_ms'] += elapsed_ms
+        entry['max_ms'] = max(entry['max_ms'], elapsed_ms)
+        entry['buckets'][bisect.bisect_left(LATENCY_BUCKETS_MS, elapsed_ms)] += 1
+    
+    def _stack(self) -> List[str]:
+        """현재 스레드의 호출 중인 메서드 스택"""
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+    
+    def current_method(self) -> str:
+        """현재 스레드에서 가장 안쪽에 호출 중인 메서드 이름"""
+        stack = self._stack()
+        return stack[-1] if stack else '(direct)'
+    
+    def wrap(self, name: str, func: Callable, generator: bool = False) -> Callable:
+        """메서드 호출 시간을 기록하는 래퍼 반환 (제너레이터는 소비하는 동안의 시간만 합산)"""
+        if generator:
+            @functools.wraps(func)
+            def generator_wrapper(*args, **kwargs):
+                return self._iterate(name, func(*args, **kwargs))
+            return generator_wrapper
+        
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            stack = self._stack()
+            stack.append(name)
+            started = time.perf_counter()
+            error = False
+            try:
+                return func(*args, **kwargs)
+            except Exception:
+                error = True
+                raise
+            finally:
+                stack.pop()
+                self._record_call(name, (time.perf_counter() - started) * 1000, error)
+        return wrapper
+    
+    def _iterate(self, name: str, iterator: Iterator) -> Iterator:
+        """제너레이터 메서드 래핑 (next() 구간만 메서드 실행 시간으로 계산)"""
+        stack = self._stack()
+        elapsed = 0.0
+        error = False
+        try:
+            while True:
+                stack.append(name)
+                started = time.perf_counter()
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    break
+                finally:
+                    elapsed += time.perf_counter() - started
+                    stack.pop()
+                yield item
+        except Exception:
+            error = True
+            raise
+        finally:
+            self._record_call(name, elapsed * 1000, error)
+    
+    def _record_call(self, name: str, elapsed_ms: float, error: bool):
+        """메서드 호출 1회 기록"""
+        with self._lock:
+            entry = self._methods.get(name)
+            if entry is None:
+                entry = self._methods[name] = self._new_entry()
+            self._observe(entry, elapsed_ms)
+            if error:
+                entry['errors'] += 1
+    
+    def record_statement(self, conn: sqlite3.Connection, method: str, sql: str, parameters: Any,
+                         elapsed_ms: float, rows: int):
+        """SQL 문 1회 실행 기록 (임계값 이상이면 쿼리 플랜과 함께 느린 쿼리 로그에 추가)"""
+        statement = ' '.join(sql.split())
+        with self._lock:
+            entry = self._statements.get(statement)
+            if entry is None:
+                entry = self._statements[statement] = self._new_entry()
+            self._observe(entry, elapsed_ms)
+            entry['rows'] += rows
+            
+            method_entry = self._methods.get(method)
+            if method_entry is None:
+                method_entry = self._methods[method] = self._new_entry()
+            method_entry['statements'] += 1
+            method_entry['rows'] += rows
+        
+        if elapsed_ms < self.slow_query_ms:
+            return
+        
+        plan = self._explain(conn, sql, parameters)
+        self._slow_queries.append({
+            'method': method,
+            'sql': statement,
+            'elapsed_ms': round(elapsed_ms, 3),
+            'rows': rows,
+            'plan': plan,
+            'logged_at': datetime.now().isoformat()
+        })
+        logger.warning(f"느린 쿼리 {elapsed_ms:.1f}ms ({method}, {rows}행): {statement} | 플랜: {' / '.join(plan) or '-'}")
+    
+    @staticmethod
+    def _explain(conn: sqlite3.Connection, sql: str, parameters: Any) -> List[str]:
+        """EXPLAIN QUERY PLAN 결과 (프로파일링되지 않는 기본 커서 사용, 실패 시 빈 목록)"""
+        if parameters is None:
+            return []
+        try:
+            rows = sqlite3.Cursor(conn).execute(f'EXPLAIN QUERY PLAN {sql}', parameters).fetchall()
+        except sqlite3.Error:
+            return []
+        return [row[-1] for row in rows]
+    
+    @staticmethod
+    def _summarize(name: str, entry: Dict[str, Any]) -> Dict[str, Any]:
+        """집계 항목을 응답 형식으로 변환 (백분위수는 히스토그램 구간 상한으로 추정)"""
+        calls = entry['calls']
+        
+        def percentile(fraction: float) -> float:
+            threshold = calls * fraction
+            seen = 0
+            for bound, count in zip(LATENCY_BUCKETS_MS, entry['buckets']):
+                seen += count
+                if seen >= threshold:
+                    return min(bound, round(entry['max_ms'], 3))
+            return round(entry['max_ms'], 3)
+        
+        labels = [f'<={bound}' for bound in LATENCY_BUCKETS_MS] + [f'>{LATENCY_BUCKETS_MS[-1]}']
+        return {
+            'name': name,
+            'calls': calls,
+            'errors': entry['errors'],
+            'statements': entry['statements'],
+            'rows': entry['rows'],
+            'total_ms': round(entry['total_ms'], 3),
+            'avg_ms': round(entry['total_ms'] / calls, 3) if calls else 0,
+            'max_ms': round(entry['max_ms'], 3),
+            'p50_ms': percentile(0.5) if calls else 0,
+            'p95_ms': percentile(0.95) if calls else 0,
+            'p99_ms': percentile(0.99) if calls else 0,
+            'histogram_ms': dict(zip(labels, entry['buckets']))
+        }
+    
+    def get_stats(self, top_statements: int = 20) -> Dict[str, Any]:
+        """메서드별/문장별 집계와 느린 쿼리 로그 (총 소요 시간 내림차순)"""
+        with self._lock:
+            methods = [self._summarize(name, dict(entry, buckets=list(entry['buckets'])))
+                       for name, entry in self._methods.items()]
+            statements = [self._summarize(sql, dict(entry, buckets=list(entry['buckets'])))
+                          for sql, entry in self._statements.items()]
+            slow_queries = list(self._slow_queries)
+        
+        methods.sort(key=lambda item: item['total_ms'], reverse=True)
+        statements.sort(key=lambda item: item['total_ms'], reverse=True)
+        return {
+            'enabled': True,
+            'started_at': self.started_at,
+            'slow_query_ms': self.slow_query_ms,
+            'methods': methods,
+            'statements': statements[:top_statements],
+            'slow_queries': slow_queries[::-1]
+        }
+    
+    def reset(self):
+        """집계 초기화"""
+        with self._lock:
+            self._methods.clear()
+            self._statements.clear()
+            self._slow_queries.clear()
+            self.started_at = datetime.now().isoformat()
+
+class ProfiledCursor(sqlite3.Cursor):
+    """실행 시간과 행 수를 커넥션의 QueryProfiler에 기록하는 커서
+    
+    SELECT/RETURNING 문은 커서를 끝까지 읽거나 닫을 때(또는 다음 실행, 해제 시)
+    fetch 시간까지 합산해 기록
+    """
+    
+    _pending = None
+    
+    def execute(self, sql, parameters=()):
+        """단일 문 실행"""
+        self._finish()
+        started = time.perf_counter()
+        super().execute(sql, parameters)
+        self._begin(sql, parameters, time.perf_counter() - started)
+        return self
+    
+    def executemany(self, sql, seq_of_parameters):
+        """반복 실행 (파라미터 집합이 여러 개이므로 쿼리 플랜은 생략)"""
+        self._finish()
+        started = time.perf_counter()
+        super().executemany(sql, seq_of_parameters)
+        self._begin(sql, None, time.perf_counter() - started)
+        return self
+    
+    def _begin(self, sql: str, parameters: Any, elapsed: float):
+        """실행 직후 기록 (결과 행이 없으면 바로, 있으면 fetch가 끝날 때)"""
+        profiler = self.connection.profiler
+        if profiler is None:
+            return
+        
+        if self.description is None:
+            profiler.record_statement(self.connection, profiler.current_method(), sql, parameters,
+                                      elapsed * 1000, max(self.rowcount, 0))
+        else:
+            self._pending = [profiler, profiler.current_method(), sql, parameters, elapsed, 0]
+    
+    def _finish(self):
+        """대기 중인 SELECT 기록 확정"""
+        pending = self._pending
+        if pending is None:
+            return
+        self._pending = None
+        profiler, method, sql, parameters, elapsed, rows = pending
+        profiler.record_statement(self.connection, method, sql, parameters, elapsed * 1000, rows)
+    
+    def _fetched(self, elapsed: float, rows: int, done: bool):
+        """fetch 시간/행 수 누적"""
+        pending = self._pending
+        if pending is not None:
+            pending[4] += elapsed
+            pending[5] += rows
+            if done:
+                self._finish()
+    
+    def fetchone(self):
+        """한 행 읽기"""
+        started = time.perf_counter()
+        row = super().fetchone()
+        self._fetched(time.perf_counter() - started, row is not None, row is None)
+        return row
+    
+    def fetchmany(self, size=None):
+        """여러 행 읽기"""
+        size = self.arraysize if size is None else size
+        started = time.perf_counter()
+        rows = super().fetchmany(size)
+        self._fetched(time.perf_counter() - started, len(rows), len(rows) < size)
+        return rows
+    
+    def fetchall(self):
+        """남은 행 모두 읽기"""
+        started = time.perf_counter()
+        rows = super().fetchall()
+        self._fetched(time.perf_counter() - started, len(rows), True)
+        return rows
+    
+    def __next__(self):
+        """반복자 프로토콜"""
+        started = time.perf_counter()
+        try:
+            row = super().__next__()
+        except StopIteration:
+            self._fetched(time.perf_counter() - started, 0, True)
+            raise
+        self._fetched(time.perf_counter() - started, 1, False)
+        return row
+    
+    def close(self):
+        """커서 닫기"""
+        self._finish()
+        super().close()
+    
+    def __del__(self):
+        """해제 시 끝까지 읽지 않은 SELECT도 기록"""
+        try:
+            self._finish()
+        except sqlite3.Error:
+            pass
+
+class ProfiledConnection(sqlite3.Connection):
+    """profiler가 설정된 동안에만 ProfiledCursor로 실행하는 커넥션 (꺼져 있으면 기본 커서)"""
+    
+    profiler = None
+    
+    def cursor(self, factory=None):
+        """커서 생성"""
+        if factory is None:
+            factory = sqlite3.Cursor if self.profiler is None else ProfiledCursor
+        return super().cursor(factory)
+    
+    def execute(self, sql, parameters=()):
+        """단일 문 실행"""
+        if self.profiler is None:
+            return super().execute(sql, parameters)
+        return self.cursor(ProfiledCursor).execute(sql, parameters)
+    
+    def executemany(self, sql, seq_of_parameters):
+        """반복 실행"""
+        if self.profiler is None:
+            return super().executemany(sql, seq_of_parameters)
+        return self.cursor(ProfiledCursor).executemany(sql, seq_of_parameters)
+
+class ConnectionPool:
+    """스레드 안전 SQLite 커넥션 풀 (단일 쓰기 커넥션 + 읽기 커넥션 풀)"""
+    
+    def __init__(self, db_path: str, max_readers: int = 4, pragmas: Dict[str, Any] = None,
+                 max_overflow: int = READER_OVERFLOW, acquire_timeout: float = READER_ACQUIRE_TIMEOUT):
+        """초기화"""
+        self.db_path = db_path
+        self.max_readers = max_readers
+        self.max_overflow = max_overflow
+        self.acquire_timeout = acquire_timeout
+        self.pragmas = dict(DEFAULT_PRAGMAS)
+        if pragmas:
+            self.pragmas.update(pragmas)
+        
+        # 인메모리 DB는 커넥션마다 별도 DB가 되므로 쓰기 커넥션을 공유
+        self._shared = db_path == ':memory:' or db_path.startswith('file::memory:')
+        
+        self._write_lock = threading.RLock()
+        self._writer = None
+        self._writer_owner = None
+        self._write_depth = 0
+        
+        self._idle_readers = []
+        self._reader_count = 0
+        self._reader_lock = threading.Lock()
+        self._reader_available = threading.Condition(self._reader_lock)
+        self._all_readers = []
+        self._draining = False
+        
+        self._trace_callback = None
+        self._profiler = None
+    
+    @property
+    def in_memory(self) -> bool:
+        """인메모리 DB 여부"""
+        return self._shared
+    
+    @property
+    def write_depth(self) -> int:
+        """현재 스레드의 writer() 중첩 깊이 (다른 스레드가 쓰기 중이어도 0)"""
+        return self._write_depth if self._writer_owner == threading.get_ident() else 0
+    
+    def _connect(self, read_only: bool = False) -> sqlite3.Connection:
+        """PRAGMA가 적용된 새 커넥션 생성"""
+        conn = sqlite3.connect(
+            self.db_path,
+            timeout=self.pragmas.get('busy_timeout', 5000) / 1000,
+            check_same_thread=False,
+            factory=ProfiledConnection
+        )
+        for name, value in self.pragmas.items():
+            if name == 'journal_mode' and (read_only or self._shared):
+                continue
+            if name == 'auto_vacuum' and read_only:
+                continue
+            conn.execute(f"PRAGMA {name} = {value}")
+        if read_only:
+            conn.execute("PRAGMA query_only = 1")
+        conn.set_trace_callback(self._trace_callback)
+        conn.profiler = self._profiler
+        return conn
+    
+    def set_trace_callback(self, callback):
+        """모든 커넥션(기존 및 이후 생성)에 SQL 추적 콜백 설정"""
+        self._trace_callback = callback
+        with self._write_lock:
+            if self._writer is not None:
+                self._writer.set_trace_callback(callback)
+        with self._reader_lock:
+            for conn in self._all_readers:
+                conn.set_trace_callback(callback)
+    
+    def set_profiler(self, profiler: Optional['QueryProfiler']):
+        """모든 커넥션(기존 및 이후 생성)에 쿼리 프로파일러 설정 (None이면 해제)"""
+        self._profiler = profiler
+        with self._write_lock:
+            if self._writer is not None:
+                self._writer.profiler = profiler
+        with self._reader_lock:
+            for conn in self._all_readers:
+                conn.profiler = profiler
+    
+    def _get_writer(self) -> sqlite3.Connection:
+        """쓰기 커넥션 반환 (write lock 보유 상태에서 호출)"""
+        if self._writer is None:
+            self._writer = self._connect()
+        return self._writer
+    
+    @contextmanager
+    def writer(self):
+        """쓰기 커넥션 대여 (종료 시 커밋, 오류 시 롤백)"""
+        with self._write_lock:
+            conn = self._get_writer()
+            self._writer_owner = threading.get_ident()
+            self._write_depth += 1
+            try:
+                yield conn
+                if self._write_depth == 1:
+                    conn.commit()
+            except Exception:
+                if self._write_depth == 1:
+                    conn.rollback()
+                raise
+            finally:
+                self._write_depth -= 1
+                if self._write_depth == 0:
+                    self._writer_owner = None
+    
+    @contextmanager
+    def reader(self):
+        """읽기 커넥션 대여"""
+        # 인메모리 DB이거나 현재 스레드가 쓰기 중이면 쓰기 커넥션을 그대로 사용
+        if self._shared or self._writer_owner == threading.get_ident():
+            with self.writer() as conn:
+                yield conn
+            return
+        
+        conn = self._acquire_reader()
+        try:
+            yield conn
+        finally:
+            self._release_reader(conn)
+    
+    @contextmanager
+    def exclusive(self, timeout: float = None):
+        """쓰기 락을 잡고 모든 커넥션을 닫은 상태로 대여 (DB 파일 교체용, 이후 커넥션은 다시 생성)
+        
+        새 읽기 대여를 멈추고 다른 스레드가 대여 중인 읽기 커넥션이 모두 반납될 때까지
+        timeout초(기본 acquire_timeout) 기다린 뒤 닫으며, 시간 안에 반납되지 않으면 TimeoutError
+        """
+        timeout = self.acquire_timeout if timeout is None else timeout
+        with self._write_lock:
+            with self._reader_available:
+                self._draining = True
+                drained = self._reader_available.wait_for(
+                    lambda: self._reader_count == len(self._idle_readers), timeout
+                )
+                if not drained:
+                    self._draining = False
+                    self._reader_available.notify_all()
+                    raise TimeoutError(
+                        f"대여 중인 읽기 커넥션 {self._reader_count - len(self._idle_readers)}개가 "
+                        f"{timeout}초 안에 반납되지 않았습니다"
+                    )
+            
+            try:
+                self.close()
+                yield
+            finally:
+                with self._reader_available:
+                    self._draining = False
+                    self._reader_available.notify_all()
+    
+    def _acquire_reader(self) -> sqlite3.Connection:
+        """유휴 읽기 커넥션을 가져오거나 새로 생성
+        
+        max_readers개가 모두 대여 중이면 max_overflow개까지 임시 커넥션을 열고(반납 시 닫음),
+        그마저 모두 대여 중이면 acquire_timeout초까지 기다린 뒤 TimeoutError
+        (이벤트 루프 스레드에서 무한 대기하며 교착되지 않도록), exclusive() 중에는 끝날 때까지 대기
+        """
+        deadline = time.monotonic() + self.acquire_timeout
+        with self._reader_available:
+            while True:
+                if not self._draining:
+                    if self._idle_readers:
+                        return self._idle_readers.pop()
+                    
+                    if self._reader_count < self.max_readers + self.max_overflow:
+                        conn = self._connect(read_only=True)
+                        self._reader_count += 1
+                        self._all_readers.append(conn)
+                        return conn
+                
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise TimeoutError(
+                        f"읽기 커넥션 대기 시간 초과: {self.acquire_timeout}초 동안 "
+                        f"{self._reader_count}개 커넥션이 모두 대여 중이거나 DB 파일 교체 중"
+                    )
+                self._reader_available.wait(remaining)
+    
+    def _release_reader(self, conn: sqlite3.Connection):
+        """읽기 커넥션 반납 (max_readers를 넘는 임시 커넥션은 닫음)"""
+        with self._reader_available:
+            # 대여 중 풀이 닫혔으면 닫힌 커넥션을 되돌려 놓지 않음
+            if conn not in self._all_readers:
+                return
+            
+            if self._reader_count > self.max_readers:
+                self._all_readers.remove(conn)
+                self._reader_count -= 1
+                conn.close()
+            else:
+                self._idle_readers.append(conn)
+            # exclusive()의 반납 대기와 읽기 대여 대기를 모두 깨움
+            self._reader_available.notify_all()
+    
+    def close(self):
+        """모든 커넥션 종료"""
+        with self._write_lock:
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+        with self._reader_lock:
+            for conn in self._all_readers:
+                conn.close()
+            self._all_readers = []
+            self._idle_readers = []
+            self._reader_count = 0
+            self._reader_available.notify_all()
+
+class ConversionCounterBuffer:
+    """전환 카운터 쓰기 병합 버퍼
+    
+    (property_id, platform)별 증가분을 메모리에서 합산하고, 대기 증가분이
+    max_pending에 도달하거나 flush_interval초가 지나면 한 트랜잭션으로 반영.
+    비정상 종료 시 최대 한 번의 flush 주기 분량만 유실됨
+    """
+    
+    def __init__(self, db_manager: 'DatabaseManager', max_pending: int = 1000, flush_interval: float = 5.0):
+        """초기화"""
+        self.db_manager = db_manager
+        self.max_pending = max_pending
+        self.flush_interval = flush_interval
+        
+        self._lock = threading.Lock()
+        self._pending: Dict[Tuple[str, str], List[int]] = {}
+        self._pending_increments = 0
+        
+        self._flush_event = threading.Event()
+        self._stop_event = threading.Event()
+        self._thread = None
+        
+        self.flush_count = 0
+        self.flushed_increments = 0
+        self.last_flush_at = None
+    
+    @property
+    def pending_increments(self) -> int:
+        """아직 반영되지 않은 증가분 합계"""
+        return self._pending_increments
+    
+    def add(self, property_id: str, platform: str, click_count: int = 1, conversion_count: int = 0):
+        """증가분 버퍼링"""
+        with self._lock:
+            counts = self._pending.setdefault((property_id, platform), [0, 0])
+            counts[0] += click_count
+            counts[1] += conversion_count
+            self._pending_increments += click_count + conversion_count
+            
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='conversion-buffer', daemon=True)
+                self._thread.start()
+            
+            if self._pending_increments >= self.max_pending:
+                self._flush_event.set()
+    
+    def flush(self) -> int:
+        """대기 중인 증가분을 데이터베이스에 반영 (반영된 증가분 반환)"""
+        with self._lock:
+            pending = self._pending
+            increments = self._pending_increments
+            self._pending = {}
+            self._pending_increments = 0
+        
+        if not pending:
+            return 0
+        
+        if not self.db_manager._apply_conversion_increments(pending):
+            # 실패 시 다음 flush에서 다시 시도하도록 버퍼에 되돌림
+            with self._lock:
+                for key, (clicks, conversions) in pending.items():
+                    counts = self._pending.setdefault(key, [0, 0])
+                    counts[0] += clicks
+                    counts[1] += conversions
+                self._pending_increments += increments
+            return 0
+        
+        self.flush_count += 1
+        self.flushed_increments += increments
+        self.last_flush_at = datetime.now().isoformat()
+        return increments
+    
+    def _run(self):
+        """주기적 flush 루프"""
+        while not self._stop_event.is_set():
+            self._flush_event.wait(self.flush_interval)
+            self._flush_event.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"전환 카운터 flush 중 오류: {str(e)}")
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """버퍼 지표 조회"""
+        return {
+            'pending_increments': self._pending_increments,
+            'pending_keys': len(self._pending),
+            'flush_count': self.flush_count,
+            'flushed_increments': self.flushed_increments,
+            'last_flush_at': self.last_flush_at
+        }
+    
+    def close(self):
+        """flush 스레드 종료 후 남은 증가분 반영"""
+        self._stop_event.set()
+        self._flush_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+        self.flush()
+
 class DatabaseManager:
     """데이터베이스 관리 클래스"""
     
-    def __init__(self, db_path: str = "airbnb_marketing.db"):
-        """초기화"""
+    def __init__(self, db_path: str = "airbnb_marketing.db", max_readers: int = 4, epoch_timestamps: bool = None):
+        """초기화
+        
+        epoch_timestamps=True(또는 DB_TIMESTAMP_FORMAT=epoch_ms)이면 기존 ISO 타임스탬프를
+        UTC epoch 밀리초로 한 번 전환하며, 전환된 DB는 이후 항상 epoch 형식으로 열림
+        DB_PROFILING=1이면 쿼리 프로파일링을 켠 상태로 시작 (DB_SLOW_QUERY_MS로 임계값 지정)
+        """
+        if epoch_timestamps is None:
+            epoch_timestamps = os.getenv('DB_TIMESTAMP_FORMAT', TIMESTAMP_FORMAT_ISO) == TIMESTAMP_FORMAT_EPOCH_MS
+        
         self.db_path = db_path
+        self.pool = ConnectionPool(db_path, max_readers=max_readers)
+        self.epoch_timestamps = epoch_timestamps
+        self.fts_enabled = False
+        self.geo_index_enabled = False
+        self.profiler = None
+        self.conversion_buffer = ConversionCounterBuffer(self)
         self.init_database()
+        
+        if os.getenv('DB_PROFILING', '').lower() in ('1', 'true', 'yes'):
+            self.enable_profiling()
+    
+    def close(self):
+        """버퍼 flush 후 커넥션 풀 종료"""
+        self.conversion_buffer.close()
+        self.pool.close()
     
     def init_database(self):
         """데이터베이스 초기화"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self.pool.writer() as conn:
                 cursor = conn.cursor()
                 
                 # 숙소 테이블
@@ -114,93 +1493,249 @@ class DatabaseManager:
                     )
                 ''')
                 
-                conn.commit()
+                # 스키마 마이그레이션 적용
+                self._run_migrations(cursor)
+                
+                # 타임스탬프 형식 (한 번 epoch로 전환된 DB는 되돌리지 않음)
+                cursor.execute("SELECT value FROM db_meta WHERE key = 'timestamp_format'")
+                row = cursor.fetchone()
+                if row and row[0] == TIMESTAMP_FORMAT_EPOCH_MS:
+                    self.epoch_timestamps = True
+                elif self.epoch_timestamps:
+                    self._convert_timestamps_to_epoch(cursor)
+                
+                cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'properties_fts'")
+                self.fts_enabled = cursor.fetchone() is not None
+                cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'properties_geo'")
+                self.geo_index_enabled = cursor.fetchone() is not None
+                
                 logger.info("데이터베이스 초기화 완료")
                 
         except Exception as e:
             logger.error(f"데이터베이스 초기화 중 오류: {str(e)}")
+            raise
+    
+    def _run_migrations(self, cursor):
+        """미적용 스키마 마이그레이션을 버전 순서대로 적용
+        
+        버전마다 단계와 user_version 갱신을 한 세이브포인트로 묶어 원자적으로 적용하며,
+        단계가 실패하면 그 버전 전체를 되돌리고 예외를 다시 발생 (반쯤 적용된 스키마로 계속 실행하지 않도록)
+        """
+        cursor.execute('PRAGMA user_version')
+        current_version = cursor.fetchone()[0]
+        
+        for version, description, steps in MIGRATIONS:
+            if version <= current_version:
+                continue
+            
+            savepoint = f'migration_v{version}'
+            cursor.execute(f'SAVEPOINT {savepoint}')
+            try:
+                for step in steps:
+                    if callable(step):
+                        step(cursor)
+                    else:
+                        cursor.execute(step)
+                cursor.execute(f'PRAGMA user_version = {version}')
+            except Exception:
+                # 오류 종류에 따라 SQLite가 이미 트랜잭션을 롤백했을 수 있음
+                if cursor.connection.in_transaction:
+                    cursor.execute(f'ROLLBACK TO {savepoint}')
+                    cursor.execute(f'RELEASE {savepoint}')
+                logger.error(f"스키마 마이그레이션 실패, 적용 취소: v{version} - {description}")
+                raise
+            
+            cursor.execute(f'RELEASE {savepoint}')
+            current_version = version
+            logger.info(f"스키마 마이그레이션 적용: v{version} - {description}")
+    
+    def _convert_timestamps_to_epoch(self, cursor):
+        """ISO 타임스탬프(로컬 시각)를 UTC epoch 밀리초 정수로 전환하고 롤업 재계산"""
+        for table, column in EPOCH_TIMESTAMP_COLUMNS:
+            cursor.execute(f'''
+                UPDATE {table}
+                SET {column} = CAST(round((julianday({column}, 'utc') - 2440587.5) * 86400000) AS INTEGER)
+                WHERE typeof({column}) = 'text' AND julianday({column}) IS NOT NULL
+            ''')
+        
+        _backfill_rollups(cursor, epoch_ms=True)
+        cursor.execute(
+            "INSERT OR REPLACE INTO db_meta (key, value) VALUES ('timestamp_format', ?)",
+            (TIMESTAMP_FORMAT_EPOCH_MS,)
+        )
+        logger.info("타임스탬프를 epoch 밀리초 형식으로 전환 완료")
+    
+    def _timestamp(self, value: Any = None) -> Any:
+        """저장용 타임스탬프 (None이면 현재 시각, ISO 문자열 또는 UTC epoch 밀리초)"""
+        if value is None:
+            value = datetime.now()
+        
+        if not self.epoch_timestamps:
+            return value.isoformat() if isinstance(value, datetime) else value
+        
+        if isinstance(value, str):
+            value = datetime.fromisoformat(value.replace('Z', '+00:00'))
+        if isinstance(value, datetime):
+            # naive datetime은 로컬 시각으로 간주
+            return round(value.timestamp() * 1000)
+        return value
+    
+    def _since(self, days: int) -> Any:
+        """days일 전 시각의 저장용 타임스탬프 (기간 조건 파라미터)"""
+        return self._timestamp(datetime.now() - timedelta(days=int(days)))
+    
+    def _day_key(self, value: datetime) -> str:
+        """일별 롤업 날짜 키 (_day_expression과 같은 기준)"""
+        if self.epoch_timestamps:
+            return value.astimezone(timezone.utc).date().isoformat()
+        return value.date().isoformat()
+    
+    def _since_day(self, days: int) -> str:
+        """days일 전의 롤업 날짜 키 (롤업 테이블 기간 조건 파라미터)"""
+        return self._day_key(datetime.now() - timedelta(days=int(days)))
+    
+    def _format_timestamps(self, data: Dict) -> Dict:
+        """조회 결과의 epoch 밀리초 타임스탬프를 ISO 문자열(UTC)로 변환"""
+        if self.epoch_timestamps:
+            for table, column in EPOCH_TIMESTAMP_COLUMNS:
+                value = data.get(column)
+                if isinstance(value, int):
+                    data[column] = datetime.fromtimestamp(value / 1000, timezone.utc).isoformat(timespec='milliseconds')
+        return data
+    
+    def get_meta(self, key: str, default: Any = None) -> Any:
+        """db_meta 값 조회 (JSON 디코딩)"""
+        with self.pool.reader() as conn:
+            row = conn.execute('SELECT value FROM db_meta WHERE key = ?', (key,)).fetchone()
+        return json.loads(row[0]) if row else default
+    
+    def set_meta(self, key: str, value: Any):
+        """db_meta 값 저장 (JSON 인코딩)"""
+        with self.pool.writer() as conn:
+            conn.execute('''
+                INSERT INTO db_meta (key, value) VALUES (?, ?)
+                ON CONFLICT(key) DO UPDATE SET value = excluded.value
+            ''', (key, json.dumps(value, ensure_ascii=False)))
+    
+    def get_schema_version(self) -> int:
+        """현재 스키마 버전 조회"""
+        with self.pool.reader() as conn:
+            return conn.execute('PRAGMA user_version').fetchone()[0]
+    
+    @contextmanager
+    def capture_statements(self):
+        """블록 안에서 실행된 SQL 문 수집"""
+        statements = []
+        self.pool.set_trace_callback(statements.append)
+        try:
+            yield statements
+        finally:
+            self.pool.set_trace_callback(None)
+    
+    def find_full_scans(self, statements: Iterable[str], min_rows: int = FULL_SCAN_ROW_THRESHOLD) -> List[Dict]:
+        """min_rows보다 큰 테이블을 인덱스 없이 전체 스캔하는 쿼리 검출"""
+        violations = []
+        table_sizes = {}
+        
+        with self.pool.reader() as conn:
+            for statement in dict.fromkeys(statements):
+                if not statement.lstrip().upper().startswith(('SELECT', 'UPDATE', 'DELETE', 'WITH')):
+                    continue
+                
+                # 별칭 -> 테이블 이름 매핑
+                aliases = {}
+                for table, alias in re.findall(
+                    r'\b(?:FROM|JOIN|UPDATE)\s+(\w+)(?:\s+(?:AS\s+)?(?!WHERE|JOIN|ON|ORDER|GROUP|LIMIT|SET|LEFT|INNER)(\w+))?',
+                    statement, re.IGNORECASE
+                ):
+                    aliases[table] = table
+                    if alias:
+                        aliases[alias] = table
+                
+                plan = conn.execute(f'EXPLAIN QUERY PLAN {statement}').fetchall()
+                for row in plan:
+                    detail = row[-1]
+                    match = re.match(r'SCAN (\w+)$', detail)
+                    if not match or match.group(1) not in aliases:
+                        continue
+                    
+                    table = aliases[match.group(1)]
+                    if table not in table_sizes:
+                        table_sizes[table] = conn.execute(f'SELECT COUNT(*) FROM "{table}"').fetchone()[0]
+                    
+                    if table_sizes[table] > min_rows:
+                        violations.append({
+                            'statement': statement.strip(),
+                            'table': table,
+                            'rows': table_sizes[table],
+                            'plan': detail
+                        })
+                        logger.warning(f"전체 테이블 스캔 검출 ({table}, {table_sizes[table]}행): {' '.join(statement.split())}")
+        
+        return violations
+    
+    def enable_profiling(self, slow_query_ms: float = None) -> QueryProfiler:
+        """쿼리 프로파일링 시작 (공개 메서드를 인스턴스 단위로 감싸고 커넥션에 프로파일러 설정)
+        
+        꺼져 있을 때는 래퍼와 ProfiledCursor를 전혀 거치지 않으며,
+        이미 켜져 있으면 느린 쿼리 임계값만 갱신
+        """
+        if slow_query_ms is None:
+            slow_query_ms = float(os.getenv('DB_SLOW_QUERY_MS', SLOW_QUERY_MS))
+        
+        if self.profiler is not None:
+            self.profiler.slow_query_ms = slow_query_ms
+            return self.profiler
+        
+        profiler = QueryProfiler(slow_query_ms=slow_query_ms)
+        for name, function in inspect.getmembers(type(self), inspect.isfunction):
+            if name.startswith('_') or name in PROFILE_EXCLUDED_METHODS:
+                continue
+            setattr(self, name, profiler.wrap(name, getattr(self, name), inspect.isgeneratorfunction(function)))
+        
+        self.profiler = profiler
+        self.pool.set_profiler(profiler)
+        logger.info(f"쿼리 프로파일링 시작 (느린 쿼리 기준 {slow_query_ms}ms)")
+        return profiler
+    
+    def disable_profiling(self):
+        """쿼리 프로파일링 종료 (집계는 버림)"""
+        if self.profiler is None:
+            return
+        
+        self.pool.set_profiler(None)
+        for name in list(vars(self)):
+            if getattr(vars(self)[name], '__wrapped__', None) is not None:
+                delattr(self, name)
+        self.profiler = None
+        logger.info("쿼리 프로파일링 종료")
+    
+    def get_query_stats(self, top_statements: int = 20) -> Dict[str, Any]:
+        """메서드별 지연 히스토그램, 문장별 집계, 느린 쿼리 로그 조회"""
+        if self.profiler is None:
+            return {'enabled': False}
+        return self.profiler.get_stats(top_statements=top_statements)
+    
+    def reset_query_stats(self):
+        """프로파일링 집계 초기화"""
+        if self.profiler is not None:
+            self.profiler.reset()
     
     def save_property_data(self, property_data: Dict, content_data: Dict = None) -> bool:
         """숙소 데이터 저장"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self.pool.writer() as conn:
                 cursor = conn.cursor()
                 
-                # 기존 데이터 확인
-                cursor.execute('SELECT id FROM properties WHERE id = ?', (property_data['id'],))
-                existing = cursor.fetchone()
-                
-                if existing:
-                    # 업데이트
-                    cursor.execute('''
-                        UPDATE properties SET
-                            title = ?, description = ?, city = ?, latitude = ?, longitude = ?,
-                            price_per_night = ?, property_type = ?, max_guests = ?, bedrooms = ?,
-                            bathrooms = ?, amenities = ?, rating = ?, review_count = ?,
-                            host_name = ?, host_rating = ?, images = ?, availability = ?,
-                            booking_url = ?, scraped_at = ?, is_active = 1
-                        WHERE id = ?
-                    ''', (
-                        property_data.get('title', ''),
-                        property_data.get('description', ''),
-                        property_data.get('city', ''),
-                        property_data.get('latitude', 0),
-                        property_data.get('longitude', 0),
-                        property_data.get('price_per_night', 0),
-                        property_data.get('property_type', ''),
-                        property_data.get('max_guests', 0),
-                        property_data.get('bedrooms', 0),
-                        property_data.get('bathrooms', 0),
-                        json.dumps(property_data.get('amenities', [])),
-                        property_data.get('rating', 0),
-                        property_data.get('review_count', 0),
-                        property_data.get('host_name', ''),
-                        property_data.get('host_rating', 0),
-                        json.dumps(property_data.get('images', [])),
-                        json.dumps(property_data.get('availability', {})),
-                        property_data.get('booking_url', ''),
-                        property_data.get('scraped_at', datetime.now().isoformat()),
-                        property_data['id']
-                    ))
-                else:
-                    # 새로 삽입
-                    cursor.execute('''
-                        INSERT INTO properties (
-                            id, title, description, city, latitude, longitude,
-                            price_per_night, property_type, max_guests, bedrooms,
-                            bathrooms, amenities, rating, review_count, host_name,
-                            host_rating, images, availability, booking_url,
-                            created_at, scraped_at
-                        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    ''', (
-                        property_data['id'],
-                        property_data.get('title', ''),
-                        property_data.get('description', ''),
-                        property_data.get('city', ''),
-                        property_data.get('latitude', 0),
-                        property_data.get('longitude', 0),
-                        property_data.get('price_per_night', 0),
-                        property_data.get('property_type', ''),
-                        property_data.get('max_guests', 0),
-                        property_data.get('bedrooms', 0),
-                        property_data.get('bathrooms', 0),
-                        json.dumps(property_data.get('amenities', [])),
-                        property_data.get('rating', 0),
-                        property_data.get('review_count', 0),
-                        property_data.get('host_name', ''),
-                        property_data.get('host_rating', 0),
-                        json.dumps(property_data.get('images', [])),
-                        json.dumps(property_data.get('availability', {})),
-                        property_data.get('booking_url', ''),
-                        property_data.get('created_at', datetime.now().isoformat()),
-                        property_data.get('scraped_at', datetime.now().isoformat())
-                    ))
+                # 삽입 또는 업데이트 (created_at은 최초 삽입 시에만 기록)
+                cursor.execute(PROPERTY_UPSERT_SQL, self._property_params(property_data))
                 
-                # 콘텐츠 데이터 저장
+                # 콘텐츠 데이터 저장 (현재 데이터 버전의 콘텐츠가 생성된 것으로 기록)
                 if content_data:
-                    self._save_content_data(property_data['id'], content_data, cursor)
+                    self._save_content_data(property_data, content_data, cursor)
+                    cursor.execute('UPDATE properties SET content_version = data_version WHERE id = ?',
+                                   (property_data['id'],))
                 
-                conn.commit()
                 logger.info(f"숙소 데이터 저장 완료: {property_data['id']}")
                 return True
                 
@@ -208,43 +1743,271 @@ class DatabaseManager:
             logger.error(f"숙소 데이터 저장 중 오류: {str(e)}")
             return False
     
-    def _save_content_data(self, property_id: str, content_data: Dict, cursor):
+    def _property_params(self, property_data: Dict) -> tuple:
+        """PROPERTY_UPSERT_SQL 바인딩 파라미터 생성"""
+        now = self._timestamp()
+        return (
+            property_data['id'],
+            property_data.get('title', ''),
+            property_data.get('description', ''),
+            property_data.get('city', ''),
+            property_data.get('latitude', 0),
+            property_data.get('longitude', 0),
+            property_data.get('price_per_night', 0),
+            property_data.get('property_type', ''),
+            property_data.get('max_guests', 0),
+            property_data.get('bedrooms', 0),
+            property_data.get('bathrooms', 0),
+            json.dumps(property_data.get('amenities', [])),
+            property_data.get('rating', 0),
+            property_data.get('review_count', 0),
+            property_data.get('host_name', ''),
+            property_data.get('host_rating', 0),
+            json.dumps(property_data.get('images', [])),
+            json.dumps(property_data.get('availability', {})),
+            property_data.get('booking_url', ''),
+            self._timestamp(property_data['created_at']) if property_data.get('created_at') else now,
+            self._timestamp(property_data['scraped_at']) if property_data.get('scraped_at') else now
+        )
+    
+    def save_properties_bulk(self, properties: Iterable[Dict], chunk_size: int = 500) -> Dict[str, int]:
+        """숙소 데이터 일괄 저장 (청크당 한 트랜잭션)"""
+        result = {'inserted': 0, 'updated': 0, 'failed': 0}
+        iterator = iter(properties)
+        
+        while True:
+            chunk = list(islice(iterator, chunk_size))
+            if not chunk:
+                break
+            
+            try:
+                with self.pool.writer() as conn:
+                    cursor = conn.cursor()
+                    
+                    # 기존 ID 확인 (삽입/업데이트 건수 집계용)
+                    ids = [p['id'] for p in chunk]
+                    unique_ids = list(dict.fromkeys(ids))
+                    placeholders = ','.join('?' * len(unique_ids))
+                    cursor.execute(f'SELECT id FROM properties WHERE id IN ({placeholders})', unique_ids)
+                    seen = {row[0] for row in cursor.fetchall()}
+                    
+                    cursor.executemany(PROPERTY_UPSERT_SQL, (self._property_params(p) for p in chunk))
+                
+                inserted = 0
+                updated = 0
+                for property_id in ids:
+                    if property_id in seen:
+                        updated += 1
+                    else:
+                        inserted += 1
+                        seen.add(property_id)
+                result['inserted'] += inserted
+                result['updated'] += updated
+                
+            except Exception as e:
+                result['failed'] += len(chunk)
+                logger.error(f"숙소 데이터 일괄 저장 중 오류: {str(e)}")
+        
+        logger.info(f"숙소 데이터 일괄 저장 완료: {result}")
+        return result
+    
+    def _save_content_data(self, property_data: Dict, content_data: Dict, cursor):
         """콘텐츠 데이터 저장"""
         try:
-            platforms = content_data.get('platforms', {})
+            cursor.executemany(CONTENT_INSERT_SQL, self._content_params(property_data, content_data))
+                
+        except Exception as e:
+            logger.error(f"콘텐츠 데이터 저장 중 오류: {str(e)}")
+    
+    def _content_params(self, property_data: Dict, content_data: Dict) -> List[tuple]:
+        """CONTENT_INSERT_SQL 바인딩 파라미터 생성 (플랫폼별 한 행, 해시는 콘텐츠를 생성한 숙소 데이터 기준)"""
+        now = self._timestamp()
+        return [
+            (property_data['id'], platform, json.dumps(content), now, content_source_hash(property_data, platform))
+            for platform, content in content_data.get('platforms', {}).items()
+        ]
+    
+    def _properties_by_id(self, conn: sqlite3.Connection, property_ids: List[str]) -> Dict[str, PropertyRecord]:
+        """id 목록의 숙소를 id -> PropertyRecord로 조회 (없는 id는 빠짐)"""
+        unique_ids = list(dict.fromkeys(property_ids))
+        if not unique_ids:
+            return {}
+        placeholders = ','.join('?' * len(unique_ids))
+        cursor = conn.execute(f'SELECT * FROM properties WHERE id IN ({placeholders})', unique_ids)
+        columns = [description[0] for description in cursor.description]
+        return {property_data['id']: property_data
+                for property_data in self._rows_to_properties(columns, cursor.fetchall())}
+    
+    def save_content_bulk(self, contents: Iterable[Tuple[str, Dict]], chunk_size: int = 500) -> Dict[str, int]:
+        """콘텐츠 일괄 저장 ((property_id, content_data) 쌍, 청크당 한 트랜잭션, 동일 콘텐츠는 건너뜀)"""
+        result = {'inserted': 0, 'skipped': 0, 'failed': 0}
+        iterator = iter(contents)
+        
+        while True:
+            chunk = list(islice(iterator, chunk_size))
+            if not chunk:
+                break
             
-            for platform, content in platforms.items():
+            row_count = sum(len(content_data.get('platforms', {})) for _, content_data in chunk)
+            try:
+                with self.pool.writer() as conn:
+                    # 콘텐츠 해시는 현재 저장된 숙소 데이터(생성 입력) 기준
+                    properties = self._properties_by_id(conn, [property_id for property_id, _ in chunk])
+                    rows = [row for property_id, content_data in chunk
+                            for row in self._content_params(properties.get(property_id, {'id': property_id}), content_data)]
+                    inserted = conn.executemany(CONTENT_INSERT_SQL, rows).rowcount
+                result['inserted'] += inserted
+                result['skipped'] += row_count - inserted
+                
+            except Exception as e:
+                result['failed'] += row_count
+                logger.error(f"콘텐츠 일괄 저장 중 오류: {str(e)}")
+        
+        logger.info(f"콘텐츠 일괄 저장 완료: {result}")
+        return result
+    
+    def get_stale_properties(self, limit: int = 20, after_id: str = None) -> List[Dict]:
+        """콘텐츠가 최신 숙소 데이터보다 오래된 활성 숙소 조회 (id 순 키셋, after_id 이후부터)"""
+        try:
+            with self.pool.reader() as conn:
+                cursor = conn.cursor()
                 cursor.execute('''
-                    INSERT INTO content (property_id, content_type, content_data, created_at)
-                    VALUES (?, ?, ?, ?)
-                ''', (
-                    property_id,
-                    platform,
-                    json.dumps(content),
-                    datetime.now().isoformat()
-                ))
+                    SELECT * FROM properties
+                    WHERE content_version < data_version AND is_active = 1 AND id > ?
+                    ORDER BY id
+                    LIMIT ?
+                ''', (after_id or '', limit))
+                
+                rows = cursor.fetchall()
+                columns = [description[0] for description in cursor.description]
+                
+                return self._rows_to_properties(columns, rows)
                 
         except Exception as e:
-            logger.error(f"콘텐츠 데이터 저장 중 오류: {str(e)}")
+            logger.error(f"콘텐츠 재생성 대상 숙소 조회 중 오류: {str(e)}")
+            return []
+    
+    def count_stale_properties(self) -> int:
+        """콘텐츠 재생성 대상 활성 숙소 수 조회"""
+        try:
+            with self.pool.reader() as conn:
+                return conn.execute('''
+                    SELECT COUNT(*) FROM properties
+                    WHERE content_version < data_version AND is_active = 1
+                ''').fetchone()[0]
+                
+        except Exception as e:
+            logger.error(f"콘텐츠 재생성 대상 숙소 수 조회 중 오류: {str(e)}")
+            return 0
+    
+    def save_generated_content(self, items: Iterable[Tuple[Dict, Dict]]) -> Dict[str, int]:
+        """생성된 콘텐츠 저장 및 콘텐츠 버전 갱신 ((property_data, content_data) 쌍, 한 트랜잭션)
+        
+        property_data의 data_version(조회 시점 값)까지만 최신으로 기록하므로,
+        생성 도중 숙소 데이터가 바뀌면 다음 실행에서 다시 대기열에 오름
+        """
+        items = list(items)
+        rows = [row for property_data, content_data in items
+                for row in self._content_params(property_data, content_data)]
+        versions = [(property_data.get('data_version', 1), property_data['id'], property_data.get('data_version', 1))
+                    for property_data, _ in items]
+        
+        try:
+            with self.pool.writer() as conn:
+                inserted = conn.executemany(CONTENT_INSERT_SQL, rows).rowcount
+                updated = conn.executemany('''
+                    UPDATE properties SET content_version = ?
+                    WHERE id = ? AND content_version < ?
+                ''', versions).rowcount
+            
+            return {'inserted': inserted, 'skipped': len(rows) - inserted, 'properties': updated, 'failed': 0}
+            
+        except Exception as e:
+            logger.error(f"생성 콘텐츠 저장 중 오류: {str(e)}")
+            return {'inserted': 0, 'skipped': 0, 'properties': 0, 'failed': len(rows)}
+    
+    def compact_duplicate_content(self, batch_size: int = 500) -> Dict[str, int]:
+        """content_hash가 없는 기존 콘텐츠에 해시를 채우며 중복 행 삭제 (배치당 한 트랜잭션)
+        
+        기존 행의 생성 입력은 알 수 없으므로 현재 숙소 데이터 기준 입력 해시를 부여하고,
+        같은 (property_id, content_type, content_hash) 중 게시된 행을 우선 남기며 둘 다 미게시면
+        먼저 생성된(id가 작은) 행을 남김. 게시된 행끼리는 삭제하지 않고 본문 해시로 구분해 보존
+        """
+        result = {'hashed': 0, 'deleted': 0, 'failed': 0}
+        last_id = 0
+        
+        while True:
+            try:
+                with self.pool.writer() as conn:
+                    rows = conn.execute('''
+                        SELECT id, property_id, content_type, content_data, is_posted
+                        FROM content
+                        WHERE content_hash IS NULL AND id > ?
+                        ORDER BY id
+                        LIMIT ?
+                    ''', (last_id, batch_size)).fetchall()
+                    if not rows:
+                        break
+                    
+                    properties = self._properties_by_id(conn, [row[1] for row in rows])
+                    for content_id, property_id, content_type, content_data, is_posted in rows:
+                        last_id = content_id
+                        try:
+                            output_digest = content_hash(json.loads(content_data))
+                        except (TypeError, ValueError):
+                            result['failed'] += 1
+                            continue
+                        
+                        # 숙소가 삭제된 콘텐츠는 본문 해시로 동일 본문만 정리
+                        property_data = properties.get(property_id)
+                        digest = content_source_hash(property_data, content_type) if property_data else output_digest
+                        
+                        existing = conn.execute('''
+                            SELECT id, is_posted FROM content
+                            WHERE property_id = ? AND content_type = ? AND content_hash = ?
+                        ''', (property_id, content_type, digest)).fetchone()
+                        
+                        if existing is not None:
+                            if not is_posted:
+                                conn.execute('DELETE FROM content WHERE id = ?', (content_id,))
+                                result['deleted'] += 1
+                                continue
+                            if not existing[1]:
+                                conn.execute('DELETE FROM content WHERE id = ?', (existing[0],))
+                                result['deleted'] += 1
+                            elif digest != output_digest:
+                                digest = output_digest
+                            else:
+                                continue
+                        
+                        try:
+                            conn.execute('UPDATE content SET content_hash = ? WHERE id = ?', (digest, content_id))
+                        except sqlite3.IntegrityError:
+                            # 본문까지 같은 게시 행이 이미 있으면 해시 없이 보존
+                            continue
+                        result['hashed'] += 1
+                
+                logger.info(f"콘텐츠 중복 정리 진행: {result}")
+                
+            except Exception as e:
+                logger.error(f"콘텐츠 중복 정리 중 오류: {str(e)}")
+                result['failed'] += 1
+                break
+        
+        logger.info(f"콘텐츠 중복 정리 완료: {result}")
+        return result
     
     def get_property_data(self, property_id: str) -> Optional[Dict]:
         """숙소 데이터 조회"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self.pool.reader() as conn:
                 cursor = conn.cursor()
                 cursor.execute('SELECT * FROM properties WHERE id = ?', (property_id,))
                 row = cursor.fetchone()
                 
                 if row:
                     columns = [description[0] for description in cursor.description]
-                    property_data = dict(zip(columns, row))
-                    
-                    # JSON 필드 파싱
-                    property_data['amenities'] = json.loads(property_data['amenities'] or '[]')
-                    property_data['images'] = json.loads(property_data['images'] or '[]')
-                    property_data['availability'] = json.loads(property_data['availability'] or '{}')
-                    
-                    return property_data
+                    return self._row_to_property(columns, row)
                 
                 return None
                 
@@ -255,81 +2018,807 @@ class DatabaseManager:
     def get_all_properties(self, limit: int = 100, offset: int = 0) -> List[Dict]:
         """모든 숙소 데이터 조회"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self.pool.reader() as conn:
                 cursor = conn.cursor()
                 cursor.execute('''
                     SELECT * FROM properties 
                     WHERE is_active = 1 
-                    ORDER BY scraped_at DESC 
+                    ORDER BY scraped_at DESC, id DESC 
                     LIMIT ? OFFSET ?
                 ''', (limit, offset))
                 
                 rows = cursor.fetchall()
                 columns = [description[0] for description in cursor.description]
                 
-                properties = []
-                for row in rows:
-                    property_data = dict(zip(columns, row))
-                    property_data['amenities'] = json.loads(property_data['amenities'] or '[]')
-                    property_data['images'] = json.loads(property_data['images'] or '[]')
-                    property_data['availability'] = json.loads(property_data['availability'] or '{}')
-                    properties.append(property_data)
-                
-                return properties
+                return self._rows_to_properties(columns, rows)
                 
         except Exception as e:
             logger.error(f"숙소 데이터 조회 중 오류: {str(e)}")
             return []
     
+    def get_properties_page(self, limit: int = 20, cursor: str = None, direction: str = 'next',
+                            city: str = None, status: str = None, search: str = None,
+                            amenities: List[str] = None) -> Dict[str, Any]:
+        """숙소 목록 키셋 페이지 조회 (scraped_at, id 기준 최신순)"""
+        # 잘못된 커서는 ValueError로 호출자에게 전달
+        position = self._decode_cursor(cursor) if cursor else None
+        
+        try:
+            with self.pool.reader() as conn:
+                where, params = self._property_filters(city, status, search, amenities, conn)
+                query = f'SELECT * FROM properties WHERE {where}'
+                
+                backward = position is not None and direction == 'prev'
+                if position:
+                    query += ' AND (scraped_at, id) {} (?, ?)'.format('>' if backward else '<')
+                    params.extend([self._timestamp(position[0]), position[1]])
+                
+                query += ' ORDER BY scraped_at {0}, id {0} LIMIT ?'.format('ASC' if backward else 'DESC')
+                params.append(limit + 1)
+                
+                db_cursor = conn.execute(query, params)
+                rows = db_cursor.fetchall()
+                columns = [description[0] for description in db_cursor.description]
+                
+                # 한 행을 더 읽어 다음 페이지 존재 여부 판단
+                has_more = len(rows) > limit
+                rows = rows[:limit]
+                if backward:
+                    rows.reverse()
+                
+                properties = self._rows_to_properties(columns, rows)
+                first_cursor = self._encode_cursor(properties[0]) if properties else None
+                last_cursor = self._encode_cursor(properties[-1]) if properties else None
+                
+                if backward:
+                    next_cursor = last_cursor
+                    prev_cursor = first_cursor if has_more else None
+                else:
+                    next_cursor = last_cursor if has_more else None
+                    prev_cursor = first_cursor if position else None
+                
+                return {
+                    'properties': properties,
+                    'next_cursor': next_cursor,
+                    'prev_cursor': prev_cursor
+                }
+                
+        except Exception as e:
+            logger.error(f"숙소 페이지 조회 중 오류: {str(e)}")
+            return {'properties': [], 'next_cursor': None, 'prev_cursor': None}
+    
+    def query_properties(self, city: str = None, status: str = None, search: str = None,
+                         limit: int = 20, offset: int = 0, amenities: List[str] = None) -> Dict[str, Any]:
+        """조건별 숙소 조회 (요청한 페이지만 디코딩, 전체 건수 포함)"""
+        try:
+            with self.pool.reader() as conn:
+                where, params = self._property_filters(city, status, search, amenities, conn)
+                
+                total = conn.execute(f'SELECT COUNT(*) FROM properties WHERE {where}', params).fetchone()[0]
+                
+                db_cursor = conn.execute(f'''
+                    SELECT * FROM properties
+                    WHERE {where}
+                    ORDER BY scraped_at DESC, id DESC
+                    LIMIT ? OFFSET ?
+                ''', params + [limit, offset])
+                rows = db_cursor.fetchall()
+                columns = [description[0] for description in db_cursor.description]
+                
+                properties = self._rows_to_properties(columns, rows)
+                has_more = offset + len(properties) < total
+                
+                return {
+                    'properties': properties,
+                    'total': total,
+                    'next_cursor': self._encode_cursor(properties[-1]) if properties and has_more else None,
+                    'prev_cursor': self._encode_cursor(properties[0]) if properties and offset > 0 else None
+                }
+                
+        except Exception as e:
+            logger.error(f"숙소 조건 조회 중 오류: {str(e)}")
+            return {'properties': [], 'total': 0, 'next_cursor': None, 'prev_cursor': None}
+    
+    def count_properties(self, city: str = None, status: str = None, search: str = None,
+                         amenities: List[str] = None) -> int:
+        """조건별 숙소 수 조회"""
+        try:
+            with self.pool.reader() as conn:
+                where, params = self._property_filters(city, status, search, amenities, conn)
+                return conn.execute(f'SELECT COUNT(*) FROM properties WHERE {where}', params).fetchone()[0]
+                
+        except Exception as e:
+            logger.error(f"숙소 수 조회 중 오류: {str(e)}")
+            return 0
+    
+    def search_properties(self, keywords: List[str], limit: int = 10, match_all: bool = False) -> List[Dict]:
+        """키워드 전문 검색 (BM25 관련도순, 제목 > 도시 > 설명 가중치)"""
+        keywords = [k.strip() for k in keywords if k and k.strip()]
+        if not keywords:
+            return []
+        
+        try:
+            with self.pool.reader() as conn:
+                if self._use_fts(keywords):
+                    db_cursor = conn.execute('''
+                        SELECT p.*
+                        FROM properties_fts
+                        JOIN properties p ON p.rowid = properties_fts.rowid
+                        WHERE properties_fts MATCH ? AND p.is_active = 1
+                        ORDER BY bm25(properties_fts, 10.0, 1.0, 5.0)
+                        LIMIT ?
+                    ''', (self._fts_query(keywords, match_all), limit))
+                else:
+                    # 짧은 검색어가 있으면 LIKE로 검색
+                    conditions = []
+                    params = []
+                    for keyword in keywords:
+                        condition, condition_params = self._like_condition(keyword)
+                        conditions.append(condition)
+                        params.extend(condition_params)
+                    where = (' AND ' if match_all else ' OR ').join(conditions)
+                    db_cursor = conn.execute(f'''
+                        SELECT * FROM properties
+                        WHERE is_active = 1 AND ({where})
+                        ORDER BY scraped_at DESC, id DESC
+                        LIMIT ?
+                    ''', params + [limit])
+                
+                rows = db_cursor.fetchall()
+                columns = [description[0] for description in db_cursor.description]
+                return self._rows_to_properties(columns, rows)
+                
+        except Exception as e:
+            logger.error(f"숙소 키워드 검색 중 오류: {str(e)}")
+            return []
+    
+    @staticmethod
+    def _like_condition(search: str) -> Tuple[str, List]:
+        """제목/도시/설명 부분 문자열 LIKE 조건 생성"""
+        # LIKE 와일드카드 문자 이스케이프
+        pattern = '%' + search.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+        condition = "(title LIKE ? ESCAPE '\\' OR city LIKE ? ESCAPE '\\' OR description LIKE ? ESCAPE '\\')"
+        return condition, [pattern, pattern, pattern]
+    
+    def _use_fts(self, keywords: List[str]) -> bool:
+        """전문 검색 인덱스 사용 가능 여부 (모든 검색어가 최소 길이 이상)"""
+        return self.fts_enabled and all(len(k) >= FTS_MIN_TERM_LENGTH for k in keywords)
+    
+    @staticmethod
+    def _fts_query(keywords: List[str], match_all: bool = False) -> str:
+        """검색어를 FTS5 MATCH 구문(따옴표 구문)으로 변환"""
+        phrases = ['"{}"'.format(k.replace('"', '""')) for k in keywords]
+        return (' AND ' if match_all else ' OR ').join(phrases)
+    
+    def _property_filters(self, city: str = None, status: str = None, search: str = None,
+                          amenities: List[str] = None, conn: sqlite3.Connection = None) -> Tuple[str, List]:
+        """숙소 조회 WHERE 절과 파라미터 생성 (status: active(기본)/inactive/all, amenities: 모두 포함)"""
+        conditions = []
+        params = []
+        
+        if status == 'inactive':
+            conditions.append('is_active = 0')
+        elif status != 'all':
+            conditions.append('is_active = 1')
+        
+        if city:
+            conditions.append('city = ? COLLATE NOCASE')
+            params.append(city)
+        
+        if search and self._use_fts([search]):
+            conditions.append('rowid IN (SELECT rowid FROM properties_fts WHERE properties_fts MATCH ?)')
+            params.append(self._fts_query([search]))
+        elif search:
+            condition, condition_params = self._like_condition(search)
+            conditions.append(condition)
+            params.extend(condition_params)
+        
+        if amenities:
+            condition, condition_params = self._amenity_condition(conn, amenities)
+            conditions.append(condition)
+            params.extend(condition_params)
+        
+        return ' AND '.join(conditions) or '1 = 1', params
+    
+    @staticmethod
+    def _amenity_condition(conn: sqlite3.Connection, names: List[str]) -> Tuple[str, List]:
+        """필수 편의시설 조건 (사전 비트 범위는 amenity_mask AND, 범위 밖은 JSON 검사)"""
+        names = list(dict.fromkeys(name.strip() for name in names if name and name.strip()))
+        if not names:
+            return '1 = 1', []
+        
+        placeholders = ','.join('?' * len(names))
+        ids = dict(conn.execute(f'SELECT name, id FROM amenities WHERE name IN ({placeholders})', names).fetchall())
+        if len(ids) < len(names):
+            # 사전에 없는 편의시설을 가진 숙소는 없음
+            return '0 = 1', []
+        
+        conditions = []
+        params = []
+        mask = 0
+        for name in names:
+            if ids[name] <= AMENITY_MASK_BITS:
+                mask |= 1 << (ids[name] - 1)
+            else:
+                conditions.append(f"EXISTS (SELECT 1 FROM json_each({_amenity_json('amenities')}) WHERE value = ?)")
+                params.append(name)
+        
+        if mask:
+            conditions.insert(0, '(amenity_mask & ?) = ?')
+            params[:0] = [_to_signed64(mask)] * 2
+        return ' AND '.join(conditions), params
+    
+    def get_amenities(self) -> List[Dict[str, Any]]:
+        """편의시설 사전 조회 (id순, bit는 비트마스크 위치이며 범위 밖이면 None)"""
+        try:
+            with self.pool.reader() as conn:
+                rows = conn.execute('SELECT id, name FROM amenities ORDER BY id').fetchall()
+            return [{'id': amenity_id, 'name': name,
+                     'bit': amenity_id - 1 if amenity_id <= AMENITY_MASK_BITS else None}
+                    for amenity_id, name in rows]
+            
+        except Exception as e:
+            logger.error(f"편의시설 사전 조회 중 오류: {str(e)}")
+            return []
+    
+    def get_amenity_masks(self, status: str = None) -> Tuple[List[str], List[int]]:
+        """숙소 id 목록과 편의시설 비트마스크 목록 (부호 있는 64비트 정수) 조회"""
+        try:
+            with self.pool.reader() as conn:
+                where, params = self._property_filters(status=status)
+                rows = conn.execute(f'SELECT id, amenity_mask FROM properties WHERE {where} ORDER BY id', params).fetchall()
+            return [row[0] for row in rows], [row[1] for row in rows]
+            
+        except Exception as e:
+            logger.error(f"편의시설 비트마스크 조회 중 오류: {str(e)}")
+            return [], []
+    
+    def get_property_ids_with_amenities(self, amenities: List[str], status: str = None) -> List[str]:
+        """지정한 편의시설을 모두 갖춘 숙소 id 목록 조회 (id순)"""
+        try:
+            with self.pool.reader() as conn:
+                where, params = self._property_filters(status=status, amenities=amenities, conn=conn)
+                rows = conn.execute(f'SELECT id FROM properties WHERE {where} ORDER BY id', params).fetchall()
+            return [row[0] for row in rows]
+            
+        except Exception as e:
+            logger.error(f"편의시설 조건 숙소 조회 중 오류: {str(e)}")
+            return []
+    
+    def _geo_candidates(self, conn: sqlite3.Connection, min_lat: float, min_lng: float, max_lat: float,
+                        max_lng: float, where: str, params: List, limit: int = None) -> List[tuple]:
+        """사각 영역 안 숙소 (rowid, latitude, longitude) 목록 (R*Tree가 있으면 인덱스로 후보 제한)"""
+        box = [min_lat, max_lat, min_lng, max_lng]
+        if self.geo_index_enabled:
+            # R*Tree 후보를 바깥 루프로 고정 (is_active 인덱스 전체 스캔 방지)
+            # R*Tree는 좌표를 float32로 바깥쪽 반올림하므로 정확한 범위는 properties 값으로 다시 확인
+            source = '''(
+                SELECT id AS geo_id FROM properties_geo
+                WHERE max_lat >= ? AND min_lat <= ? AND max_lng >= ? AND min_lng <= ?
+            ) CROSS JOIN properties ON properties.rowid = geo_id'''
+            box_params = box + box
+        else:
+            source = 'properties'
+            box_params = box
+        
+        sql = f'''
+            SELECT properties.rowid, latitude, longitude FROM {source}
+            WHERE latitude BETWEEN ? AND ? AND longitude BETWEEN ? AND ?
+            AND {GEO_POINT_CONDITION.format(p='')} AND {where}
+        '''
+        if limit:
+            sql += f' LIMIT {int(limit)}'
+        return conn.execute(sql, box_params + params).fetchall()
+    
+    def _properties_by_rowid(self, conn: sqlite3.Connection, rowids: List[int]) -> List[PropertyRecord]:
+        """rowid 목록 순서대로 숙소 조회"""
+        if not rowids:
+            return []
+        placeholders = ','.join('?' * len(rowids))
+        cursor = conn.execute(f'SELECT rowid AS _rowid, * FROM properties WHERE rowid IN ({placeholders})', rowids)
+        columns = [description[0] for description in cursor.description]
+        properties = {property_data.pop('_rowid'): property_data
+                      for property_data in self._rows_to_properties(columns, cursor.fetchall())}
+        return [properties[rowid] for rowid in rowids if rowid in properties]
+    
+    def find_nearby(self, latitude: float, longitude: float, radius_km: float = 5.0, limit: int = 20,
+                    exclude_id: str = None, city: str = None, status: str = None,
+                    amenities: List[str] = None) -> List[PropertyRecord]:
+        """중심 좌표에서 radius_km 안의 숙소를 가까운 순으로 조회 (각 숙소에 distance_km 추가)
+        
+        반경을 감싸는 사각 영역 후보만 인덱스로 가져와 하버사인 거리로 거르고,
+        상위 limit개 숙소만 전체 컬럼을 읽음
+        """
+        try:
+            with self.pool.reader() as conn:
+                where, params = self._property_filters(city, status, None, amenities, conn)
+                if exclude_id:
+                    where += ' AND id != ?'
+                    params.append(exclude_id)
+                candidates = self._geo_candidates(conn, *bounding_box(latitude, longitude, radius_km), where, params)
+                
+                distances = []
+                for rowid, lat, lng in candidates:
+                    distance = haversine_km(latitude, longitude, lat, lng)
+                    if distance <= radius_km:
+                        distances.append((distance, rowid))
+                distances.sort()
+                if limit:
+                    distances = distances[:limit]
+                
+                properties = self._properties_by_rowid(conn, [rowid for _, rowid in distances])
+            
+            for property_data, (distance, _) in zip(properties, distances):
+                property_data['distance_km'] = round(distance, 3)
+            return properties
+            
+        except Exception as e:
+            logger.error(f"근처 숙소 조회 중 오류: {str(e)}")
+            return []
+    
+    def find_in_bbox(self, min_lat: float, min_lng: float, max_lat: float, max_lng: float, limit: int = 500,
+                     city: str = None, status: str = None, amenities: List[str] = None) -> List[PropertyRecord]:
+        """사각 영역(남서~북동 모서리) 안 숙소 조회 (지도 화면 범위 조회용)"""
+        try:
+            with self.pool.reader() as conn:
+                where, params = self._property_filters(city, status, None, amenities, conn)
+                candidates = self._geo_candidates(conn, min_lat, min_lng, max_lat, max_lng, where, params, limit)
+                return self._properties_by_rowid(conn, [row[0] for row in candidates])
+            
+        except Exception as e:
+            logger.error(f"영역 숙소 조회 중 오류: {str(e)}")
+            return []
+    
+    def find_nearby_property(self, property_id: str, radius_km: float = 5.0, limit: int = 20,
+                             status: str = None) -> List[PropertyRecord]:
+        """숙소 주변의 다른 숙소를 가까운 순으로 조회"""
+        try:
+            with self.pool.reader() as conn:
+                row = conn.execute('SELECT latitude, longitude FROM properties WHERE id = ?', (property_id,)).fetchone()
+        except Exception as e:
+            logger.error(f"근처 숙소 조회 중 오류: {str(e)}")
+            return []
+        
+        if not row or row[0] is None or row[1] is None or (row[0] == 0 and row[1] == 0):
+            return []
+        return self.find_nearby(row[0], row[1], radius_km, limit, exclude_id=property_id, status=status)
+    
+    def get_property_clusters(self, min_lat: float, min_lng: float, max_lat: float, max_lng: float,
+                              zoom: int) -> Dict[str, Any]:
+        """지도 화면 영역의 줌별 숙소 클러스터 조회
+        
+        CLUSTER_MAX_ZOOM까지는 미리 집계한 격자 칸(중심 좌표, 숙소 수, 평균 가격)을 반환하고
+        숙소가 하나인 칸과 그보다 확대한 줌은 개별 숙소(property_id, title)로 반환.
+        칸의 bounds [남, 서, 북, 동]은 반열린 구간으로 남/서 경계는 포함하고 북/동 경계는 제외
+        """
+        zoom = max(0, int(zoom))
+        if zoom > CLUSTER_MAX_ZOOM:
+            properties = self.find_in_bbox(min_lat, min_lng, max_lat, max_lng, limit=CLUSTER_POINT_LIMIT)
+            return {
+                'zoom': zoom,
+                'clusters': [self._cluster_point(property_data) for property_data in properties],
+                'total': len(properties),
+                'truncated': len(properties) >= CLUSTER_POINT_LIMIT
+            }
+        
+        scale = cluster_scale(zoom)
+        try:
+            with self.pool.reader() as conn:
+                rows = conn.execute('''
+                    SELECT cell_x, cell_y, count, sum_lat, sum_lng, sum_price FROM property_clusters
+                    WHERE zoom = ? AND cell_x BETWEEN ? AND ? AND cell_y BETWEEN ? AND ?
+                ''', (zoom, int((min_lng + 180) * scale), int((max_lng + 180) * scale),
+                      int((min_lat + 90) * scale), int((max_lat + 90) * scale))).fetchall()
+                
+                clusters = []
+                singles = []
+                for cell_x, cell_y, count, sum_lat, sum_lng, sum_price in rows:
+                    if count == 1 and len(singles) < CLUSTER_POINT_LIMIT:
+                        singles.append([cell_x, cell_y])
+                        continue
+                    clusters.append({
+                        'lat': sum_lat / count,
+                        'lng': sum_lng / count,
+                        'count': count,
+                        'avg_price': round(sum_price / count),
+                        'bounds': [cell_y / scale - 90, cell_x / scale - 180,
+                                   (cell_y + 1) / scale - 90, (cell_x + 1) / scale - 180]
+                    })
+                
+                # 숙소가 하나인 칸은 한 번의 조인 쿼리로 해당 숙소를 찾아 개별 마커로 반환
+                properties = self._properties_by_rowid(conn, self._cluster_singles(conn, zoom, singles))
+            
+            clusters.extend(self._cluster_point(property_data) for property_data in properties)
+            return {
+                'zoom': zoom,
+                'clusters': clusters,
+                'total': sum(cluster['count'] for cluster in clusters),
+                'truncated': False
+            }
+            
+        except Exception as e:
+            logger.error(f"숙소 클러스터 조회 중 오류: {str(e)}")
+            return {'zoom': zoom, 'clusters': [], 'total': 0, 'truncated': False}
+    
+    def _cluster_singles(self, conn: sqlite3.Connection, zoom: int, cells: List[List[int]]) -> List[int]:
+        """숙소가 하나인 격자 칸 [cell_x, cell_y] 목록의 숙소 rowid를 한 쿼리로 조회
+        
+        칸 범위로 위치 인덱스 후보를 좁힌 뒤 트리거와 같은 격자 식으로 칸을 다시 확인하므로
+        경계 위의 숙소는 남/서쪽이 경계인 칸에만 속함
+        """
+        if not cells:
+            return []
+        
+        south, north = 'c.cell_y / z.scale - 90', '(c.cell_y + 1) / z.scale - 90'
+        west, east = 'c.cell_x / z.scale - 180', '(c.cell_x + 1) / z.scale - 180'
+        if self.geo_index_enabled:
+            source = 'properties_geo g CROSS JOIN properties ON properties.rowid = g.id'
+            box = (f'g.max_lat >= {south} AND g.min_lat <= {north} '
+                   f'AND g.max_lng >= {west} AND g.min_lng <= {east} AND properties.is_active = 1')
+        else:
+            # 단항 +로 is_active 인덱스를 배제해 (latitude, longitude) 인덱스로 칸마다 범위 검색
+            source = 'properties'
+            box = (f'latitude BETWEEN {south} AND {north} AND longitude BETWEEN {west} AND {east} '
+                   f'AND +properties.is_active = 1')
+        
+        rows = conn.execute(f'''
+            WITH cells (cell_x, cell_y) AS (
+                SELECT json_extract(value, '$[0]'), json_extract(value, '$[1]') FROM json_each(?)
+            )
+            SELECT properties.rowid FROM cells c
+            CROSS JOIN property_cluster_zooms z
+            CROSS JOIN {source}
+            WHERE z.zoom = ? AND {box}
+            AND ({_cluster_cells('properties.')}) = (z.zoom, c.cell_x, c.cell_y)
+            AND {GEO_POINT_CONDITION.format(p='properties.')}
+        ''', (json.dumps(cells), zoom)).fetchall()
+        return [row[0] for row in rows]
+    
+    @staticmethod
+    def _cluster_point(property_data: Dict) -> Dict[str, Any]:
+        """개별 숙소 마커"""
+        return {
+            'lat': property_data['latitude'],
+            'lng': property_data['longitude'],
+            'count': 1,
+            'avg_price': property_data.get('price_per_night'),
+            'property_id': property_data['id'],
+            'title': property_data.get('title')
+        }
+    
+    def rebuild_property_clusters(self) -> bool:
+        """줌별 클러스터 테이블을 숙소 데이터로 다시 채우기"""
+        try:
+            with self.pool.writer() as conn:
+                _backfill_property_clusters(conn.cursor())
+            logger.info("숙소 클러스터 재계산 완료")
+            return True
+            
+        except Exception as e:
+            logger.error(f"숙소 클러스터 재계산 중 오류: {str(e)}")
+            return False
+    
+    def update_availability(self, property_id: str, calendar: Dict) -> bool:
+        """숙소 예약 가능일 비트맵 저장 (calendar 형식은 update_availability_bulk 참고)"""
+        return self.update_availability_bulk([(property_id, calendar)])['failed'] == 0
+    
+    def update_availability_bulk(self, calendars: Iterable[Tuple[str, Dict]], chunk_size: int = 500) -> Dict[str, int]:
+        """여러 숙소의 예약 가능일 비트맵 저장 (청크당 한 트랜잭션)
+        
+        calendar: {'start_date': 시작일(기본 오늘), 'unavailable': [[체크인, 체크아웃], ...],
+                   'available': [[체크인, 체크아웃], ...](생략 시 전체 기간 예약 가능)}
+        박 단위 행 없이 기간 목록에서 바로 비트맵을 만들어 한 행으로 저장
+        """
+        result = {'updated': 0, 'failed': 0}
+        iterator = iter(calendars)
+        
+        while True:
+            chunk = list(islice(iterator, chunk_size))
+            if not chunk:
+                break
+            
+            try:
+                now = self._timestamp()
+                rows = []
+                for property_id, calendar in chunk:
+                    start = to_date(calendar.get('start_date') or date.today())
+                    bitmap = build_bitmap(start, calendar.get('unavailable') or (), calendar.get('available'))
+                    rows.append((property_id, start.isoformat(), bitmap, now))
+                
+                with self.pool.writer() as conn:
+                    conn.executemany(AVAILABILITY_UPSERT_SQL, rows)
+                result['updated'] += len(rows)
+                
+            except Exception as e:
+                result['failed'] += len(chunk)
+                logger.error(f"예약 가능일 저장 중 오류: {str(e)}")
+        
+        return result
+    
+    def set_availability(self, property_id: str, check_in: Any, nights: int, available: bool = False) -> bool:
+        """check_in부터 nights박의 예약 가능 여부 변경 (예약/취소 반영, 비트맵이 없으면 False)"""
+        try:
+            with self.pool.writer() as conn:
+                row = conn.execute('SELECT start_date, bitmap FROM property_availability WHERE property_id = ?',
+                                   (property_id,)).fetchone()
+                if row is None:
+                    return False
+                
+                conn.execute('''
+                    UPDATE property_availability SET bitmap = ?, updated_at = ?
+                    WHERE property_id = ?
+                ''', (set_nights(row[1], row[0], check_in, nights, available), self._timestamp(), property_id))
+                return True
+                
+        except Exception as e:
+            logger.error(f"예약 가능일 변경 중 오류: {str(e)}")
+            return False
+    
+    def get_availability(self, property_id: str) -> Optional[Dict[str, Any]]:
+        """숙소 예약 가능일 조회 (오늘 기준으로 이동한 예약 가능 기간 목록)"""
+        try:
+            with self.pool.reader() as conn:
+                row = conn.execute('''
+                    SELECT start_date, bitmap, updated_at FROM property_availability WHERE property_id = ?
+                ''', (property_id,)).fetchone()
+            if row is None:
+                return None
+            
+            start_date, bitmap, updated_at = row
+            today = date.today()
+            if to_date(start_date) < today:
+                bitmap = rebase(bitmap, start_date, today)
+                start_date = today.isoformat()
+            
+            return self._format_timestamps({
+                'property_id': property_id,
+                'start_date': start_date,
+                'days': AVAILABILITY_DAYS,
+                'available_nights': int.from_bytes(bitmap, 'little').bit_count(),
+                'available_ranges': to_ranges(bitmap, start_date),
+                'updated_at': updated_at
+            })
+            
+        except Exception as e:
+            logger.error(f"예약 가능일 조회 중 오류: {str(e)}")
+            return None
+    
+    def is_property_available(self, property_id: str, check_in: Any, nights: int) -> bool:
+        """숙소가 check_in부터 nights박 연속 예약 가능한지 확인"""
+        try:
+            with self.pool.reader() as conn:
+                row = conn.execute('SELECT start_date, bitmap FROM property_availability WHERE property_id = ?',
+                                   (property_id,)).fetchone()
+            return row is not None and is_available(row[1], row[0], check_in, nights)
+            
+        except Exception as e:
+            logger.error(f"예약 가능 여부 확인 중 오류: {str(e)}")
+            return False
+    
+    def find_available_properties(self, check_in: Any, nights: int, city: str = None, status: str = None,
+                                  amenities: List[str] = None, limit: int = None) -> List[str]:
+        """check_in부터 nights박 연속 예약 가능한 숙소 id 목록 (id순, 비트맵은 NumPy로 일괄 검사)"""
+        try:
+            with self.pool.reader() as conn:
+                where, params = self._property_filters(city, status, None, amenities, conn)
+                # 숙소별 비트맵 시작일 기준 체크인 비트 위치는 SQL에서 계산
+                rows = conn.execute(f'''
+                    SELECT a.property_id, CAST(julianday(?) - julianday(a.start_date) AS INTEGER), a.bitmap
+                    FROM property_availability a
+                    JOIN properties p ON p.id = a.property_id
+                    WHERE {where}
+                    ORDER BY a.property_id
+                ''', [to_date(check_in).isoformat()] + params).fetchall()
+            
+            matches = check_many([row[2] for row in rows], [row[1] for row in rows], nights)
+            property_ids = [row[0] for row, matched in zip(rows, matches) if matched]
+            return property_ids[:limit] if limit else property_ids
+            
+        except Exception as e:
+            logger.error(f"예약 가능 숙소 조회 중 오류: {str(e)}")
+            return []
+    
+    def roll_availability(self, today: Any = None, chunk_size: int = CLEANUP_CHUNK_SIZE) -> int:
+        """시작일이 지난 비트맵을 오늘 기준으로 이동 (청크 단위, 이동한 숙소 수 반환)"""
+        start = to_date(today or date.today())
+        start_date = start.isoformat()
+        rolled = 0
+        after_id = ''
+        
+        try:
+            while True:
+                with self.pool.writer() as conn:
+                    rows = conn.execute('''
+                        SELECT property_id, start_date, bitmap FROM property_availability
+                        WHERE property_id > ? AND start_date < ?
+                        ORDER BY property_id
+                        LIMIT ?
+                    ''', (after_id, start_date, chunk_size)).fetchall()
+                    if not rows:
+                        break
+                    
+                    conn.executemany('''
+                        UPDATE property_availability SET start_date = ?, bitmap = ? WHERE property_id = ?
+                    ''', [(start_date, rebase(bitmap, row_start, start), property_id)
+                          for property_id, row_start, bitmap in rows])
+                
+                rolled += len(rows)
+                after_id = rows[-1][0]
+            
+            logger.info(f"예약 가능일 비트맵 이동 완료: {rolled}개 숙소 ({start_date} 기준)")
+            return rolled
+            
+        except Exception as e:
+            logger.error(f"예약 가능일 비트맵 이동 중 오류: {str(e)}")
+            return rolled
+    
+    def _row_to_property(self, columns: List[str], row: tuple) -> PropertyRecord:
+        """properties 행을 PropertyRecord로 변환"""
+        return self._rows_to_properties(columns, [row])[0]
+    
+    def _rows_to_properties(self, columns: List[str], rows: List[tuple]) -> List[PropertyRecord]:
+        """properties 행 목록을 PropertyRecord 목록으로 변환 (JSON 컬럼은 접근할 때 디코딩)"""
+        index, pending = PropertyRecord.build_index(columns)
+        properties = [PropertyRecord(index, row, pending) for row in rows]
+        if self.epoch_timestamps:
+            for property_data in properties:
+                self._format_timestamps(property_data)
+        return properties
+    
+    @staticmethod
+    def _encode_cursor(property_data: Dict) -> str:
+        """(scraped_at, id) 위치를 불투명 커서 문자열로 인코딩"""
+        raw = json.dumps([property_data['scraped_at'], property_data['id']], ensure_ascii=False)
+        return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+    
+    @staticmethod
+    def _decode_cursor(cursor: str) -> List:
+        """커서 문자열을 (scraped_at, id) 위치로 디코딩"""
+        try:
+            raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+            scraped_at, property_id = json.loads(raw.decode('utf-8'))
+            return [scraped_at, property_id]
+        except Exception:
+            raise ValueError(f"잘못된 커서: {cursor}")
+    
     def get_pending_content(self, limit: int = 50) -> List[Dict]:
         """미게시된 콘텐츠 조회"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self.pool.reader() as conn:
                 cursor = conn.cursor()
                 cursor.execute('''
                     SELECT c.*, p.title, p.city, p.price_per_night, p.rating
                     FROM content c
                     JOIN properties p ON c.property_id = p.id
                     WHERE c.is_posted = 0
+                      AND (c.lease_expires_at IS NULL OR c.lease_expires_at < ?)
                     ORDER BY c.created_at ASC
                     LIMIT ?
-                ''', (limit,))
+                ''', (datetime.now().isoformat(), limit))
                 
                 rows = cursor.fetchall()
                 columns = [description[0] for description in cursor.description]
                 
-                content_list = []
-                for row in rows:
-                    content_data = dict(zip(columns, row))
-                    content_data['content_data'] = json.loads(content_data['content_data'] or '{}')
-                    content_data['property_data'] = {
-                        'id': content_data['property_id'],
-                        'title': content_data['title'],
-                        'city': content_data['city'],
-                        'price_per_night': content_data['price_per_night'],
-                        'rating': content_data['rating']
-                    }
-                    content_list.append(content_data)
-                
-                return content_list
+                return [self._row_to_pending_content(columns, row) for row in rows]
                 
         except Exception as e:
             logger.error(f"미게시 콘텐츠 조회 중 오류: {str(e)}")
             return []
     
-    def mark_content_as_posted(self, content_id: int) -> bool:
-        """콘텐츠를 게시됨으로 표시"""
+    def _row_to_pending_content(self, columns: List[str], row: tuple) -> Dict:
+        """content + properties 조인 행을 게시 대기 콘텐츠 딕셔너리로 변환"""
+        content_data = dict(zip(columns, row))
+        content_data['content_data'] = json.loads(content_data['content_data'] or '{}')
+        content_data['property_data'] = {
+            'id': content_data['property_id'],
+            'title': content_data['title'],
+            'city': content_data['city'],
+            'price_per_night': content_data['price_per_night'],
+            'rating': content_data['rating']
+        }
+        return self._format_timestamps(content_data)
+    
+    def claim_pending_content(self, worker_id: str, limit: int = 10, lease_seconds: int = 300) -> List[Dict]:
+        """미게시 콘텐츠를 원자적으로 임대 (만료된 임대는 다시 가져올 수 있음)"""
+        try:
+            now = datetime.now()
+            expires_at = (now + timedelta(seconds=lease_seconds)).isoformat()
+            
+            with self.pool.writer() as conn:
+                # 선택과 임대 표시를 한 문장으로 수행해 다른 워커/프로세스와 경합하지 않음
+                claimed_ids = [row[0] for row in conn.execute('''
+                    UPDATE content
+                    SET claimed_by = ?, lease_expires_at = ?
+                    WHERE id IN (
+                        SELECT id FROM content
+                        WHERE is_posted = 0
+                          AND (lease_expires_at IS NULL OR lease_expires_at < ?)
+                          AND property_id IN (SELECT id FROM properties)
+                        ORDER BY created_at ASC
+                        LIMIT ?
+                    )
+                    RETURNING id
+                ''', (worker_id, expires_at, now.isoformat(), limit)).fetchall()]
+                
+                if not claimed_ids:
+                    return []
+                
+                placeholders = ','.join('?' * len(claimed_ids))
+                cursor = conn.execute(f'''
+                    SELECT c.*, p.title, p.city, p.price_per_night, p.rating
+                    FROM content c
+                    JOIN properties p ON c.property_id = p.id
+                    WHERE c.id IN ({placeholders})
+                    ORDER BY c.created_at ASC
+                ''', claimed_ids)
+                rows = cursor.fetchall()
+                columns = [description[0] for description in cursor.description]
+                
+            logger.info(f"콘텐츠 임대: {worker_id} - {len(claimed_ids)}개")
+            return [self._row_to_pending_content(columns, row) for row in rows]
+            
+        except Exception as e:
+            logger.error(f"콘텐츠 임대 중 오류: {str(e)}")
+            return []
+    
+    def renew_content_lease(self, worker_id: str, content_ids: List[int], lease_seconds: int = 300) -> int:
+        """보유 중인 콘텐츠 임대 연장 (연장된 개수 반환)"""
+        if not content_ids:
+            return 0
+        
+        try:
+            expires_at = (datetime.now() + timedelta(seconds=lease_seconds)).isoformat()
+            placeholders = ','.join('?' * len(content_ids))
+            
+            with self.pool.writer() as conn:
+                cursor = conn.execute(f'''
+                    UPDATE content
+                    SET lease_expires_at = ?
+                    WHERE claimed_by = ? AND is_posted = 0 AND id IN ({placeholders})
+                ''', [expires_at, worker_id] + list(content_ids))
+                return cursor.rowcount
+                
+        except Exception as e:
+            logger.error(f"콘텐츠 임대 연장 중 오류: {str(e)}")
+            return 0
+    
+    def release_content(self, worker_id: str, content_ids: List[int]) -> int:
+        """게시 실패 등으로 보유 중인 콘텐츠 임대 해제 (해제된 개수 반환)"""
+        if not content_ids:
+            return 0
+        
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            placeholders = ','.join('?' * len(content_ids))
+            
+            with self.pool.writer() as conn:
+                cursor = conn.execute(f'''
+                    UPDATE content
+                    SET claimed_by = NULL, lease_expires_at = NULL
+                    WHERE claimed_by = ? AND id IN ({placeholders})
+                ''', [worker_id] + list(content_ids))
+                return cursor.rowcount
+                
+        except Exception as e:
+            logger.error(f"콘텐츠 임대 해제 중 오류: {str(e)}")
+            return 0
+    
+    def mark_content_as_posted(self, content_id: int, worker_id: str = None) -> bool:
+        """콘텐츠를 게시됨으로 표시 (worker_id 지정 시 해당 워커의 임대만 처리)"""
+        try:
+            with self.pool.writer() as conn:
                 cursor = conn.cursor()
-                cursor.execute('''
+                query = '''
                     UPDATE content 
-                    SET is_posted = 1, posted_at = ?
+                    SET is_posted = 1, posted_at = ?, lease_expires_at = NULL
                     WHERE id = ?
-                ''', (datetime.now().isoformat(), content_id))
+                '''
+                params = [self._timestamp(), content_id]
+                if worker_id is not None:
+                    query += ' AND claimed_by = ?'
+                    params.append(worker_id)
                 
-                conn.commit()
-                return True
+                cursor.execute(query, params)
+                return cursor.rowcount > 0
                 
         except Exception as e:
             logger.error(f"콘텐츠 상태 업데이트 중 오류: {str(e)}")
@@ -338,8 +2827,11 @@ class DatabaseManager:
     def save_posting_history(self, property_id: str, platform: str, post_data: Dict) -> bool:
         """게시 이력 저장"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self.pool.writer() as conn:
                 cursor = conn.cursor()
+                status = 'success' if post_data.get('success', False) else 'failed'
+                now = datetime.now()
+                posted_at = self._timestamp(now)
                 cursor.execute('''
                     INSERT INTO posting_history (
                         property_id, platform, post_id, post_url, status,
@@ -350,33 +2842,39 @@ class DatabaseManager:
                     platform,
                     post_data.get('post_id', ''),
                     post_data.get('url', ''),
-                    'success' if post_data.get('success', False) else 'failed',
+                    status,
                     post_data.get('error', ''),
-                    datetime.now().isoformat(),
+                    posted_at,
                     json.dumps(post_data.get('analytics', {}))
                 ))
                 
-                conn.commit()
+                # 일별 롤업 갱신 (같은 트랜잭션)
+                cursor.execute(POSTING_ROLLUP_UPSERT_SQL, (
+                    self._day_key(now), platform, property_id,
+                    int(status == 'success'), int(status == 'failed')
+                ))
+                
                 return True
                 
         except Exception as e:
             logger.error(f"게시 이력 저장 중 오류: {str(e)}")
             return False
     
-    def get_posting_analytics(self, property_id: str = None, platform: str = None, days: int = 30) -> List[Dict]:
+    def get_posting_analytics(self, property_id: str = None, platform: str = None, days: int = 30,
+                              limit: int = None) -> List[Dict]:
         """게시 분석 데이터 조회"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self.pool.reader() as conn:
                 cursor = conn.cursor()
                 
                 query = '''
                     SELECT ph.*, p.title, p.city
                     FROM posting_history ph
                     JOIN properties p ON ph.property_id = p.id
-                    WHERE ph.posted_at >= datetime('now', '-{} days')
-                '''.format(days)
+                    WHERE ph.posted_at >= ?
+                '''
                 
-                params = []
+                params = [self._since(days)]
                 if property_id:
                     query += ' AND ph.property_id = ?'
                     params.append(property_id)
@@ -387,6 +2885,10 @@ class DatabaseManager:
                 
                 query += ' ORDER BY ph.posted_at DESC'
                 
+                if limit is not None:
+                    query += ' LIMIT ?'
+                    params.append(limit)
+                
                 cursor.execute(query, params)
                 rows = cursor.fetchall()
                 columns = [description[0] for description in cursor.description]
@@ -395,7 +2897,7 @@ class DatabaseManager:
                 for row in rows:
                     data = dict(zip(columns, row))
                     data['analytics_data'] = json.loads(data['analytics_data'] or '{}')
-                    analytics.append(data)
+                    analytics.append(self._format_timestamps(data))
                 
                 return analytics
                 
@@ -403,65 +2905,266 @@ class DatabaseManager:
             logger.error(f"분석 데이터 조회 중 오류: {str(e)}")
             return []
     
+    def iter_posting_history(self, days: int = None, platform: str = None,
+                             batch_size: int = EXPORT_BATCH_SIZE) -> Iterator[Dict]:
+        """게시 이력을 최신순으로 batch_size행씩 읽어 하나씩 반환 (내보내기용, 메모리 사용량 일정)
+        
+        (posted_at, id) 키셋으로 배치마다 읽기 커넥션을 빌렸다 반납하므로,
+        느린 스트리밍 소비자가 있어도 배치 사이에는 커넥션을 점유하지 않음
+        """
+        conditions = ['1 = 1']
+        params = []
+        if days is not None:
+            conditions.append('ph.posted_at >= ?')
+            params.append(self._since(days))
+        if platform:
+            conditions.append('ph.platform = ?')
+            params.append(platform)
+        
+        last_key = None
+        while True:
+            page_conditions = list(conditions)
+            page_params = list(params)
+            if last_key is not None:
+                page_conditions.append('(ph.posted_at, ph.id) < (?, ?)')
+                page_params.extend(last_key)
+            
+            with self.pool.reader() as conn:
+                cursor = conn.execute(f'''
+                    SELECT {', '.join(POSTING_EXPORT_COLUMNS)}
+                    FROM posting_history ph
+                    JOIN properties p ON ph.property_id = p.id
+                    WHERE {' AND '.join(page_conditions)}
+                    ORDER BY ph.posted_at DESC, ph.id DESC
+                    LIMIT ?
+                ''', page_params + [batch_size])
+                columns = [description[0] for description in cursor.description]
+                rows = cursor.fetchall()
+            
+            if not rows:
+                break
+            # 다음 배치 키는 타임스탬프 변환 전 원본 값
+            last_key = (rows[-1][columns.index('posted_at')], rows[-1][columns.index('id')])
+            for row in rows:
+                yield self._format_timestamps(dict(zip(columns, row)))
+            if len(rows) < batch_size:
+                break
+    
+    def iter_table_batches(self, table: str, after: List = None,
+                           batch_size: int = EXPORT_BATCH_SIZE) -> Iterator[Tuple[List[str], List[tuple]]]:
+        """테이블 원본 행을 워터마크 키 순서로 (컬럼 목록, 행 배치) 단위로 반환
+        
+        after에 마지막으로 내보낸 키 값(EXPORT_TABLE_KEYS 순서)을 주면 그 이후 행만 조회하며,
+        배치마다 같은 키셋 조건으로 읽기 커넥션을 빌렸다 반납 (파일 쓰는 동안 커넥션을 점유하지 않음)
+        """
+        if table not in EXPORT_TABLE_KEYS:
+            raise ValueError(f"내보낼 수 없는 테이블: {table}")
+        
+        keys = EXPORT_TABLE_KEYS[table]
+        while True:
+            query = f'SELECT * FROM {table}'
+            params = []
+            if after:
+                query += ' WHERE ({}) > ({})'.format(', '.join(keys), ', '.join('?' * len(keys)))
+                params = list(after)
+            query += ' ORDER BY ' + ', '.join(keys) + ' LIMIT ?'
+            
+            with self.pool.reader() as conn:
+                cursor = conn.execute(query, params + [batch_size])
+                columns = [description[0] for description in cursor.description]
+                rows = cursor.fetchall()
+            
+            if not rows:
+                break
+            yield columns, rows
+            if len(rows) < batch_size:
+                break
+            after = [rows[-1][columns.index(key)] for key in keys]
+    
+    def aggregate_postings(self, group_by: List[str] = None, days: int = 30,
+                           filters: Dict[str, Any] = None, use_rollup: bool = True) -> List[Dict]:
+        """게시 이력 집계 (group_by: day/week/platform/property/status)
+        
+        각 행은 그룹 키와 posts(전체), success, failed 건수를 포함.
+        status 기준이 없으면 일별 롤업 테이블에서 일 단위 기간으로 집계
+        """
+        group_by = group_by or []
+        filters = filters or {}
+        
+        unknown = [g for g in group_by if g not in POSTING_GROUP_COLUMNS]
+        if unknown:
+            raise ValueError(f"지원하지 않는 집계 기준: {', '.join(unknown)}")
+        
+        # 일 단위 집계로 충분하면 롤업 테이블 사용
+        if use_rollup and 'status' not in group_by and filters.get('status') is None:
+            return self._aggregate_posting_rollup(group_by, days, filters)
+        
+        try:
+            with self.pool.reader() as conn:
+                select_columns = []
+                group_expressions = []
+                day = _day_expression('ph.posted_at', self.epoch_timestamps)
+                for group in group_by:
+                    key, expression = POSTING_GROUP_COLUMNS[group]
+                    expression = expression.format(day=day)
+                    select_columns.append(f'{expression} AS {key}')
+                    group_expressions.append(expression)
+                
+                # 롤업 경로와 같이 삭제된 숙소의 이력도 집계 (숙소 정보는 있을 때만 붙임)
+                join = ''
+                if 'property' in group_by:
+                    select_columns.extend(['MAX(p.title) AS title', 'MAX(p.city) AS city'])
+                    join = 'LEFT JOIN properties p ON ph.property_id = p.id'
+                
+                group_select = ''.join(f'{column}, ' for column in select_columns)
+                query = f'''
+                    SELECT {group_select}
+                           COUNT(*) AS posts,
+                           COALESCE(SUM(ph.status = 'success'), 0) AS success,
+                           COALESCE(SUM(ph.status = 'failed'), 0) AS failed
+                    FROM posting_history ph
+                    {join}
+                    WHERE ph.posted_at >= ?
+                '''
+                params = [self._since(days)]
+                
+                for column in ('property_id', 'platform', 'status'):
+                    if filters.get(column) is not None:
+                        query += f' AND ph.{column} = ?'
+                        params.append(filters[column])
+                
+                if group_expressions:
+                    query += ' GROUP BY ' + ', '.join(group_expressions)
+                    query += ' ORDER BY ' + ', '.join(group_expressions)
+                
+                cursor = conn.execute(query, params)
+                columns = [description[0] for description in cursor.description]
+                return [dict(zip(columns, row)) for row in cursor.fetchall()]
+                
+        except Exception as e:
+            logger.error(f"게시 이력 집계 중 오류: {str(e)}")
+            return []
+    
     def save_conversion_tracking(self, property_id: str, platform: str, tracking_url: str) -> bool:
         """전환 추적 데이터 저장"""
+        return self.save_tracking_link(property_id, platform, tracking_url) is not None
+    
+    def save_tracking_link(self, property_id: str, platform: str, tracking_url: str) -> Optional[int]:
+        """추적 링크 저장 후 전환 추적 ID 반환 (단축 코드 발급용)"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                
-                # 기존 추적 데이터 확인
-                cursor.execute('''
-                    SELECT id FROM conversions 
-                    WHERE property_id = ? AND platform = ?
-                ''', (property_id, platform))
+            with self.pool.writer() as conn:
+                now = self._timestamp()
+                conn.execute('''
+                    INSERT INTO conversions (property_id, platform, tracking_url, created_at, last_updated)
+                    VALUES (?, ?, ?, ?, ?)
+                    ON CONFLICT(property_id, platform) DO UPDATE SET
+                        tracking_url = excluded.tracking_url,
+                        last_updated = excluded.last_updated
+                ''', (property_id, platform, tracking_url, now, now))
                 
-                existing = cursor.fetchone()
+                row = conn.execute(
+                    'SELECT id FROM conversions WHERE property_id = ? AND platform = ?',
+                    (property_id, platform)
+                ).fetchone()
+                return row[0]
                 
-                if existing:
-                    # 업데이트
-                    cursor.execute('''
-                        UPDATE conversions 
-                        SET tracking_url = ?, last_updated = ?
-                        WHERE property_id = ? AND platform = ?
-                    ''', (tracking_url, datetime.now().isoformat(), property_id, platform))
-                else:
-                    # 새로 삽입
-                    cursor.execute('''
-                        INSERT INTO conversions (property_id, platform, tracking_url, created_at, last_updated)
-                        VALUES (?, ?, ?, ?, ?)
-                    ''', (property_id, platform, tracking_url, datetime.now().isoformat(), datetime.now().isoformat()))
+        except Exception as e:
+            logger.error(f"추적 링크 저장 중 오류: {str(e)}")
+            return None
+    
+    def get_tracking_link(self, conversion_id: int) -> Optional[Tuple[str, str, str]]:
+        """전환 추적 ID로 (property_id, platform, tracking_url) 조회"""
+        try:
+            with self.pool.reader() as conn:
+                row = conn.execute('''
+                    SELECT property_id, platform, tracking_url FROM conversions
+                    WHERE id = ? AND tracking_url IS NOT NULL
+                ''', (conversion_id,)).fetchone()
+                return tuple(row) if row else None
                 
-                conn.commit()
-                return True
+        except Exception as e:
+            logger.error(f"추적 링크 조회 중 오류: {str(e)}")
+            return None
+    
+    def get_tracking_links(self) -> List[Tuple[int, str, str, str]]:
+        """모든 추적 링크 조회 (id, property_id, platform, tracking_url)"""
+        try:
+            with self.pool.reader() as conn:
+                return conn.execute('''
+                    SELECT id, property_id, platform, tracking_url FROM conversions
+                    WHERE tracking_url IS NOT NULL
+                ''').fetchall()
                 
         except Exception as e:
-            logger.error(f"전환 추적 데이터 저장 중 오류: {str(e)}")
-            return False
+            logger.error(f"추적 링크 목록 조회 중 오류: {str(e)}")
+            return []
     
     def update_conversion_stats(self, property_id: str, platform: str, click_count: int = 0, conversion_count: int = 0) -> bool:
         """전환 통계 업데이트"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self.pool.writer() as conn:
                 cursor = conn.cursor()
+                now = datetime.now()
                 cursor.execute('''
                     UPDATE conversions 
                     SET click_count = click_count + ?, 
                         conversion_count = conversion_count + ?,
                         last_updated = ?
                     WHERE property_id = ? AND platform = ?
-                ''', (click_count, conversion_count, datetime.now().isoformat(), property_id, platform))
+                ''', (click_count, conversion_count, self._timestamp(now), property_id, platform))
+                
+                # 추적 중인 전환에 한해 일별 롤업 갱신 (같은 트랜잭션)
+                if cursor.rowcount > 0:
+                    cursor.execute(CONVERSION_ROLLUP_UPSERT_SQL, (
+                        self._day_key(now), platform, property_id, click_count, conversion_count
+                    ))
                 
-                conn.commit()
                 return True
                 
         except Exception as e:
             logger.error(f"전환 통계 업데이트 중 오류: {str(e)}")
             return False
     
+    def record_conversion(self, property_id: str, platform: str, click_count: int = 1, conversion_count: int = 0):
+        """전환 통계 증가분을 버퍼에 기록 (주기적으로 일괄 반영)"""
+        self.conversion_buffer.add(property_id, platform, click_count, conversion_count)
+    
+    def _apply_conversion_increments(self, increments: Dict[Tuple[str, str], List[int]]) -> bool:
+        """버퍼링된 전환 증가분을 한 트랜잭션으로 일괄 UPSERT"""
+        try:
+            now = datetime.now()
+            timestamp = self._timestamp(now)
+            rows = [
+                (property_id, platform, clicks, conversions)
+                for (property_id, platform), (clicks, conversions) in increments.items()
+            ]
+            
+            with self.pool.writer() as conn:
+                conn.executemany('''
+                    INSERT INTO conversions (property_id, platform, click_count, conversion_count, created_at, last_updated)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(property_id, platform) DO UPDATE SET
+                        click_count = click_count + excluded.click_count,
+                        conversion_count = conversion_count + excluded.conversion_count,
+                        last_updated = excluded.last_updated
+                ''', [row + (timestamp, timestamp) for row in rows])
+                
+                day = self._day_key(now)
+                conn.executemany(CONVERSION_ROLLUP_UPSERT_SQL, [
+                    (day, platform, property_id, clicks, conversions)
+                    for property_id, platform, clicks, conversions in rows
+                ])
+            
+            return True
+            
+        except Exception as e:
+            logger.error(f"전환 증가분 일괄 반영 중 오류: {str(e)}")
+            return False
+    
     def get_conversion_stats(self, property_id: str = None) -> List[Dict]:
         """전환 통계 조회"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self.pool.reader() as conn:
                 cursor = conn.cursor()
                 
                 query = '''
@@ -483,7 +3186,7 @@ class DatabaseManager:
                 
                 stats = []
                 for row in rows:
-                    stats.append(dict(zip(columns, row)))
+                    stats.append(self._format_timestamps(dict(zip(columns, row))))
                 
                 return stats
                 
@@ -491,29 +3194,221 @@ class DatabaseManager:
             logger.error(f"전환 통계 조회 중 오류: {str(e)}")
             return []
     
-    def cleanup_old_data(self, days: int = 90) -> bool:
-        """오래된 데이터 정리"""
+    def _aggregate_posting_rollup(self, group_by: List[str], days: int, filters: Dict[str, Any]) -> List[Dict]:
+        """posting_daily_rollup 기반 게시 집계"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
+            with self.pool.reader() as conn:
+                select_columns = []
+                group_expressions = []
+                for group in group_by:
+                    key, expression = POSTING_ROLLUP_GROUP_COLUMNS[group]
+                    select_columns.append(f'{expression} AS {key}')
+                    group_expressions.append(expression)
                 
-                # 오래된 게시 이력 삭제
-                cursor.execute('''
-                    DELETE FROM posting_history 
-                    WHERE posted_at < datetime('now', '-{} days')
-                '''.format(days))
+                join = ''
+                if 'property' in group_by:
+                    select_columns.extend(['MAX(p.title) AS title', 'MAX(p.city) AS city'])
+                    join = 'LEFT JOIN properties p ON r.property_id = p.id'
                 
-                # 비활성 숙소 정리
-                cursor.execute('''
-                    UPDATE properties 
-                    SET is_active = 0 
-                    WHERE scraped_at < datetime('now', '-{} days')
-                '''.format(days))
+                group_select = ''.join(f'{column}, ' for column in select_columns)
+                query = f'''
+                    SELECT {group_select}
+                           COALESCE(SUM(r.posts), 0) AS posts,
+                           COALESCE(SUM(r.success), 0) AS success,
+                           COALESCE(SUM(r.failed), 0) AS failed
+                    FROM posting_daily_rollup r
+                    {join}
+                    WHERE r.date >= ?
+                '''
+                params = [self._since_day(days)]
                 
-                conn.commit()
-                logger.info(f"{days}일 이전 데이터 정리 완료")
-                return True
+                for column in ('property_id', 'platform'):
+                    if filters.get(column) is not None:
+                        query += f' AND r.{column} = ?'
+                        params.append(filters[column])
+                
+                if group_expressions:
+                    query += ' GROUP BY ' + ', '.join(group_expressions)
+                    query += ' ORDER BY ' + ', '.join(group_expressions)
+                
+                cursor = conn.execute(query, params)
+                columns = [description[0] for description in cursor.description]
+                return [dict(zip(columns, row)) for row in cursor.fetchall()]
+                
+        except Exception as e:
+            logger.error(f"게시 롤업 집계 중 오류: {str(e)}")
+            return []
+    
+    def rebuild_rollups(self) -> bool:
+        """일별 롤업 테이블을 원본 데이터로 다시 채우기 (백필)"""
+        try:
+            with self.pool.writer() as conn:
+                _backfill_rollups(conn.cursor(), epoch_ms=self.epoch_timestamps)
+            logger.info("일별 롤업 재계산 완료")
+            return True
+            
+        except Exception as e:
+            logger.error(f"일별 롤업 재계산 중 오류: {str(e)}")
+            return False
+    
+    def get_conversion_totals(self, property_id: str = None, days: int = None) -> Dict[str, int]:
+        """전환 통계 합계 조회 (클릭 수, 전환 수, days 지정 시 일별 롤업 기준 기간 합계)"""
+        try:
+            with self.pool.reader() as conn:
+                if days is not None:
+                    query = '''
+                        SELECT COALESCE(SUM(clicks), 0), COALESCE(SUM(conversions), 0)
+                        FROM conversion_daily_rollup
+                        WHERE date >= ?
+                    '''
+                    params = [self._since_day(days)]
+                    if property_id:
+                        query += ' AND property_id = ?'
+                        params.append(property_id)
+                    
+                    clicks, conversions = conn.execute(query, params).fetchone()
+                    return {'clicks': clicks, 'conversions': conversions}
+                
+                query = '''
+                    SELECT COALESCE(SUM(c.click_count), 0), COALESCE(SUM(c.conversion_count), 0)
+                    FROM conversions c
+                    JOIN properties p ON c.property_id = p.id
+                '''
+                params = []
+                if property_id:
+                    query += ' WHERE c.property_id = ?'
+                    params.append(property_id)
+                
+                clicks, conversions = conn.execute(query, params).fetchone()
+                return {'clicks': clicks, 'conversions': conversions}
+                
+        except Exception as e:
+            logger.error(f"전환 통계 합계 조회 중 오류: {str(e)}")
+            return {'clicks': 0, 'conversions': 0}
+    
+    def cleanup_old_data(self, days: int = 90, chunk_size: int = CLEANUP_CHUNK_SIZE,
+                         archive_path: str = None, vacuum_passes: int = 10,
+                         progress_callback: Callable[[Dict[str, int]], None] = None) -> bool:
+        """오래된 데이터 정리
+        
+        청크당 한 트랜잭션으로 나눠 처리하고 청크 사이에 쓰기 락을 놓아 다른 요청이 끼어들 수 있게 함.
+        archive_path를 지정하면 삭제되는 게시 이력을 gzip NDJSON 파일에 추가한 뒤 커밋하고,
+        마지막으로 최대 vacuum_passes회의 incremental_vacuum으로 빈 페이지를 반환
+        """
+        progress = {'deleted': 0, 'deactivated': 0, 'archived': 0, 'vacuumed_pages': 0}
+        cutoff = self._since(days)
+        
+        try:
+            archive = gzip.open(archive_path, 'at', encoding='utf-8') if archive_path else None
+            try:
+                # 오래된 게시 이력 삭제
+                while True:
+                    with self.pool.writer() as conn:
+                        cursor = conn.execute('''
+                            DELETE FROM posting_history
+                            WHERE id IN (
+                                SELECT id FROM posting_history
+                                WHERE posted_at < ?
+                                LIMIT ?
+                            )
+                            RETURNING *
+                        ''', (cutoff, chunk_size))
+                        rows = cursor.fetchall()
+                        
+                        if archive is not None and rows:
+                            columns = [description[0] for description in cursor.description]
+                            for row in rows:
+                                archive.write(json.dumps(self._format_timestamps(dict(zip(columns, row))),
+                                                         ensure_ascii=False) + '\n')
+                            archive.flush()
+                            progress['archived'] += len(rows)
+                    
+                    if not rows:
+                        break
+                    progress['deleted'] += len(rows)
+                    self._report_cleanup_progress(progress, progress_callback)
+                    time.sleep(CLEANUP_CHUNK_PAUSE)
+            finally:
+                if archive is not None:
+                    archive.close()
+            
+            # 비활성 숙소 정리
+            while True:
+                with self.pool.writer() as conn:
+                    updated = conn.execute('''
+                        UPDATE properties
+                        SET is_active = 0
+                        WHERE rowid IN (
+                            SELECT rowid FROM properties
+                            WHERE is_active = 1 AND scraped_at < ?
+                            LIMIT ?
+                        )
+                    ''', (cutoff, chunk_size)).rowcount
+                
+                if not updated:
+                    break
+                progress['deactivated'] += updated
+                self._report_cleanup_progress(progress, progress_callback)
+                time.sleep(CLEANUP_CHUNK_PAUSE)
+            
+            progress['vacuumed_pages'] = self.incremental_vacuum(max_passes=vacuum_passes)
+            self._report_cleanup_progress(progress, progress_callback)
+            
+            logger.info(f"{days}일 이전 데이터 정리 완료: {progress}")
+            return True
                 
         except Exception as e:
             logger.error(f"데이터 정리 중 오류: {str(e)}")
             return False
+    
+    @staticmethod
+    def _report_cleanup_progress(progress: Dict[str, int], progress_callback: Callable = None):
+        """데이터 정리 진행 상황 기록"""
+        logger.info(f"데이터 정리 진행: {progress}")
+        if progress_callback:
+            progress_callback(dict(progress))
+    
+    def incremental_vacuum(self, pages_per_pass: int = VACUUM_PAGES_PER_PASS, max_passes: int = 10) -> int:
+        """빈 페이지를 pages_per_pass씩 최대 max_passes회 반환 (auto_vacuum=INCREMENTAL DB에서만 동작)"""
+        reclaimed = 0
+        
+        # 읽기 커넥션은 열린 시점의 auto_vacuum 값을 유지하므로 쓰기 커넥션으로 확인
+        with self.pool.writer() as conn:
+            if conn.execute('PRAGMA auto_vacuum').fetchone()[0] != 2:
+                logger.info("auto_vacuum=INCREMENTAL이 아니어서 incremental_vacuum을 건너뜁니다")
+                return 0
+        
+        for _ in range(max_passes):
+            with self.pool.writer() as conn:
+                free_pages = conn.execute('PRAGMA freelist_count').fetchone()[0]
+                if free_pages == 0:
+                    break
+                # execute()는 한 단계(한 페이지)만 실행하므로 페이지 수만큼 반복
+                # (executescript는 바깥 writer()의 트랜잭션을 먼저 커밋하므로 사용하지 않음)
+                for _ in range(min(free_pages, int(pages_per_pass))):
+                    conn.execute('PRAGMA incremental_vacuum(1)')
+                reclaimed += free_pages - conn.execute('PRAGMA freelist_count').fetchone()[0]
+            time.sleep(CLEANUP_CHUNK_PAUSE)
+        
+        return reclaimed
+    
+    def enable_incremental_vacuum(self) -> bool:
+        """기존 DB를 auto_vacuum=INCREMENTAL로 전환 (전체 VACUUM을 수행하므로 한가한 시간에 1회 실행)"""
+        # VACUUM은 트랜잭션 안에서 실행할 수 없고, 바깥 writer()의 트랜잭션을 대신 커밋하면 롤백이 깨짐
+        if self.pool.write_depth:
+            logger.error("auto_vacuum 전환은 쓰기 트랜잭션 밖에서 실행해야 합니다")
+            return False
+        
+        try:
+            with self.pool.writer() as conn:
+                if conn.execute('PRAGMA auto_vacuum').fetchone()[0] == 2:
+                    return True
+                conn.execute('PRAGMA auto_vacuum = INCREMENTAL')
+                conn.execute('VACUUM')
+            
+            logger.info("auto_vacuum=INCREMENTAL 전환 완료")
+            return True
+            
+        except Exception as e:
+            logger.error(f"auto_vacuum 전환 중 오류: {str(e)}")
+            return False
@@ -0,0 +1,321 @@
+"""
+데이터 내보내기 모듈
+DatabaseManager의 행 제너레이터를 CSV/NDJSON/JSON 바이트 스트림으로 변환하거나,
+테이블을 Parquet/Arrow IPC 파일로 내보내기
+"""
+
+import io
+import os
+import csv
+import json
+import zlib
+import logging
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List
+
+logger = logging.getLogger(__name__)
+
+# 스트림으로 내보낼 때 한 번에 모아서 내보낼 행 수
+STREAM_CHUNK_ROWS = 500
+
+EXPORT_MEDIA_TYPES = {
+    'csv': 'text/csv; charset=utf-8',
+    'ndjson': 'application/x-ndjson',
+    'json': 'application/json',
+}
+
+def iter_csv(rows: Iterable[Dict], columns: List[str], chunk_rows: int = STREAM_CHUNK_ROWS) -> Iterator[bytes]:
+    """행 딕셔너리를 CSV 바이트 청크로 변환 (헤더 포함, csv 모듈로 이스케이프)"""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=columns, extrasaction='ignore', lineterminator='\n')
+    writer.writeheader()
+    
+    # 헤더는 바로 내보내 첫 바이트가 지연되지 않도록 함
+    yield buffer.getvalue().encode('utf-8')
+    buffer.seek(0)
+    buffer.truncate()
+    
+    count = 0
+    for row in rows:
+        writer.writerow(row)
+        count += 1
+        if count % chunk_rows == 0:
+            yield buffer.getvalue().encode('utf-8')
+            buffer.seek(0)
+            buffer.truncate()
+    
+    if buffer.tell():
+        yield buffer.getvalue().encode('utf-8')
+
+def iter_ndjson(rows: Iterable[Dict], chunk_rows: int = STREAM_CHUNK_ROWS) -> Iterator[bytes]:
+    """행 딕셔너리를 줄 단위 JSON(NDJSON) 바이트 청크로 변환"""
+    lines = []
+    for row in rows:
+        lines.append(json.dumps(row, ensure_ascii=False, default=str))
+        if len(lines) >= chunk_rows:
+            yield ('\n'.join(lines) + '\n').encode('utf-8')
+            lines = []
+    
+    if lines:
+        yield ('\n'.join(lines) + '\n').encode('utf-8')
+
+def iter_json_array(rows: Iterable[Dict], chunk_rows: int = STREAM_CHUNK_ROWS) -> Iterator[bytes]:
+    """행 딕셔너리를 하나의 JSON 배열 바이트 청크로 변환"""
+    yield b'['
+    first = True
+    lines = []
+    for row in rows:
+        lines.append(json.dumps(row, ensure_ascii=False, default=str))
+        if len(lines) >= chunk_rows:
+            yield (('' if first else ',') + ','.join(lines)).encode('utf-8')
+            first = False
+            lines = []
+    
+    if lines:
+        yield (('' if first else ',') + ','.join(lines)).encode('utf-8')
+    yield b']'
+
+def iter_json_document(rows: Iterable[Dict], chunk_rows: int = STREAM_CHUNK_ROWS) -> Iterator[bytes]:
+    """행 딕셔너리를 기존 JSON 내보내기 응답 형태({"data": [...], "exported_at": ..., "format": "json"})로 변환"""
+    exported_at = datetime.now().isoformat()
+    yield b'{"data": '
+    yield from iter_json_array(rows, chunk_rows)
+    yield f', "exported_at": {json.dumps(exported_at)}, "format": "json"}}'.encode('utf-8')
+
+def iter_gzip(chunks: Iterable[bytes], level: int = 6) -> Iterator[bytes]:
+    """바이트 청크를 gzip 스트림으로 압축"""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+def iter_export(rows: Iterable[Dict], columns: List[str], format: str = 'json',
+                compress: bool = False) -> Iterator[bytes]:
+    """형식(json/csv/ndjson)과 압축 여부에 맞는 바이트 스트림 생성 (json은 data/exported_at/format 객체)"""
+    if format == 'csv':
+        chunks = iter_csv(rows, columns)
+    elif format == 'ndjson':
+        chunks = iter_ndjson(rows)
+    elif format == 'json':
+        chunks = iter_json_document(rows)
+    else:
+        raise ValueError(f"지원하지 않는 내보내기 형식: {format}")
+    
+    return iter_gzip(chunks) if compress else chunks
+
+# 테이블 내보내기 컬럼 타입 (목록에 없는 컬럼은 값으로 추론)
+ARROW_COLUMN_TYPES = {
+    'posting_history': {
+        'id': 'int64', 'property_id': 'string', 'platform': 'string', 'post_id': 'string',
+        'post_url': 'string', 'status': 'string', 'error_message': 'string',
+        'posted_at': 'timestamp', 'analytics_data': 'string',
+    },
+    'properties': {
+        'id': 'string', 'title': 'string', 'description': 'string', 'city': 'string',
+        'latitude': 'float64', 'longitude': 'float64', 'price_per_night': 'int64',
+        'property_type': 'string', 'max_guests': 'int64', 'bedrooms': 'int64', 'bathrooms': 'int64',
+        'amenities': 'string', 'rating': 'float64', 'review_count': 'int64', 'host_name': 'string',
+        'host_rating': 'float64', 'images': 'string', 'availability': 'string', 'booking_url': 'string',
+        'created_at': 'timestamp', 'scraped_at': 'timestamp', 'is_active': 'bool_',
+        'data_version': 'int64', 'content_version': 'int64', 'amenity_mask': 'int64',
+    },
+}
+
+# 날짜 파티션 기준 컬럼
+PARTITION_DATE_COLUMNS = {
+    'posting_history': 'posted_at',
+    'properties': 'scraped_at',
+}
+
+COLUMNAR_FORMATS = {
+    'parquet': 'parquet',
+    'arrow': 'ipc',
+}
+
+ROW_GROUP_SIZE = 50000
+
+# 한 번의 내보내기에서 허용하는 최대 파티션 수 (pyarrow 기본값 1024는 날짜 x 플랫폼에 부족)
+MAX_PARTITIONS = 100000
+
+def _require_pyarrow():
+    """pyarrow 지연 로드 (Parquet/Arrow 내보내기에서만 필요)"""
+    try:
+        import pyarrow
+        import pyarrow.compute
+        import pyarrow.dataset
+    except ImportError:
+        raise RuntimeError("Parquet/Arrow 내보내기에는 pyarrow가 필요합니다: pip install pyarrow")
+    return pyarrow
+
+def _arrow_type(pa, spec: str, epoch_timestamps: bool):
+    """타입 이름을 pyarrow 타입으로 변환"""
+    if spec == 'timestamp':
+        # epoch 밀리초는 UTC, ISO 문자열은 로컬 시각(naive)
+        return pa.timestamp('ms', tz='UTC') if epoch_timestamps else pa.timestamp('us')
+    return getattr(pa, spec)()
+
+def _arrow_column(pa, values: list, arrow_type):
+    """파이썬 값 목록을 지정 타입의 Arrow 배열로 변환"""
+    if pa.types.is_timestamp(arrow_type):
+        if arrow_type.tz is not None:
+            return pa.array(values, pa.int64()).cast(arrow_type)
+        try:
+            return pa.array(values, pa.string()).cast(arrow_type)
+        except pa.ArrowInvalid:
+            # 형식이 어긋난 값은 null로 처리
+            parsed = []
+            for value in values:
+                try:
+                    parsed.append(datetime.fromisoformat(value) if value else None)
+                except (TypeError, ValueError):
+                    parsed.append(None)
+            return pa.array(parsed, arrow_type)
+    if pa.types.is_boolean(arrow_type):
+        # SQLite는 불리언을 0/1 정수로 저장
+        values = [None if value is None else bool(value) for value in values]
+    return pa.array(values, arrow_type)
+
+def export_table(db_manager, table: str, output_dir: str, format: str = 'parquet',
+                 partition_by: List[str] = None, incremental: bool = False,
+                 row_group_size: int = ROW_GROUP_SIZE) -> Dict:
+    """테이블을 컬럼 타입이 있는 Parquet/Arrow IPC 파일로 내보내기
+    
+    DatabaseManager 커서에서 row_group_size행씩 RecordBatch로 변환해 바로 기록하며,
+    partition_by(date/platform)를 주면 hive 형식 디렉터리로 나누고,
+    incremental이면 지난 실행의 워터마크 이후 행만 내보낸 뒤 워터마크를 갱신
+    """
+    pa = _require_pyarrow()
+    import pyarrow.compute as pc
+    import pyarrow.dataset as ds
+    
+    if table not in ARROW_COLUMN_TYPES:
+        raise ValueError(f"내보낼 수 없는 테이블: {table}")
+    if format not in COLUMNAR_FORMATS:
+        raise ValueError(f"지원하지 않는 내보내기 형식: {format}")
+    
+    partition_by = list(partition_by or [])
+    for partition in partition_by:
+        if partition not in ('date', 'platform'):
+            raise ValueError(f"지원하지 않는 파티션 기준: {partition}")
+        if partition == 'platform' and table != 'posting_history':
+            raise ValueError("platform 파티션은 posting_history에서만 사용할 수 있습니다")
+    
+    from .database import EXPORT_TABLE_KEYS
+    
+    output_dir = os.path.abspath(output_dir)
+    watermark_key = f"export_watermark:{table}:{format}:{output_dir}"
+    after = db_manager.get_meta(watermark_key) if incremental else None
+    
+    batches = db_manager.iter_table_batches(table, after=after)
+    first = next(batches, None)
+    if first is None:
+        return {'table': table, 'rows': 0, 'files': [], 'watermark': after, 'output_dir': output_dir}
+    
+    columns = first[0]
+    column_types = ARROW_COLUMN_TYPES[table]
+    key_indexes = [columns.index(key) for key in EXPORT_TABLE_KEYS[table]]
+    epoch_timestamps = db_manager.epoch_timestamps
+    
+    fields = []
+    for index, column in enumerate(columns):
+        if column in column_types:
+            arrow_type = _arrow_type(pa, column_types[column], epoch_timestamps)
+        else:
+            arrow_type = pa.array([row[index] for row in first[1]]).type
+            if pa.types.is_null(arrow_type):
+                arrow_type = pa.string()
+        fields.append(pa.field(column, arrow_type))
+    schema = pa.schema(fields)
+    if 'date' in partition_by:
+        schema = schema.append(pa.field('date', pa.string()))
+    
+    state = {'rows': 0, 'last_key': None}
+    
+    def to_batch(rows: list):
+        arrays = [
+            _arrow_column(pa, list(values), field.type)
+            for values, field in zip(zip(*rows), fields)
+        ]
+        if 'date' in partition_by:
+            date_column = arrays[columns.index(PARTITION_DATE_COLUMNS[table])]
+            arrays.append(pc.strftime(date_column, format='%Y-%m-%d'))
+        state['rows'] += len(rows)
+        state['last_key'] = [rows[-1][index] for index in key_indexes]
+        return pa.RecordBatch.from_arrays(arrays, schema=schema)
+    
+    def record_batches():
+        pending = list(first[1])
+        for _, rows in batches:
+            pending.extend(rows)
+            if len(pending) >= row_group_size:
+                yield to_batch(pending[:row_group_size])
+                pending = pending[row_group_size:]
+        if pending:
+            yield to_batch(pending)
+    
+    files = []
+    extension = 'parquet' if format == 'parquet' else 'arrow'
+    run_id = datetime.now().strftime('%Y%m%d%H%M%S%f')
+    ds.write_dataset(
+        record_batches(),
+        output_dir,
+        schema=schema,
+        format=COLUMNAR_FORMATS[format],
+        partitioning=partition_by or None,
+        partitioning_flavor='hive' if partition_by else None,
+        basename_template=f"{table}-{run_id}-{{i}}.{extension}",
+        existing_data_behavior='overwrite_or_ignore',
+        max_rows_per_group=row_group_size,
+        min_rows_per_group=min(row_group_size, 1024),
+        max_partitions=MAX_PARTITIONS,
+        file_visitor=lambda written: files.append(written.path),
+    )
+    
+    if incremental and state['last_key'] is not None:
+        db_manager.set_meta(watermark_key, state['last_key'])
+    
+    result = {
+        'table': table,
+        'rows': state['rows'],
+        'files': files,
+        'watermark': state['last_key'],
+        'output_dir': output_dir
+    }
+    logger.info(f"테이블 내보내기 완료: {table} {state['rows']}행, 파일 {len(files)}개")
+    return result
+
+def main():
+    """명령행 내보내기 (예: python -m src.exporter posting_history data/exports --partition-by date platform --incremental)"""
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="게시 이력/숙소 데이터를 Parquet 또는 Arrow IPC로 내보내기")
+    parser.add_argument('table', choices=sorted(ARROW_COLUMN_TYPES))
+    parser.add_argument('output_dir')
+    parser.add_argument('--format', choices=sorted(COLUMNAR_FORMATS), default='parquet')
+    parser.add_argument('--partition-by', nargs='*', choices=['date', 'platform'], default=[])
+    parser.add_argument('--incremental', action='store_true', help="지난 실행 이후 추가된 행만 내보내기")
+    parser.add_argument('--row-group-size', type=int, default=ROW_GROUP_SIZE)
+    parser.add_argument('--db', default='airbnb_marketing.db')
+    args = parser.parse_args()
+    
+    logging.basicConfig(level=logging.INFO)
+    
+    from .database import DatabaseManager
+    
+    db_manager = DatabaseManager(args.db)
+    try:
+        result = export_table(
+            db_manager, args.table, args.output_dir, format=args.format,
+            partition_by=args.partition_by, incremental=args.incremental,
+            row_group_size=args.row_group_size
+        )
+        print(json.dumps({key: value for key, value in result.items() if key != 'files'}, ensure_ascii=False))
+        for path in result['files']:
+            print(path)
+    finally:
+        db_manager.close()
+
+if __name__ == "__main__":
+    main()
@@ -13,14 +13,25 @@ import os
 
 logger = logging.getLogger(__name__)
 
+# 게시할 콘텐츠 임대 시간(초) (게시 직전마다 연장하므로 한 건 게시 시간보다 길면 충분)
+CONTENT_LEASE_SECONDS = 300
+
 class MarketingScheduler:
     """마케팅 스케줄러 클래스"""
     
-    def __init__(self):
+    def __init__(self, db_manager=None):
         """초기화"""
         self.is_running = False
         self.scheduler_thread = None
         self.posting_schedule = self._parse_posting_schedule()
+        self.db_manager = db_manager
+    
+    def _get_db_manager(self):
+        """공유 데이터베이스 매니저 반환 (없으면 한 번만 생성)"""
+        if self.db_manager is None:
+            from .database import DatabaseManager
+            self.db_manager = DatabaseManager()
+        return self.db_manager
         
     def _parse_posting_schedule(self) -> List[str]:
         """포스팅 스케줄 파싱"""
@@ -94,6 +105,11 @@ class MarketingScheduler:
         # 매주 일요일 오전 2시에 오래된 데이터 정리
         schedule.every().sunday.at("02:00").do(self._run_data_cleanup)
         
+        # 매일 데이터베이스 백업 (BACKUP_SCHEDULE을 비우면 사용 안 함)
+        backup_time = os.getenv('BACKUP_SCHEDULE', '03:30').strip()
+        if backup_time:
+            schedule.every().day.at(backup_time).do(self._run_database_backup)
+        
         # 매월 1일 오전 3시에 월간 리포트 생성
         schedule.every().month.do(self._run_monthly_report)
         
@@ -107,44 +123,86 @@ class MarketingScheduler:
             # 실제 구현에서는 main.py의 AirbnbMarketingBot 인스턴스를 사용
             # 여기서는 시뮬레이션
             from .airbnb_scraper import AirbnbScraper
-            from .database import DatabaseManager
             
-            scraper = AirbnbScraper()
-            db_manager = DatabaseManager()
+            db_manager = self._get_db_manager()
+            scraper = AirbnbScraper(db_manager=db_manager)
             
             # 새로운 숙소 데이터 수집
             properties = scraper.get_korean_properties(limit=50)
             
-            for property_data in properties:
-                db_manager.save_property_data(property_data)
+            result = db_manager.save_properties_bulk(properties)
             
-            logger.info(f"일일 데이터 수집 완료: {len(properties)}개 숙소")
+            # 수집한 숙소의 예약 가능일 비트맵 갱신
+            availability = scraper.refresh_availability([p['id'] for p in properties])
+            
+            logger.info(f"일일 데이터 수집 완료: {len(properties)}개 숙소 "
+                        f"(신규 {result['inserted']}, 업데이트 {result['updated']}, "
+                        f"예약 가능일 {availability['updated']})")
             
         except Exception as e:
             logger.error(f"일일 데이터 수집 중 오류: {str(e)}")
     
-    def _run_content_generation(self):
-        """콘텐츠 생성 실행"""
+    def _run_content_generation(self, batch_size: int = 20, time_budget: float = None):
+        """콘텐츠 생성 실행 (재생성 대기열이 빌 때까지 또는 시간 예산 소진 시까지 배치 처리)"""
         try:
             logger.info("콘텐츠 생성 시작")
             
             from .content_generator import ContentGenerator
-            from .database import DatabaseManager
             
             content_generator = ContentGenerator()
-            db_manager = DatabaseManager()
-            
-            # 미처리된 숙소 데이터 조회
-            properties = db_manager.get_all_properties(limit=20)
-            
-            for property_data in properties:
-                # 콘텐츠 생성
-                content = content_generator.create_property_content(property_data)
+            db_manager = self._get_db_manager()
+            
+            if time_budget is None:
+                time_budget = float(os.getenv('CONTENT_GENERATION_TIME_BUDGET', '600'))
+            deadline = time.monotonic() + time_budget
+            
+            # CONTENT_AMENITY_FILTER(쉼표 구분)가 있으면 해당 편의시설을 모두 갖춘 숙소만 생성
+            required_amenities = [name.strip() for name in os.getenv('CONTENT_AMENITY_FILTER', '').split(',')
+                                  if name.strip()]
+            allowed_ids = None
+            if required_amenities:
+                from .amenity_index import AmenityIndex
+                allowed_ids = set(AmenityIndex(db_manager).select(required_amenities))
+            
+            # CONTENT_NEARBY_RADIUS_KM 반경 안의 다른 숙소를 블로그 본문에 소개 (0이면 생략)
+            nearby_radius = float(os.getenv('CONTENT_NEARBY_RADIUS_KM', '3'))
+            
+            # 실패한 숙소가 같은 실행에서 반복 조회되지 않도록 id 키셋으로 한 바퀴만 순회
+            after_id = None
+            processed = 0
+            
+            while time.monotonic() < deadline:
+                properties = db_manager.get_stale_properties(limit=batch_size, after_id=after_id)
+                if not properties:
+                    break
                 
-                # 데이터베이스에 저장
-                db_manager.save_property_data(property_data, content)
+                generated = []
+                for property_data in properties:
+                    if time.monotonic() >= deadline:
+                        break
+                    after_id = property_data['id']
+                    if allowed_ids is not None and property_data['id'] not in allowed_ids:
+                        continue
+                    
+                    if nearby_radius > 0:
+                        property_data['nearby_properties'] = [
+                            {key: other.get(key) for key in ('id', 'title', 'booking_url', 'distance_km')}
+                            for other in db_manager.find_nearby_property(
+                                property_data['id'], radius_km=nearby_radius, limit=3
+                            )
+                        ]
+                    
+                    # 콘텐츠 생성
+                    content = content_generator.create_property_content(property_data)
+                    if content.get('platforms'):
+                        generated.append((property_data, content))
+                
+                # 배치 단위로 저장 및 콘텐츠 버전 갱신
+                result = db_manager.save_generated_content(generated)
+                processed += result['properties']
             
-            logger.info(f"콘텐츠 생성 완료: {len(properties)}개 숙소")
+            logger.info(f"콘텐츠 생성 완료: {processed}개 숙소, "
+                        f"남은 대기열 {db_manager.count_stale_properties()}개")
             
         except Exception as e:
             logger.error(f"콘텐츠 생성 중 오류: {str(e)}")
@@ -155,16 +213,24 @@ class MarketingScheduler:
             logger.info("스케줄된 포스팅 시작")
             
             from .social_media_manager import SocialMediaManager
-            from .database import DatabaseManager
             
             social_manager = SocialMediaManager()
-            db_manager = DatabaseManager()
+            db_manager = self._get_db_manager()
             
-            # 미게시된 콘텐츠 조회
-            pending_content = db_manager.get_pending_content(limit=10)
+            # 미게시된 콘텐츠 임대 (다른 워커와 중복 게시 방지)
+            worker_id = f"scheduler-{os.getpid()}-{threading.get_ident()}"
+            pending_content = db_manager.claim_pending_content(
+                worker_id, limit=10, lease_seconds=CONTENT_LEASE_SECONDS
+            )
             
             for content in pending_content:
                 try:
+                    # 앞선 게시로 임대가 만료됐을 수 있으므로 게시 직전에 연장
+                    # (연장되지 않으면 만료 후 다른 워커가 가져간 콘텐츠이므로 건너뜀)
+                    if not db_manager.renew_content_lease(worker_id, [content['id']], lease_seconds=CONTENT_LEASE_SECONDS):
+                        logger.warning(f"임대가 만료되어 게시를 건너뜀 ({content['property_id']})")
+                        continue
+                    
                     # 소셜미디어에 게시
                     result = social_manager.post_to_all_platforms(
                         content['content_data'], 
@@ -180,10 +246,11 @@ class MarketingScheduler:
                         )
                     
                     # 콘텐츠를 게시됨으로 표시
-                    db_manager.mark_content_as_posted(content['id'])
+                    db_manager.mark_content_as_posted(content['id'], worker_id=worker_id)
                     
                 except Exception as e:
                     logger.error(f"포스팅 중 오류 ({content['property_id']}): {str(e)}")
+                    db_manager.release_content(worker_id, [content['id']])
             
             logger.info(f"스케줄된 포스팅 완료: {len(pending_content)}개 콘텐츠")
             
@@ -195,15 +262,14 @@ class MarketingScheduler:
         try:
             logger.info("분석 리포트 생성 시작")
             
-            from .database import DatabaseManager
-            
-            db_manager = DatabaseManager()
+            db_manager = self._get_db_manager()
             
-            # 최근 7일간의 분석 데이터 조회
-            analytics = db_manager.get_posting_analytics(days=7)
+            # 최근 7일간의 플랫폼별/숙소별 집계 조회
+            platform_rows = db_manager.aggregate_postings(group_by=['platform'], days=7)
+            property_rows = db_manager.aggregate_postings(group_by=['property'], days=7)
             
             # 리포트 생성
-            report = self._generate_analytics_report(analytics)
+            report = self._generate_analytics_report(platform_rows, property_rows)
             
             # 리포트 저장
             self._save_analytics_report(report)
@@ -218,33 +284,54 @@ class MarketingScheduler:
         try:
             logger.info("데이터 정리 시작")
             
-            from .database import DatabaseManager
+            db_manager = self._get_db_manager()
+            
+            # 90일 이전 데이터 정리 (CLEANUP_ARCHIVE_DIR 지정 시 삭제 이력을 압축 보관)
+            archive_dir = os.getenv('CLEANUP_ARCHIVE_DIR')
+            archive_path = None
+            if archive_dir:
+                os.makedirs(archive_dir, exist_ok=True)
+                archive_path = os.path.join(
+                    archive_dir, f"posting_history_{datetime.now().strftime('%Y%m%d_%H%M%S')}.ndjson.gz"
+                )
             
-            db_manager = DatabaseManager()
+            db_manager.cleanup_old_data(days=90, archive_path=archive_path)
             
-            # 90일 이전 데이터 정리
-            db_manager.cleanup_old_data(days=90)
+            # 예약 가능일 비트맵을 오늘 기준으로 이동
+            db_manager.roll_availability()
             
             logger.info("데이터 정리 완료")
             
         except Exception as e:
             logger.error(f"데이터 정리 중 오류: {str(e)}")
     
+    def _run_database_backup(self):
+        """데이터베이스 백업 실행"""
+        try:
+            logger.info("데이터베이스 백업 시작")
+            
+            from .backup_manager import BackupManager
+            
+            result = BackupManager(self._get_db_manager()).create_backup()
+            
+            logger.info(f"데이터베이스 백업 완료: {result['backup_file']}")
+            
+        except Exception as e:
+            logger.error(f"데이터베이스 백업 중 오류: {str(e)}")
+    
     def _run_monthly_report(self):
         """월간 리포트 생성 실행"""
         try:
             logger.info("월간 리포트 생성 시작")
             
-            from .database import DatabaseManager
-            
-            db_manager = DatabaseManager()
+            db_manager = self._get_db_manager()
             
-            # 최근 30일간의 분석 데이터 조회
-            analytics = db_manager.get_posting_analytics(days=30)
+            # 최근 30일간의 플랫폼별 집계 조회
+            platform_rows = db_manager.aggregate_postings(group_by=['platform'], days=30)
             conversions = db_manager.get_conversion_stats()
             
             # 월간 리포트 생성
-            report = self._generate_monthly_report(analytics, conversions)
+            report = self._generate_monthly_report(platform_rows, conversions)
             
             # 리포트 저장
             self._save_monthly_report(report)
@@ -254,25 +341,22 @@ class MarketingScheduler:
         except Exception as e:
             logger.error(f"월간 리포트 생성 중 오류: {str(e)}")
     
-    def _generate_analytics_report(self, analytics: List[Dict]) -> Dict:
-        """분석 리포트 생성"""
+    def _generate_analytics_report(self, platform_rows: List[Dict], property_rows: List[Dict]) -> Dict:
+        """분석 리포트 생성 (aggregate_postings 집계 행 사용)"""
         try:
-            total_posts = len(analytics)
-            successful_posts = len([a for a in analytics if a['status'] == 'success'])
+            total_posts = sum(row['posts'] for row in platform_rows)
+            successful_posts = sum(row['success'] for row in platform_rows)
             failed_posts = total_posts - successful_posts
             
             # 플랫폼별 통계
-            platform_stats = {}
-            for analytics_data in analytics:
-                platform = analytics_data['platform']
-                if platform not in platform_stats:
-                    platform_stats[platform] = {'total': 0, 'success': 0, 'failed': 0}
-                
-                platform_stats[platform]['total'] += 1
-                if analytics_data['status'] == 'success':
-                    platform_stats[platform]['success'] += 1
-                else:
-                    platform_stats[platform]['failed'] += 1
+            platform_stats = {
+                row['platform']: {
+                    'total': row['posts'],
+                    'success': row['success'],
+                    'failed': row['posts'] - row['success']
+                }
+                for row in platform_rows
+            }
             
             report = {
                 'generated_at': datetime.now().isoformat(),
@@ -284,7 +368,7 @@ class MarketingScheduler:
                     'success_rate': (successful_posts / total_posts * 100) if total_posts > 0 else 0
                 },
                 'platform_stats': platform_stats,
-                'top_properties': self._get_top_properties(analytics, limit=5)
+                'top_properties': self._get_top_properties(property_rows, limit=5)
             }
             
             return report
@@ -293,24 +377,19 @@ class MarketingScheduler:
             logger.error(f"분석 리포트 생성 중 오류: {str(e)}")
             return {}
     
-    def _generate_monthly_report(self, analytics: List[Dict], conversions: List[Dict]) -> Dict:
-        """월간 리포트 생성"""
+    def _generate_monthly_report(self, platform_rows: List[Dict], conversions: List[Dict]) -> Dict:
+        """월간 리포트 생성 (aggregate_postings 집계 행 사용)"""
         try:
             # 기본 통계
-            total_posts = len(analytics)
+            total_posts = sum(row['posts'] for row in platform_rows)
             total_clicks = sum(c['click_count'] for c in conversions)
             total_conversions = sum(c['conversion_count'] for c in conversions)
             
             # 플랫폼별 성과
-            platform_performance = {}
-            for analytics_data in analytics:
-                platform = analytics_data['platform']
-                if platform not in platform_performance:
-                    platform_performance[platform] = {
-                        'posts': 0, 'clicks': 0, 'conversions': 0
-                    }
-                
-                platform_performance[platform]['posts'] += 1
+            platform_performance = {
+                row['platform']: {'posts': row['posts'], 'clicks': 0, 'conversions': 0}
+                for row in platform_rows
+            }
             
             for conversion in conversions:
                 platform = conversion['platform']
@@ -337,29 +416,23 @@ class MarketingScheduler:
             logger.error(f"월간 리포트 생성 중 오류: {str(e)}")
             return {}
     
-    def _get_top_properties(self, analytics: List[Dict], limit: int = 5) -> List[Dict]:
+    def _get_top_properties(self, property_rows: List[Dict], limit: int = 5) -> List[Dict]:
         """상위 성과 숙소 조회"""
         try:
-            property_stats = {}
-            
-            for analytics_data in analytics:
-                property_id = analytics_data['property_id']
-                if property_id not in property_stats:
-                    property_stats[property_id] = {
-                        'property_id': property_id,
-                        'title': analytics_data.get('title', ''),
-                        'city': analytics_data.get('city', ''),
-                        'posts': 0,
-                        'successful_posts': 0
-                    }
-                
-                property_stats[property_id]['posts'] += 1
-                if analytics_data['status'] == 'success':
-                    property_stats[property_id]['successful_posts'] += 1
+            property_stats = [
+                {
+                    'property_id': row['property_id'],
+                    'title': row.get('title') or '',
+                    'city': row.get('city') or '',
+                    'posts': row['posts'],
+                    'successful_posts': row['success']
+                }
+                for row in property_rows
+            ]
             
             # 성공률 기준으로 정렬
             sorted_properties = sorted(
-                property_stats.values(),
+                property_stats,
                 key=lambda x: x['successful_posts'] / x['posts'] if x['posts'] > 0 else 0,
                 reverse=True
             )
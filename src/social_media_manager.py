@@ -27,8 +27,10 @@ logger = logging.getLogger(__name__)
 class SocialMediaManager:
     """소셜미디어 관리 클래스"""
     
-    def __init__(self):
+    def __init__(self, click_tracker=None):
         """초기화"""
+        self.click_tracker = click_tracker
+        self.short_link_base_url = os.getenv('SHORT_LINK_BASE_URL', 'http://localhost:8000')
         self.instagram_client = None
         self.youtube_service = None
         self.wordpress_client = None
@@ -373,13 +375,22 @@ class SocialMediaManager:
             
             logger.info(f"전환 추적 URL 생성: {utm_url}")
             
-            return {
+            result = {
                 'success': True,
                 'tracking_url': utm_url,
                 'platform': platform,
                 'property_id': property_id
             }
             
+            # 클릭 수 집계를 위한 단축 링크 발급
+            if self.click_tracker is not None:
+                code = self.click_tracker.create_link(property_id, platform, utm_url)
+                if code:
+                    result['short_code'] = code
+                    result['short_url'] = f"{self.short_link_base_url.rstrip('/')}/r/{code}"
+            
+            return result
+            
         except Exception as e:
             logger.error(f"전환 추적 중 오류: {str(e)}")
             return {'success': False, 'error': str(e)}
@@ -0,0 +1,25 @@
+"""
+테스트 공통 설정
+"""
+
+import os
+import sys
+
+import pytest
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.database import DatabaseManager
+
+@pytest.fixture
+def db_path(tmp_path):
+    """테스트용 임시 DB 파일 경로"""
+    return str(tmp_path / 'test.db')
+
+@pytest.fixture
+def db(db_path):
+    """임시 DB 파일을 쓰는 DatabaseManager"""
+    manager = DatabaseManager(db_path)
+    yield manager
+    manager.close()
@@ -0,0 +1,35 @@
+"""
+숙소 수집기 예약 달력 저장 테스트
+"""
+
+from datetime import date, timedelta
+
+import pytest
+
+scraper_module = pytest.importorskip('src.airbnb_scraper')
+
+def test_property_details_do_not_write(db, monkeypatch):
+    """상세 정보 조회는 데이터베이스에 쓰지 않음"""
+    writes = []
+    monkeypatch.setattr(db, 'update_availability', lambda *args: writes.append(args))
+    monkeypatch.setattr(db, 'update_availability_bulk', lambda *args, **kwargs: writes.append(args))
+    scraper = scraper_module.AirbnbScraper(db_manager=db)
+    
+    assert scraper.get_property_details('p1')['calendar']
+    assert writes == []
+
+def test_refresh_availability_saves_fetched_calendar(db, monkeypatch):
+    """예약 가능일 갱신은 조회한 상세 정보의 calendar를 저장하고, 조회 실패는 failed로 집계"""
+    db.save_properties_bulk([{'id': 'p1', 'title': '숙소'}, {'id': 'p2', 'title': '숙소'}])
+    today = date.today()
+    calendar = {
+        'start_date': today.isoformat(),
+        'unavailable': [[(today + timedelta(days=2)).isoformat(), (today + timedelta(days=4)).isoformat()]]
+    }
+    scraper = scraper_module.AirbnbScraper(db_manager=db)
+    monkeypatch.setattr(scraper, 'get_property_details',
+                        lambda property_id: {'id': property_id, 'calendar': calendar} if property_id == 'p1' else None)
+    
+    assert scraper.refresh_availability(['p1', 'p2']) == {'updated': 1, 'failed': 1}
+    assert db.is_property_available('p1', today, 2)
+    assert not db.is_property_available('p1', today + timedelta(days=2), 1)
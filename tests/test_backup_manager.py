@@ -0,0 +1,38 @@
+"""
+백업/복원 테스트
+"""
+
+import threading
+import time
+
+from src.backup_manager import BackupManager
+
+def test_restore_while_reader_in_flight(db, tmp_path):
+    """다른 스레드가 조회 중이어도 복원이 그 조회를 끊지 않고 반납 후 교체"""
+    db.save_properties_bulk([{'id': 'p1', 'title': '복원 전'}])
+    manager = BackupManager(db, backup_dir=str(tmp_path / 'backups'))
+    backup = manager.create_backup()
+    db.save_properties_bulk([{'id': 'p2', 'title': '백업 후'}])
+    
+    borrowed = threading.Event()
+    errors = []
+    
+    def query():
+        try:
+            with db.pool.reader() as conn:
+                borrowed.set()
+                for _ in range(5):
+                    conn.execute('SELECT COUNT(*) FROM properties').fetchone()
+                    time.sleep(0.05)
+        except Exception as e:
+            errors.append(e)
+    
+    thread = threading.Thread(target=query)
+    thread.start()
+    borrowed.wait()
+    manager.restore_backup(backup['backup_file'])
+    thread.join()
+    
+    assert errors == []
+    assert db.get_property_data('p1') is not None
+    assert db.get_property_data('p2') is None
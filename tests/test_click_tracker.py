@@ -0,0 +1,188 @@
+"""
+단축 링크 조회, 클릭 로그 집계 및 리다이렉트 처리량 테스트
+"""
+
+import time
+import asyncio
+
+import pytest
+
+import src.click_tracker as click_tracker
+from src.click_tracker import ClickTracker, encode_base62, decode_base62
+
+# 단일 워커에서 기대하는 초당 리다이렉트 수
+REDIRECT_MIN_RPS = 2000
+LOAD_LINKS = 1000
+LOAD_REQUESTS = 20000
+
+@pytest.fixture
+def tracker(db, tmp_path):
+    """임시 클릭 로그를 쓰는 ClickTracker (집계는 테스트에서 직접 호출)"""
+    tracker = ClickTracker(db, log_path=str(tmp_path / 'clicks.log'), flush_interval=3600)
+    yield tracker
+    tracker.close()
+
+def _save_links(db, count: int):
+    """count개의 숙소와 추적 링크 저장"""
+    db.save_properties_bulk([{'id': f'p{i:05d}', 'title': f'숙소 {i}'} for i in range(count)])
+    for i in range(count):
+        db.save_tracking_link(f'p{i:05d}', 'blog', f'https://example.com/{i}')
+
+def _click_count(db, property_id: str) -> int:
+    """숙소의 누적 클릭 수"""
+    return sum(row['click_count'] for row in db.get_conversion_stats(property_id))
+
+def test_base62_round_trip():
+    """base62 인코딩/디코딩 왕복"""
+    for number in (0, 1, 61, 62, 3843, 2 ** 63 - 1):
+        assert decode_base62(encode_base62(number)) == number
+
+def test_unknown_codes_are_negative_cached(db, tracker, monkeypatch):
+    """없는 코드는 한 번만 DB를 조회하고, 같은 코드로 링크가 발급되면 캐시에서 제거"""
+    lookups = []
+    get_tracking_link = db.get_tracking_link
+    
+    def counted_lookup(conversion_id):
+        lookups.append(conversion_id)
+        return get_tracking_link(conversion_id)
+    
+    monkeypatch.setattr(db, 'get_tracking_link', counted_lookup)
+    
+    code = encode_base62(1)
+    for _ in range(5):
+        assert tracker.resolve(code) is None
+    assert lookups == [1]
+    
+    db.save_property_data({'id': 'p00000', 'title': '숙소'})
+    assert tracker.create_link('p00000', 'blog', 'https://example.com/0') == code
+    assert tracker.resolve(code) == ('p00000', 'blog', 'https://example.com/0')
+
+def test_negative_cache_is_bounded(tracker, monkeypatch):
+    """없는 코드 캐시는 NEGATIVE_CACHE_SIZE를 넘지 않음"""
+    monkeypatch.setattr(click_tracker, 'NEGATIVE_CACHE_SIZE', 3)
+    for number in range(100, 110):
+        tracker.resolve(encode_base62(number))
+    
+    assert list(tracker._misses) == [encode_base62(number) for number in range(107, 110)]
+
+def test_click_log_is_aggregated_once(db, tracker, tmp_path):
+    """클릭은 로그에 기록된 뒤 집계되고, 재시작해도 두 번 집계되지 않음"""
+    _save_links(db, 2)
+    tracker.warm()
+    for _ in range(5):
+        tracker.record_click(encode_base62(1), 'p00000', 'blog')
+    tracker.record_click(encode_base62(2), 'p00001', 'blog')
+    
+    assert tracker.aggregate() == 6
+    assert tracker.aggregate() == 0
+    assert _click_count(db, 'p00000') == 5
+    assert _click_count(db, 'p00001') == 1
+    
+    restarted = ClickTracker(db, log_path=tracker.log_path, flush_interval=3600)
+    restarted.warm()
+    restarted.close()
+    assert _click_count(db, 'p00000') == 5
+    with open(tracker.log_path, encoding='utf-8') as log_file:
+        assert len(log_file.readlines()) == 6
+
+def test_click_log_goes_through_conversion_buffer(db, tracker, monkeypatch):
+    """집계는 전환 카운터 버퍼의 flush로 반영되고, 반영 실패분은 버퍼에 남아 한 번만 재시도"""
+    _save_links(db, 1)
+    for _ in range(3):
+        tracker.record_click(encode_base62(1), 'p00000', 'blog')
+    
+    assert tracker.get_stats()['queued_clicks'] == 3
+    assert tracker.aggregate() == 3
+    assert db.conversion_buffer.flush_count == 1
+    assert db.conversion_buffer.flushed_increments == 3
+    
+    apply = db._apply_conversion_increments
+    monkeypatch.setattr(db, '_apply_conversion_increments', lambda increments: False)
+    tracker.record_click(encode_base62(1), 'p00000', 'blog')
+    assert tracker.aggregate() == 1
+    assert db.conversion_buffer.pending_increments == 1
+    assert tracker.get_stats()['unaggregated_log_bytes'] == 0
+    
+    monkeypatch.setattr(db, '_apply_conversion_increments', apply)
+    assert tracker.aggregate() == 0
+    assert db.conversion_buffer.flush() == 1
+    assert _click_count(db, 'p00000') == 4
+
+def test_stats_report_click_backlog(db, tracker):
+    """큐에 쌓인 클릭 수와 아직 집계하지 않은 로그 바이트 보고"""
+    _save_links(db, 1)
+    tracker.record_click(encode_base62(1), 'p00000', 'blog')
+    tracker.record_click(encode_base62(1), 'p00000', 'blog')
+    assert tracker.get_stats()['queued_clicks'] == 2
+    
+    with tracker._log_lock:
+        tracker._write_pending()
+    stats = tracker.get_stats()
+    assert stats['queued_clicks'] == 0
+    assert stats['unaggregated_log_bytes'] > 0
+    
+    tracker.aggregate()
+    assert tracker.get_stats()['unaggregated_log_bytes'] == 0
+
+def test_full_click_log_is_truncated(db, tracker, monkeypatch):
+    """모두 집계된 로그가 CLICK_LOG_MAX_BYTES를 넘으면 비우고 처음부터 다시 기록"""
+    monkeypatch.setattr(click_tracker, 'CLICK_LOG_MAX_BYTES', 1)
+    _save_links(db, 1)
+    tracker.record_click(encode_base62(1), 'p00000', 'blog')
+    assert tracker.aggregate() == 1
+    
+    tracker.record_click(encode_base62(1), 'p00000', 'blog')
+    assert tracker.aggregate() == 1
+    assert _click_count(db, 'p00000') == 2
+    assert db.get_meta(click_tracker.CLICK_LOG_OFFSET_KEY) == 0
+
+def test_redirect_path_throughput(db, tracker):
+    """메모리 조회 + 클릭 기록이 단일 스레드에서 초당 REDIRECT_MIN_RPS건 이상"""
+    _save_links(db, LOAD_LINKS)
+    assert tracker.warm() == LOAD_LINKS
+    codes = [encode_base62(i % LOAD_LINKS + 1) for i in range(LOAD_REQUESTS)]
+    
+    started = time.perf_counter()
+    for code in codes:
+        property_id, platform, _ = tracker.lookup(code)
+        tracker.record_click(code, property_id, platform)
+    elapsed = time.perf_counter() - started
+    
+    assert LOAD_REQUESTS / elapsed >= REDIRECT_MIN_RPS
+    assert tracker.aggregate() == LOAD_REQUESTS
+    assert _click_count(db, 'p00000') == LOAD_REQUESTS // LOAD_LINKS
+
+def test_redirect_route_throughput(db, tracker, monkeypatch):
+    """/r/{code} ASGI 호출이 단일 워커에서 초당 REDIRECT_MIN_RPS건 이상, 모두 302"""
+    main = pytest.importorskip('backend.main')
+    _save_links(db, LOAD_LINKS)
+    tracker.warm()
+    monkeypatch.setattr(main, 'click_tracker', tracker)
+    
+    async def request(code: str) -> int:
+        statuses = []
+        
+        async def receive():
+            return {'type': 'http.request', 'body': b'', 'more_body': False}
+        
+        async def send(message):
+            if message['type'] == 'http.response.start':
+                statuses.append(message['status'])
+        
+        scope = {
+            'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'method': 'GET',
+            'scheme': 'http', 'path': f'/r/{code}', 'raw_path': f'/r/{code}'.encode(), 'root_path': '',
+            'query_string': b'', 'headers': [], 'client': ('127.0.0.1', 0), 'server': ('testserver', 80),
+        }
+        await main.app(scope, receive, send)
+        return statuses[0]
+    
+    async def run():
+        await request(encode_base62(1))
+        started = time.perf_counter()
+        statuses = [await request(encode_base62(i % LOAD_LINKS + 1)) for i in range(LOAD_REQUESTS)]
+        return statuses, time.perf_counter() - started
+    
+    statuses, elapsed = asyncio.run(run())
+    assert set(statuses) == {302}
+    assert LOAD_REQUESTS / elapsed >= REDIRECT_MIN_RPS
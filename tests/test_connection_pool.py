@@ -0,0 +1,118 @@
+"""
+커넥션 풀 테스트
+"""
+
+import threading
+import time
+from contextlib import ExitStack
+
+import pytest
+
+from src.database import ConnectionPool
+
+def test_reader_overflow_when_pool_exhausted_on_same_thread(db_path):
+    """한 스레드가 읽기 커넥션을 모두 대여 중이어도 임시 커넥션으로 교착 없이 진행"""
+    pool = ConnectionPool(db_path, max_readers=2, max_overflow=2, acquire_timeout=1)
+    with ExitStack() as stack:
+        conns = [stack.enter_context(pool.reader()) for _ in range(4)]
+        assert len({id(conn) for conn in conns}) == 4
+        assert all(conn.execute('SELECT 1').fetchone() == (1,) for conn in conns)
+    
+    # 임시 커넥션은 반납 시 닫히고 기본 개수만 유지
+    assert pool._reader_count == 2
+    assert len(pool._idle_readers) == 2
+    pool.close()
+
+def test_reader_acquire_times_out(db_path):
+    """임시 커넥션까지 모두 대여 중이면 무한 대기 대신 TimeoutError"""
+    pool = ConnectionPool(db_path, max_readers=1, max_overflow=0, acquire_timeout=0.2)
+    with pool.reader():
+        started = time.monotonic()
+        with pytest.raises(TimeoutError):
+            with pool.reader():
+                pass
+        assert time.monotonic() - started < 1
+    pool.close()
+
+def test_reader_waits_for_release_from_other_thread(db_path):
+    """다른 스레드가 반납하면 대기 중인 대여가 그 커넥션을 받음"""
+    pool = ConnectionPool(db_path, max_readers=1, max_overflow=0, acquire_timeout=5)
+    borrowed = threading.Event()
+    release = threading.Event()
+    
+    def hold():
+        with pool.reader():
+            borrowed.set()
+            release.wait()
+    
+    thread = threading.Thread(target=hold)
+    thread.start()
+    borrowed.wait()
+    threading.Timer(0.1, release.set).start()
+    with pool.reader() as conn:
+        assert conn.execute('SELECT 1').fetchone() == (1,)
+    thread.join()
+    pool.close()
+
+def test_exclusive_waits_for_borrowed_readers(db_path):
+    """exclusive()는 다른 스레드의 읽기 커넥션이 반납될 때까지 기다린 뒤 닫음"""
+    pool = ConnectionPool(db_path, max_readers=2, acquire_timeout=5)
+    borrowed = threading.Event()
+    errors = []
+    finished = []
+    
+    def query():
+        try:
+            with pool.reader() as conn:
+                borrowed.set()
+                for _ in range(5):
+                    conn.execute('SELECT COUNT(*) FROM sqlite_master').fetchone()
+                    time.sleep(0.05)
+            finished.append(True)
+        except Exception as e:
+            errors.append(e)
+    
+    thread = threading.Thread(target=query)
+    thread.start()
+    borrowed.wait()
+    with pool.exclusive():
+        assert finished == [True]
+        assert pool._reader_count == 0
+    thread.join()
+    
+    assert errors == []
+    with pool.reader() as conn:
+        assert conn.execute('SELECT 1').fetchone() == (1,)
+    pool.close()
+
+def test_exclusive_blocks_new_readers_until_done(db_path):
+    """exclusive() 중 요청된 읽기 대여는 교체가 끝난 뒤 새 커넥션을 받음"""
+    pool = ConnectionPool(db_path, max_readers=2, acquire_timeout=5)
+    results = []
+    
+    with pool.exclusive():
+        thread = threading.Thread(target=lambda: results.append(pool._acquire_reader()))
+        thread.start()
+        time.sleep(0.1)
+        assert results == []
+    thread.join()
+    
+    assert len(results) == 1
+    assert results[0].execute('SELECT 1').fetchone() == (1,)
+    pool._release_reader(results[0])
+    pool.close()
+
+def test_exclusive_times_out_when_reader_not_returned(db_path):
+    """대여 중인 읽기 커넥션이 반납되지 않으면 TimeoutError, 이후 풀은 계속 사용 가능"""
+    pool = ConnectionPool(db_path, max_readers=2, acquire_timeout=5)
+    held = pool._acquire_reader()
+    
+    with pytest.raises(TimeoutError):
+        with pool.exclusive(timeout=0.2):
+            pass
+    
+    assert held.execute('SELECT 1').fetchone() == (1,)
+    pool._release_reader(held)
+    with pool.reader() as conn:
+        assert conn.execute('SELECT 1').fetchone() == (1,)
+    pool.close()
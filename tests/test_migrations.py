@@ -0,0 +1,110 @@
+"""
+스키마 마이그레이션 및 조회 경로 인덱스 테스트
+"""
+
+import sqlite3
+from datetime import datetime, timedelta
+
+import pytest
+
+import src.database as database
+from src.database import DatabaseManager
+
+# 검사 대상 테이블 크기와 전체 스캔 허용 기준 (FULL_SCAN_ROW_THRESHOLD 대신 작은 값으로 빠르게 검사)
+SEED_ROWS = 300
+MIN_SCAN_ROWS = 200
+
+def _schema(db_path: str):
+    """(user_version, 테이블 목록, properties 컬럼 목록)"""
+    conn = sqlite3.connect(db_path)
+    try:
+        version = conn.execute('PRAGMA user_version').fetchone()[0]
+        tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        columns = {row[1] for row in conn.execute('PRAGMA table_info(properties)')}
+        return version, tables, columns
+    finally:
+        conn.close()
+
+def test_failed_migration_is_rolled_back_and_retried(db_path, monkeypatch):
+    """단계가 실패한 버전은 전체가 취소되고 예외가 전파되며, 고친 뒤 다시 열면 적용"""
+    latest = database.MIGRATIONS[-1][0]
+    broken = (latest + 1, '테스트 마이그레이션', [
+        'CREATE TABLE migration_test (id INTEGER PRIMARY KEY)',
+        'ALTER TABLE properties ADD COLUMN migration_test TEXT',
+        'INSERT INTO no_such_table VALUES (1)',
+    ])
+    monkeypatch.setattr(database, 'MIGRATIONS', database.MIGRATIONS + [broken])
+    
+    with pytest.raises(sqlite3.OperationalError):
+        DatabaseManager(db_path)
+    
+    version, tables, columns = _schema(db_path)
+    assert version == latest
+    assert 'migration_test' not in tables
+    assert 'migration_test' not in columns
+    
+    fixed = (broken[0], broken[1], broken[2][:2])
+    monkeypatch.setattr(database, 'MIGRATIONS', database.MIGRATIONS[:-1] + [fixed])
+    manager = DatabaseManager(db_path)
+    manager.close()
+    
+    version, tables, columns = _schema(db_path)
+    assert version == latest + 1
+    assert 'migration_test' in tables
+    assert 'migration_test' in columns
+
+@pytest.fixture
+def seeded_db(db):
+    """조회 경로 검사용 데이터 (각 테이블 SEED_ROWS행 이상)"""
+    now = datetime.now()
+    db.save_properties_bulk([
+        {'id': f'p{i:05d}', 'title': f'숙소 {i}', 'city': '서울' if i % 2 else '부산',
+         'latitude': 37 + i / 1e4, 'longitude': 127 + i / 1e4, 'amenities': ['WiFi']}
+        for i in range(SEED_ROWS)
+    ])
+    db.save_content_bulk([
+        (f'p{i:05d}', {'platforms': {'blog': {'n': i}, 'instagram': {'n': i}}})
+        for i in range(SEED_ROWS)
+    ])
+    with db.pool.writer() as conn:
+        conn.executemany('''
+            INSERT INTO posting_history (property_id, platform, status, posted_at)
+            VALUES (?, 'blog', 'success', ?)
+        ''', [(f'p{i % SEED_ROWS:05d}', db._timestamp(now - timedelta(hours=i))) for i in range(SEED_ROWS * 2)])
+    for i in range(SEED_ROWS):
+        db.save_tracking_link(f'p{i:05d}', 'blog', f'https://example.com/{i}')
+    return db
+
+def test_hot_queries_do_not_scan_large_tables(seeded_db):
+    """자주 쓰는 조회/갱신 경로가 큰 테이블을 인덱스 없이 전체 스캔하지 않음"""
+    db = seeded_db
+    with db.capture_statements() as statements:
+        db.get_property_data('p00001')
+        page = db.get_properties_page(limit=20)
+        db.get_properties_page(limit=20, cursor=page['next_cursor'])
+        db.query_properties(city='서울', limit=20)
+        db.count_properties(city='서울')
+        db.get_stale_properties()
+        db.count_stale_properties()
+        db.get_pending_content()
+        db.claim_pending_content('worker-1', limit=5)
+        db.get_posting_analytics(days=7)
+        db.aggregate_postings(['day', 'platform'], days=7)
+        list(db.iter_posting_history(days=7))
+        db.save_posting_history('p00001', 'blog', {'success': True})
+        db.update_conversion_stats('p00001', 'blog', click_count=1)
+        db.get_conversion_stats('p00001')
+        db.get_conversion_totals('p00001', days=7)
+        db.get_tracking_link(5)
+        db.cleanup_old_data(days=90)
+        db.find_nearby(37.01, 127.01, radius_km=1, limit=10)
+    
+    assert len(statements) > 20
+    assert db.find_full_scans(statements, min_rows=MIN_SCAN_ROWS) == []
+
+def test_find_full_scans_reports_unindexed_scan(seeded_db):
+    """인덱스 없는 조건의 큰 테이블 조회는 검출"""
+    violations = seeded_db.find_full_scans(
+        ["SELECT * FROM properties WHERE description = 'x'"], min_rows=MIN_SCAN_ROWS
+    )
+    assert [violation['table'] for violation in violations] == ['properties']
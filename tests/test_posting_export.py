@@ -0,0 +1,65 @@
+"""
+게시 이력 내보내기 테스트
+"""
+
+import gzip
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.database import DatabaseManager, POSTING_EXPORT_COLUMNS
+from src.exporter import iter_export
+
+def _seed_postings(db, count: int):
+    """같은 posted_at이 여러 행에 걸치도록 게시 이력 생성"""
+    base = datetime.now()
+    db.save_properties_bulk([{'id': 'p1', 'title': '숙소'}])
+    with db.pool.writer() as conn:
+        conn.executemany('''
+            INSERT INTO posting_history (property_id, platform, status, posted_at)
+            VALUES ('p1', ?, 'success', ?)
+        ''', [
+            ('instagram' if i % 2 else 'blog', db._timestamp(base - timedelta(minutes=i // 3)))
+            for i in range(count)
+        ])
+
+@pytest.mark.parametrize('epoch_timestamps', [False, True])
+def test_iter_posting_history_pages_cover_all_rows(db_path, epoch_timestamps):
+    """키셋 배치 경계에 같은 posted_at이 있어도 빠짐/중복 없이 최신순 반환"""
+    db = DatabaseManager(db_path, epoch_timestamps=epoch_timestamps)
+    _seed_postings(db, 53)
+    
+    rows = list(db.iter_posting_history(days=30, batch_size=7))
+    assert len(rows) == 53
+    assert len({row['id'] for row in rows}) == 53
+    keys = [(row['posted_at'], row['id']) for row in rows]
+    assert keys == sorted(keys, reverse=True)
+    
+    blog = list(db.iter_posting_history(platform='blog', batch_size=5))
+    assert {row['platform'] for row in blog} == {'blog'}
+    assert len(blog) == 27
+    db.close()
+
+def test_iter_posting_history_releases_reader_between_batches(db):
+    """소비자가 배치 사이에서 멈춰 있는 동안 읽기 커넥션을 점유하지 않음"""
+    _seed_postings(db, 20)
+    
+    rows = db.iter_posting_history(batch_size=5)
+    next(rows)
+    assert db.pool._reader_count == len(db.pool._idle_readers)
+    assert len(list(rows)) == 19
+
+def test_json_export_keeps_response_object(db):
+    """json 내보내기는 기존 응답과 같은 data/exported_at/format 객체로 스트리밍"""
+    _seed_postings(db, 12)
+    columns = [column.split('.')[-1] for column in POSTING_EXPORT_COLUMNS]
+    
+    document = json.loads(b''.join(iter_export(db.iter_posting_history(batch_size=5), columns)))
+    assert document['format'] == 'json'
+    assert document['exported_at']
+    assert len(document['data']) == 12
+    assert document['data'][0]['title'] == '숙소'
+    
+    compressed = b''.join(iter_export(iter([]), columns, compress=True))
+    assert json.loads(gzip.decompress(compressed))['data'] == []
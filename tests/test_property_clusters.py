@@ -0,0 +1,71 @@
+"""
+지도 클러스터 조회 테스트
+"""
+
+import pytest
+
+from src.database import cluster_scale
+
+ZOOM = 10
+CELL_X = 7000
+CELL_Y = 3000
+
+def _expected_cell(latitude: float, longitude: float, scale: float):
+    """트리거와 같은 식으로 계산한 격자 칸"""
+    return int((longitude + 180) * scale), int((latitude + 90) * scale)
+
+@pytest.fixture
+def clustered_db(db):
+    """경계 위 숙소와 이웃 칸 숙소가 섞인 데이터"""
+    scale = cluster_scale(ZOOM)
+    west = CELL_X / scale - 180
+    south = CELL_Y / scale - 90
+    width = 1 / scale
+    db.save_properties_bulk([
+        # 서쪽 경계 위 (경계를 남/서 경계로 쓰는 칸에만 속해야 함)
+        {'id': 'edge', 'title': '경계', 'latitude': south + width / 2, 'longitude': west, 'price_per_night': 100},
+        # 경계 바로 서쪽 칸의 숙소
+        {'id': 'west', 'title': '서쪽', 'latitude': south + width / 2, 'longitude': west - width / 2,
+         'price_per_night': 200},
+        # 숙소가 여럿인 칸
+        {'id': 'pair-1', 'title': '묶음 1', 'latitude': south + width / 4, 'longitude': west + 3.25 * width,
+         'price_per_night': 300},
+        {'id': 'pair-2', 'title': '묶음 2', 'latitude': south + width / 2, 'longitude': west + 3.5 * width,
+         'price_per_night': 500},
+        # 비활성 숙소는 클러스터에 포함하지 않음
+        {'id': 'inactive', 'title': '비활성', 'latitude': south + width / 2, 'longitude': west + 6.5 * width},
+    ])
+    with db.pool.writer() as conn:
+        conn.execute("UPDATE properties SET is_active = 0 WHERE id = 'inactive'")
+    return db
+
+@pytest.mark.parametrize('geo_index', [True, False])
+def test_single_property_cells_resolved_in_one_query(clustered_db, geo_index):
+    """숙소가 하나인 칸은 한 번의 조인 쿼리로 자기 칸의 숙소를 개별 마커로 반환"""
+    db = clustered_db
+    if not geo_index:
+        db.geo_index_enabled = False
+    scale = cluster_scale(ZOOM)
+    west = CELL_X / scale - 180
+    south = CELL_Y / scale - 90
+    
+    with db.capture_statements() as statements:
+        result = db.get_property_clusters(south - 1 / scale, west - 2 / scale, south + 2 / scale, west + 8 / scale, ZOOM)
+    
+    markers = {cluster['property_id']: cluster for cluster in result['clusters'] if 'property_id' in cluster}
+    assert set(markers) == {'edge', 'west'}
+    assert _expected_cell(markers['edge']['lat'], markers['edge']['lng'], scale) != \
+        _expected_cell(markers['west']['lat'], markers['west']['lng'], scale)
+    
+    groups = [cluster for cluster in result['clusters'] if 'property_id' not in cluster]
+    assert [(group['count'], group['avg_price']) for group in groups] == [(2, 400)]
+    south_edge, west_edge, north_edge, east_edge = groups[0]['bounds']
+    for property_data in (db.get_property_data('pair-1'), db.get_property_data('pair-2')):
+        assert south_edge <= property_data['latitude'] < north_edge
+        assert west_edge <= property_data['longitude'] < east_edge
+    assert result['total'] == 4
+    
+    # 클러스터 칸 조회 + 개별 숙소 칸 조인 + 숙소 상세 조회 (칸 수와 무관, R*Tree 내부 문장 제외)
+    statements = [statement for statement in statements if '_node' not in statement]
+    assert len([statement for statement in statements if 'json_each' in statement]) == 1
+    assert len(statements) == 3
@@ -0,0 +1,64 @@
+"""
+숙소 전문 검색 인덱스(FTS5) 동기화 테스트
+"""
+
+import sqlite3
+
+import pytest
+
+from src.database import DatabaseManager
+
+PROPERTY = {'id': 'p1', 'title': 'Gangnam Loft', 'description': '역 근처 숙소', 'city': '서울'}
+
+def _fts_state(db):
+    """FTS 세그먼트 테이블 상태 (행이 다시 색인되면 바뀜)"""
+    with db.pool.reader() as conn:
+        return conn.execute('SELECT COUNT(*), MAX(id), TOTAL(LENGTH(block)) FROM properties_fts_data').fetchone()
+
+@pytest.fixture
+def fts_db(db):
+    """FTS5 trigram을 쓸 수 있는 DB"""
+    if not db.fts_enabled:
+        pytest.skip('FTS5 trigram을 사용할 수 없음')
+    db.save_properties_bulk([PROPERTY])
+    return db
+
+def test_unchanged_upsert_leaves_fts_untouched(fts_db):
+    """검색 컬럼이 그대로인 재수집은 FTS 행을 다시 쓰지 않음"""
+    before = _fts_state(fts_db)
+    fts_db.save_properties_bulk([PROPERTY])
+    fts_db.save_property_data(dict(PROPERTY, price_per_night=90000))
+    assert _fts_state(fts_db) == before
+
+def test_changed_title_is_reindexed(fts_db):
+    """제목이 바뀌면 새 제목으로 검색되고 이전 제목으로는 검색되지 않음"""
+    fts_db.save_properties_bulk([dict(PROPERTY, title='Haeundae Villa')])
+    assert [row['id'] for row in fts_db.search_properties(['Haeundae'])] == ['p1']
+    assert fts_db.search_properties(['Gangnam']) == []
+
+def test_existing_unguarded_trigger_is_replaced(db_path):
+    """이전 버전의 조건 없는 갱신 트리거는 마이그레이션으로 WHEN 조건 트리거로 교체"""
+    db = DatabaseManager(db_path)
+    fts_enabled = db.fts_enabled
+    db.close()
+    if not fts_enabled:
+        pytest.skip('FTS5 trigram을 사용할 수 없음')
+    
+    conn = sqlite3.connect(db_path)
+    conn.executescript('''
+        DROP TRIGGER properties_fts_au;
+        CREATE TRIGGER properties_fts_au AFTER UPDATE OF title, description, city ON properties BEGIN
+            INSERT INTO properties_fts (properties_fts, rowid, title, description, city)
+            VALUES ('delete', old.rowid, old.title, old.description, old.city);
+            INSERT INTO properties_fts (rowid, title, description, city)
+            VALUES (new.rowid, new.title, new.description, new.city);
+        END;
+        PRAGMA user_version = 12;
+    ''')
+    conn.close()
+    
+    DatabaseManager(db_path).close()
+    conn = sqlite3.connect(db_path)
+    sql = conn.execute("SELECT sql FROM sqlite_master WHERE name = 'properties_fts_au'").fetchone()[0]
+    conn.close()
+    assert 'WHEN old.title IS NOT new.title' in sql
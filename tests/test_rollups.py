@@ -0,0 +1,106 @@
+"""
+일별 롤업 기간 조건 테스트
+"""
+
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+import src.database as database
+from src.database import DatabaseManager
+
+# UTC와 날짜가 다른 시각 (Asia/Seoul 05:00 = 전날 UTC 20:00)
+LOCAL_TIMEZONE = 'Asia/Seoul'
+DAYS = 7
+
+class FixedDatetime(datetime):
+    """now()가 NOW를 반환하는 datetime"""
+    
+    @classmethod
+    def now(cls, tz=None):
+        return NOW if tz is None else NOW.astimezone(tz)
+
+# 모듈의 datetime을 바꿔도 isinstance 검사를 통과하도록 FixedDatetime 인스턴스로 생성
+NOW = FixedDatetime(2026, 3, 10, 5, 0)
+
+@pytest.fixture
+def fixed_now(monkeypatch):
+    """로컬 시간대를 LOCAL_TIMEZONE으로, 현재 시각을 NOW로 고정"""
+    monkeypatch.setenv('TZ', LOCAL_TIMEZONE)
+    time.tzset()
+    monkeypatch.setattr(database, 'datetime', FixedDatetime)
+    yield NOW
+    monkeypatch.undo()
+    time.tzset()
+
+def _seed_rollups(db, days):
+    """기간 첫날과 그 전날에 각각 롤업 행 저장"""
+    first = db._day_key(NOW - timedelta(days=days))
+    before = (datetime.fromisoformat(first) - timedelta(days=1)).date().isoformat()
+    with db.pool.writer() as conn:
+        for day, count in ((first, 1), (before, 100)):
+            conn.execute('''
+                INSERT INTO posting_daily_rollup (date, platform, property_id, posts, success, failed)
+                VALUES (?, 'blog', 'p1', ?, ?, 0)
+            ''', (day, count, count))
+            conn.execute('''
+                INSERT INTO conversion_daily_rollup (date, platform, property_id, clicks, conversions)
+                VALUES (?, 'blog', 'p1', ?, 0)
+            ''', (day, count))
+    return first
+
+@pytest.mark.parametrize('epoch_timestamps, first_day', [(False, '2026-03-03'), (True, '2026-03-02')])
+def test_rollup_window_starts_on_local_day_key(db_path, fixed_now, epoch_timestamps, first_day):
+    """롤업 기간은 SQLite의 UTC 'now'가 아니라 _day_key 기준 날짜부터 시작"""
+    db = DatabaseManager(db_path, epoch_timestamps=epoch_timestamps)
+    try:
+        db.save_properties_bulk([{'id': 'p1', 'title': '숙소'}])
+        assert _seed_rollups(db, DAYS) == first_day
+        
+        assert db.aggregate_postings([], days=DAYS) == [{'posts': 1, 'success': 1, 'failed': 0}]
+        assert db.get_conversion_totals('p1', days=DAYS) == {'clicks': 1, 'conversions': 0}
+    finally:
+        db.close()
+
+@pytest.mark.parametrize('epoch_timestamps', [False, True])
+def test_rollup_matches_raw_postings(db_path, fixed_now, epoch_timestamps):
+    """같은 날 게시한 이력은 롤업 집계와 원본 테이블 집계가 일치"""
+    db = DatabaseManager(db_path, epoch_timestamps=epoch_timestamps)
+    try:
+        db.save_properties_bulk([{'id': 'p1', 'title': '숙소'}])
+        for success in (True, True, False):
+            db.save_posting_history('p1', 'blog', {'success': success})
+        
+        rollup = db.aggregate_postings(['day', 'platform'], days=DAYS)
+        raw = db.aggregate_postings(['day', 'platform'], days=DAYS, use_rollup=False)
+        assert rollup == raw
+        assert rollup[0]['posts'] == 3
+    finally:
+        db.close()
+
+def test_missing_platform_rolls_up_as_empty_string(db):
+    """platform이 없는 게시 이력/전환도 저장되고, 롤업에는 백필과 같이 빈 문자열로 집계"""
+    db.save_properties_bulk([{'id': 'p1', 'title': '숙소'}])
+    assert db.save_posting_history('p1', None, {'success': True})
+    db.record_conversion('p1', None, click_count=2)
+    assert db.conversion_buffer.flush() == 2
+    
+    with db.pool.reader() as conn:
+        assert conn.execute('SELECT COUNT(*) FROM posting_history WHERE platform IS NULL').fetchone()[0] == 1
+        assert conn.execute('SELECT platform, posts FROM posting_daily_rollup').fetchall() == [('', 1)]
+        assert conn.execute('SELECT platform, clicks FROM conversion_daily_rollup').fetchall() == [('', 2)]
+
+@pytest.mark.parametrize('group_by', [[], ['platform'], ['property']])
+def test_rollup_matches_raw_postings_after_property_deleted(db, group_by):
+    """숙소가 삭제돼도 롤업 집계와 원본 테이블 집계가 같은 이력을 포함"""
+    db.save_properties_bulk([{'id': 'p1', 'title': '숙소'}, {'id': 'p2', 'title': '삭제될 숙소'}])
+    for property_id in ('p1', 'p2', 'p2'):
+        db.save_posting_history(property_id, 'blog', {'success': True})
+    with db.pool.writer() as conn:
+        conn.execute("DELETE FROM properties WHERE id = 'p2'")
+    
+    rollup = db.aggregate_postings(group_by, days=DAYS)
+    raw = db.aggregate_postings(group_by, days=DAYS, use_rollup=False)
+    assert rollup == raw
+    assert sum(row['posts'] for row in raw) == 3
@@ -0,0 +1,72 @@
+"""
+스케줄된 포스팅 작업의 콘텐츠 임대 테스트
+"""
+
+import sys
+import types
+from datetime import datetime, timedelta
+
+import pytest
+
+scheduler_module = pytest.importorskip('src.scheduler')
+
+@pytest.fixture
+def pending_db(db):
+    """게시 대기 콘텐츠가 두 개인 DB"""
+    db.save_properties_bulk([{'id': 'p1', 'title': '숙소 1'}, {'id': 'p2', 'title': '숙소 2'}])
+    db.save_content_bulk([('p1', {'platforms': {'blog': '본문 1'}}), ('p2', {'platforms': {'blog': '본문 2'}})])
+    return db
+
+def _use_social_manager(monkeypatch, manager_class):
+    """포스팅 작업이 가져오는 SocialMediaManager를 테스트용 클래스로 교체"""
+    module = types.ModuleType('src.social_media_manager')
+    module.SocialMediaManager = manager_class
+    monkeypatch.setitem(sys.modules, 'src.social_media_manager', module)
+
+def test_posting_skips_content_whose_lease_was_taken(pending_db, monkeypatch):
+    """앞선 게시가 길어져 임대가 만료되고 다른 워커가 가져간 콘텐츠는 게시하지 않음"""
+    db = pending_db
+    posted = []
+    
+    class SlowSocialManager:
+        def post_to_all_platforms(self, content, property_data):
+            posted.append(property_data['id'])
+            # 게시 도중 나머지 콘텐츠의 임대가 만료되어 다른 워커가 가져감
+            expired = (datetime.now() - timedelta(seconds=1)).isoformat()
+            with db.pool.writer() as conn:
+                conn.execute('UPDATE content SET lease_expires_at = ? WHERE property_id != ?',
+                             (expired, property_data['id']))
+            assert len(db.claim_pending_content('other-worker')) == 1
+            return {'platforms': {'blog': {'success': True}}}
+    
+    _use_social_manager(monkeypatch, SlowSocialManager)
+    scheduler_module.MarketingScheduler(db_manager=db)._run_scheduled_posting()
+    
+    assert posted == ['p1']
+    with db.pool.reader() as conn:
+        rows = conn.execute('SELECT property_id, is_posted, claimed_by FROM content ORDER BY property_id').fetchall()
+    assert rows[0][1] == 1
+    assert rows[1] == ('p2', 0, 'other-worker')
+
+def test_posting_renews_lease_before_each_post(pending_db, monkeypatch):
+    """각 콘텐츠는 게시 직전에 임대가 CONTENT_LEASE_SECONDS만큼 연장됨"""
+    db = pending_db
+    remaining = []
+    
+    class CheckingSocialManager:
+        def post_to_all_platforms(self, content, property_data):
+            with db.pool.reader() as conn:
+                expires_at = conn.execute('SELECT lease_expires_at FROM content WHERE property_id = ?',
+                                          (property_data['id'],)).fetchone()[0]
+            remaining.append((datetime.fromisoformat(expires_at) - datetime.now()).total_seconds())
+            return {'platforms': {'blog': {'success': True}}}
+    
+    # 임대 직후 만료되는 시간으로 가져오게 해도 게시 직전 연장으로 유지됨
+    claim = db.claim_pending_content
+    monkeypatch.setattr(db, 'claim_pending_content',
+                        lambda worker_id, limit=10, lease_seconds=300: claim(worker_id, limit, lease_seconds=0))
+    _use_social_manager(monkeypatch, CheckingSocialManager)
+    scheduler_module.MarketingScheduler(db_manager=db)._run_scheduled_posting()
+    
+    assert len(remaining) == 2
+    assert all(seconds > scheduler_module.CONTENT_LEASE_SECONDS - 5 for seconds in remaining)
@@ -0,0 +1,112 @@
+"""
+스키마 초기화(DDL)가 프로세스당 한 번만 실행되는지 검사
+"""
+
+import re
+
+import pytest
+
+import src.database as database
+from src.database import DatabaseManager
+
+DDL_PATTERN = re.compile(r'^\s*(CREATE|ALTER|DROP)\b', re.IGNORECASE)
+
+def _ddl(statements):
+    """수집한 SQL 문 중 DDL만 추출"""
+    return [statement for statement in statements if DDL_PATTERN.match(statement)]
+
+@pytest.fixture
+def traced_statements(monkeypatch):
+    """이후 열리는 모든 sqlite 커넥션의 SQL 문 수집 (DatabaseManager 생성 과정 포함)"""
+    statements = []
+    connect = database.ConnectionPool._connect
+    
+    def traced_connect(self, *args, **kwargs):
+        conn = connect(self, *args, **kwargs)
+        conn.set_trace_callback(statements.append)
+        return conn
+    
+    monkeypatch.setattr(database.ConnectionPool, '_connect', traced_connect)
+    return statements
+
+def _exercise(db: DatabaseManager, rounds: int = 3):
+    """라우터/스케줄러 요청 경로에서 자주 쓰는 메서드 호출"""
+    for i in range(rounds):
+        db.save_property_data({'id': f'p{i}', 'title': f'숙소 {i}', 'city': '서울',
+                               'latitude': 37.5, 'longitude': 127.0, 'amenities': ['WiFi']})
+        db.get_property_data(f'p{i}')
+        db.get_all_properties(limit=10)
+        db.query_properties(city='서울', limit=10)
+        db.count_properties(city='서울')
+        db.get_amenities()
+        db.get_pending_content()
+        db.save_posting_history(f'p{i}', 'blog', {'success': True})
+        db.get_posting_analytics(days=7)
+        db.update_conversion_stats(f'p{i}', 'blog', click_count=1)
+        db.get_conversion_stats(f'p{i}')
+        db.get_availability(f'p{i}')
+        db.find_nearby(37.5, 127.0, radius_km=1, limit=10)
+
+def test_request_paths_issue_no_ddl(db):
+    """초기화된 매니저로 요청 경로를 반복 호출해도 CREATE/ALTER/DROP이 실행되지 않음"""
+    with db.capture_statements() as statements:
+        _exercise(db)
+    
+    assert len(statements) > 20
+    assert _ddl(statements) == []
+
+def test_schema_ddl_runs_once_per_manager(db_path, traced_statements):
+    """DDL은 DatabaseManager 생성 시에만 실행되고, 이미 마이그레이션된 DB를 다시 열면 버전 작업이 없음"""
+    db = DatabaseManager(db_path)
+    try:
+        created = len(_ddl(traced_statements))
+        assert created > 0
+        
+        _exercise(db)
+        assert len(_ddl(traced_statements)) == created
+    finally:
+        db.close()
+    
+    traced_statements.clear()
+    reopened = DatabaseManager(db_path)
+    try:
+        _exercise(reopened, rounds=1)
+    finally:
+        reopened.close()
+    
+    ddl = _ddl(traced_statements)
+    assert all('IF NOT EXISTS' in statement.upper() for statement in ddl)
+    assert not any(statement.lstrip().upper().startswith('SAVEPOINT MIGRATION') for statement in traced_statements)
+
+def test_scheduler_reuses_injected_manager(db):
+    """스케줄러 작업은 매번 새 DatabaseManager를 만들지 않고 주입된 인스턴스를 재사용"""
+    scheduler_module = pytest.importorskip('src.scheduler')
+    scheduler = scheduler_module.MarketingScheduler(db_manager=db)
+    
+    assert scheduler._get_db_manager() is db
+    assert scheduler._get_db_manager() is db
+
+def test_app_requests_share_lifespan_manager(tmp_path, monkeypatch):
+    """API 요청은 lifespan에서 만든 매니저를 공유하므로 init_database가 한 번만 실행"""
+    pytest.importorskip('fastapi.testclient')
+    main = pytest.importorskip('backend.main')
+    from fastapi.testclient import TestClient
+    
+    calls = []
+    init_database = DatabaseManager.init_database
+    
+    def counted_init(self):
+        calls.append(self)
+        return init_database(self)
+    
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(DatabaseManager, 'init_database', counted_init)
+    
+    with TestClient(main.app) as client:
+        for _ in range(3):
+            client.get('/api/dashboard/stats')
+            client.get('/api/properties/')
+            client.get('/api/analytics/overview')
+            client.get('/api/settings/system-info')
+    
+    assert len(calls) == 1
@@ -0,0 +1,56 @@
+"""
+빈 페이지 반환(incremental vacuum) 테스트
+"""
+
+import sqlite3
+
+import pytest
+
+from src.database import DatabaseManager
+
+def _free_pages(db):
+    """삭제로 빈 페이지가 생기도록 큰 행을 넣었다 지움"""
+    with db.pool.writer() as conn:
+        conn.executemany('''
+            INSERT INTO posting_history (property_id, platform, status, error_message)
+            VALUES ('p1', 'blog', 'failed', ?)
+        ''', [('x' * 4000,) for _ in range(50)])
+    with db.pool.writer() as conn:
+        conn.execute('DELETE FROM posting_history')
+        return conn.execute('PRAGMA freelist_count').fetchone()[0]
+
+def test_incremental_vacuum_reclaims_all_free_pages(db):
+    """한 번의 패스에서 pages_per_pass만큼 끝까지 반환"""
+    free_pages = _free_pages(db)
+    assert free_pages > 0
+    assert db.incremental_vacuum(pages_per_pass=free_pages) == free_pages
+
+def test_incremental_vacuum_joins_outer_transaction(db):
+    """바깥 writer() 안에서 실행해도 바깥 트랜잭션을 커밋하지 않아 롤백이 유지됨"""
+    _free_pages(db)
+    with pytest.raises(RuntimeError):
+        with db.pool.writer() as conn:
+            conn.execute("INSERT INTO properties (id, title) VALUES ('rolled-back', '숙소')")
+            db.incremental_vacuum()
+            raise RuntimeError('중단')
+    assert db.get_property_data('rolled-back') is None
+
+def test_enable_incremental_vacuum_refuses_nested_writer(db_path):
+    """auto_vacuum 전환은 쓰기 트랜잭션 안에서는 커밋하지 않고 거부, 밖에서는 전환"""
+    conn = sqlite3.connect(db_path)
+    conn.execute('CREATE TABLE legacy (id INTEGER)')
+    conn.close()
+    db = DatabaseManager(db_path)
+    try:
+        with pytest.raises(RuntimeError):
+            with db.pool.writer() as conn:
+                conn.execute("INSERT INTO properties (id, title) VALUES ('rolled-back', '숙소')")
+                assert not db.enable_incremental_vacuum()
+                raise RuntimeError('중단')
+        assert db.get_property_data('rolled-back') is None
+        
+        assert db.enable_incremental_vacuum()
+        with db.pool.writer() as conn:
+            assert conn.execute('PRAGMA auto_vacuum').fetchone()[0] == 2
+    finally:
+        db.close()